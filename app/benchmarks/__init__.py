@@ -0,0 +1,13 @@
+"""Benchmarks for the recipe API.
+
+Benchmarks are run from the ``app`` directory as modules, e.g.
+``python -m benchmarks.query_plans``, and work against a throwaway test database.
+"""
+
+import os
+
+import django
+
+
+os.environ.setdefault("DJANGO_SETTINGS_MODULE", "config.settings")
+django.setup()
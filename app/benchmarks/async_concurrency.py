@@ -0,0 +1,97 @@
+"""Compare concurrent clients of the sync recipe list under WSGI with the async list under ASGI.
+
+Gunicorn serves ``config.wsgi`` with a single threaded worker and uvicorn serves ``config.asgi``
+with a single worker, both on the seeded test database.
+
+Usage: ``python -m benchmarks.async_concurrency [--concurrency 1 10 50 100] [--requests N]``
+"""
+
+import argparse
+import asyncio
+import sys
+
+from django.urls import reverse
+from rest_framework.authtoken.models import Token
+
+from benchmarks.utils import (
+    HOST,
+    http_request,
+    percentiles,
+    seed_database,
+    start_server,
+    test_database,
+    timer,
+)
+
+
+async def run_clients(port, path, token, concurrency, requests):
+    """Run concurrent clients sending ``requests`` requests in total and return the latencies."""
+
+    latencies = []
+    remaining = iter(range(requests))
+    headers = {"Authorization": f"Token {token}"}
+
+    async def client():
+        for _ in remaining:
+            status_code, seconds = await http_request(port, "GET", path, headers)
+            assert status_code == 200, status_code
+            latencies.append(seconds)
+
+    await asyncio.gather(*(client() for _ in range(concurrency)))
+    return latencies
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--concurrency", type=int, nargs="+", default=[1, 10, 50, 100])
+    parser.add_argument("--requests", type=int, default=1000)
+    parser.add_argument("--threads", type=int, default=4, help="Threads of the WSGI worker.")
+    parser.add_argument("--recipes", type=int, default=1000)
+    parser.add_argument("--port", type=int, default=8100)
+    args = parser.parse_args()
+
+    wsgi = [
+        *("gunicorn config.wsgi --worker-class gthread --workers 1").split(),
+        *("--threads", str(args.threads), "--bind", f"{HOST}:{args.port}"),
+    ]
+    asgi = [
+        *("uvicorn config.asgi:application --workers 1 --no-access-log").split(),
+        *("--host", HOST, "--port", str(args.port + 1)),
+    ]
+    servers = [
+        ("wsgi", [sys.executable, "-m", *wsgi], args.port, reverse("recipes:recipe-list")),
+        (
+            "asgi",
+            [sys.executable, "-m", *asgi],
+            args.port + 1,
+            reverse("recipes:async-recipe-list"),
+        ),
+    ]
+
+    with test_database():
+        user = seed_database(users=1, recipes_per_user=args.recipes)[0]
+        token = Token.objects.create(user=user).key
+
+        print(f"{'server':>6} {'clients':>8} {'req/s':>8} {'p50':>9} {'p95':>9} {'p99':>9}")
+        for name, command, port, path in servers:
+            process = start_server(command, port)
+            try:
+                asyncio.run(run_clients(port, path, token, 1, 10))
+                for concurrency in args.concurrency:
+                    with timer() as elapsed:
+                        latencies = asyncio.run(
+                            run_clients(port, path, token, concurrency, args.requests)
+                        )
+                    latency = percentiles(latencies)
+                    print(
+                        f"{name:>6} {concurrency:>8} {len(latencies) / elapsed['seconds']:>8.0f} "
+                        f"{latency['p50']:>7.1f}ms {latency['p95']:>7.1f}ms "
+                        f"{latency['p99']:>7.1f}ms"
+                    )
+            finally:
+                process.terminate()
+                process.wait()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,58 @@
+"""Compare recipe creation throughput of single POSTs against the batch endpoint.
+
+Usage: ``python -m benchmarks.batch_create [--recipes N] [--tags N]``
+"""
+
+import argparse
+
+from django.urls import reverse
+from rest_framework.test import APIClient
+
+from benchmarks.utils import seed_database, test_database, timer
+
+
+RECIPES_URL = reverse("recipes:recipe-list")
+BATCH_URL = reverse("recipes:recipe-batch")
+
+
+def recipe_payload(index, tags):
+    """Return the payload of a recipe with a few tags."""
+
+    return {
+        "title": f"Imported recipe {index}",
+        "time_minutes": 30,
+        "price": "12.50",
+        "description": "Imported recipe description",
+        "tags": [{"name": f"Tag {(index + i) % 20}"} for i in range(tags)],
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--recipes", type=int, default=1000)
+    parser.add_argument("--tags", type=int, default=3, help="Tags per recipe")
+    args = parser.parse_args()
+
+    with test_database():
+        user = seed_database(users=1, recipes_per_user=0)[0]
+        client = APIClient()
+        client.force_authenticate(user)
+        payloads = [recipe_payload(i, args.tags) for i in range(args.recipes)]
+
+        with timer() as single:
+            for payload in payloads:
+                client.post(RECIPES_URL, payload, format="json")
+
+        with timer() as batch:
+            res = client.post(BATCH_URL, payloads, format="json")
+        assert res.status_code == 201, res.data
+
+    single_rate = args.recipes / single["seconds"]
+    batch_rate = args.recipes / batch["seconds"]
+    print(f"single POST: {single_rate:10.1f} recipes/s ({single['seconds']:.2f} s)")
+    print(f"batch POST:  {batch_rate:10.1f} recipes/s ({batch['seconds']:.2f} s)")
+    print(f"speedup:     {batch_rate / single_rate:10.1f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,193 @@
+"""Load test the API endpoints and compare the latency percentiles with a previous run.
+
+Gunicorn serves ``config.wsgi`` on the seeded test database while concurrent clients call each
+endpoint. Results are written as JSON; with ``--compare``, endpoints whose p95 latency or
+throughput regressed by more than ``--threshold`` are reported and the command exits with 1.
+
+Usage: ``python -m benchmarks.endpoints [--output FILE] [--compare FILE] [--concurrency N]``
+"""
+
+import argparse
+import asyncio
+import itertools
+import platform
+import subprocess
+import sys
+from datetime import datetime, timezone
+from pathlib import Path
+
+import orjson
+from django.urls import reverse
+from rest_framework.authtoken.models import Token
+
+from benchmarks.utils import (
+    BENCHMARK_PASSWORD,
+    HOST,
+    http_request,
+    percentiles,
+    seed_database,
+    start_server,
+    test_database,
+    timer,
+)
+
+
+def get_endpoints(users, tokens):
+    """Return the endpoints to load test by name, as functions returning request arguments."""
+
+    json_headers = {"Content-Type": "application/json"}
+    auth_headers = itertools.cycle([{"Authorization": f"Token {token}"} for token in tokens])
+    emails = itertools.cycle([user.email for user in users])
+
+    def token_body():
+        return orjson.dumps({"email": next(emails), "password": BENCHMARK_PASSWORD})
+
+    return {
+        "recipe-list": lambda: ("GET", reverse("recipes:recipe-list"), next(auth_headers), b""),
+        "tag-list": lambda: ("GET", reverse("recipes:tag-list"), next(auth_headers), b""),
+        "token": lambda: ("POST", reverse("users:token"), json_headers, token_body()),
+        "me": lambda: ("GET", reverse("users:me"), next(auth_headers), b""),
+    }
+
+
+async def load(port, make_request, concurrency, requests):
+    """Send requests with concurrent clients and return the latencies and the error count."""
+
+    latencies = []
+    errors = 0
+    remaining = iter(range(requests))
+
+    async def client():
+        nonlocal errors
+        for _ in remaining:
+            method, path, headers, body = make_request()
+            status_code, seconds = await http_request(port, method, path, headers, body)
+            if status_code >= 400:
+                errors += 1
+            else:
+                latencies.append(seconds)
+
+    await asyncio.gather(*(client() for _ in range(concurrency)))
+    return latencies, errors
+
+
+def run_endpoint(port, make_request, concurrency, requests):
+    """Load test an endpoint and return its throughput and latency percentiles."""
+
+    asyncio.run(load(port, make_request, concurrency, min(requests, 20)))
+    with timer() as elapsed:
+        latencies, errors = asyncio.run(load(port, make_request, concurrency, requests))
+
+    return {
+        "requests": requests,
+        "errors": errors,
+        "throughput": len(latencies) / elapsed["seconds"],
+        **(percentiles(latencies) if len(latencies) > 1 else {}),
+    }
+
+
+def compare(results, baseline, threshold):
+    """Print the changes against a baseline and return the names of regressed endpoints."""
+
+    regressions = []
+    print(f"\n{'endpoint':>12} {'p95':>18} {'req/s':>16}")
+    for name, result in results.items():
+        previous = baseline.get(name)
+        if previous is None or "p95" not in result or "p95" not in previous:
+            continue
+
+        p95_change = result["p95"] / previous["p95"] - 1
+        throughput_change = result["throughput"] / previous["throughput"] - 1
+        regressed = p95_change > threshold or throughput_change < -threshold
+        if regressed:
+            regressions.append(name)
+        print(
+            f"{name:>12} {previous['p95']:>7.1f}ms {p95_change:>+8.1%} "
+            f"{previous['throughput']:>6.0f} {throughput_change:>+8.1%}"
+            f"{'  REGRESSION' if regressed else ''}"
+        )
+
+    return regressions
+
+
+def git_revision():
+    """Return the current git commit, or None outside a repository."""
+
+    try:
+        output = subprocess.run(
+            ["git", "rev-parse", "HEAD"], capture_output=True, check=True, text=True
+        )
+    except (OSError, subprocess.CalledProcessError):
+        return None
+    return output.stdout.strip()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--endpoints", nargs="+", help="Endpoints to test, by default all.")
+    parser.add_argument("--concurrency", type=int, default=10)
+    parser.add_argument("--requests", type=int, default=500)
+    parser.add_argument("--users", type=int, default=20)
+    parser.add_argument("--recipes", type=int, default=200, help="Recipes per user.")
+    parser.add_argument("--workers", type=int, default=2)
+    parser.add_argument("--threads", type=int, default=4)
+    parser.add_argument("--response-cache", action="store_true", help="Keep response caching.")
+    parser.add_argument("--output", type=Path, default=Path("benchmark-endpoints.json"))
+    parser.add_argument("--compare", type=Path, help="Results of a previous run.")
+    parser.add_argument("--threshold", type=float, default=0.2)
+    parser.add_argument("--port", type=int, default=8100)
+    args = parser.parse_args()
+
+    command = [
+        *(sys.executable, "-m", "gunicorn", "config.wsgi", "--worker-class", "gthread"),
+        *("--workers", str(args.workers), "--threads", str(args.threads)),
+        *("--bind", f"{HOST}:{args.port}"),
+    ]
+    env = {"API_RESPONSE_CACHE_TIMEOUT": "300"} if args.response_cache else None
+
+    with test_database():
+        users = seed_database(users=args.users, recipes_per_user=args.recipes)
+        tokens = [Token.objects.create(user=user).key for user in users]
+        endpoints = get_endpoints(users, tokens)
+        names = args.endpoints or list(endpoints)
+
+        results = {}
+        process = start_server(command, args.port, env)
+        try:
+            print(f"{'endpoint':>12} {'req/s':>8} {'p50':>9} {'p95':>9} {'p99':>9} {'errors':>7}")
+            for name in names:
+                result = run_endpoint(args.port, endpoints[name], args.concurrency, args.requests)
+                results[name] = result
+                print(
+                    f"{name:>12} {result['throughput']:>8.0f} {result.get('p50', 0):>7.1f}ms "
+                    f"{result.get('p95', 0):>7.1f}ms {result.get('p99', 0):>7.1f}ms "
+                    f"{result['errors']:>7}"
+                )
+        finally:
+            process.terminate()
+            process.wait()
+
+    report = {
+        "meta": {
+            "time": datetime.now(timezone.utc).isoformat(),
+            "revision": git_revision(),
+            "python": platform.python_version(),
+            "options": {
+                key: value
+                for key, value in vars(args).items()
+                if key not in ("output", "compare", "port")
+            },
+        },
+        "results": results,
+    }
+    args.output.write_bytes(orjson.dumps(report, option=orjson.OPT_INDENT_2))
+    print(f"\nResults written to {args.output}")
+
+    if args.compare is not None:
+        baseline = orjson.loads(args.compare.read_bytes())["results"]
+        if compare(results, baseline, args.threshold):
+            sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
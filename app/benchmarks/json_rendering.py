@@ -0,0 +1,94 @@
+"""Micro-benchmarks of the orjson renderer and parser against DRF's JSON renderer and parser.
+
+Usage: ``python -m benchmarks.json_rendering [--sizes 100 1000 10000] [--repeat N]``
+"""
+
+import argparse
+import datetime
+import timeit
+from decimal import Decimal
+from io import BytesIO
+
+from rest_framework.parsers import JSONParser
+from rest_framework.renderers import JSONRenderer
+
+from core.parsers import ORJSONParser
+from core.renderers import ORJSONRenderer
+
+
+def recipe_page(size):
+    """Return a recipe list response body as the API renders it."""
+
+    return {
+        "next": "http://testserver/api/recipes/recipes/?cursor=cD0xMjM0",
+        "previous": None,
+        "results": [
+            {
+                "id": i,
+                "title": f"Recipe {i} ☕",
+                "time_minutes": i % 240,
+                "price": f"{i % 1000}.{i % 100:02d}",
+                "link": f"https://ex.com/recipe{i}.pdf",
+                "tags": [{"id": i * 3 + t, "name": f"Tag {t}"} for t in range(3)],
+            }
+            for i in range(size)
+        ],
+    }
+
+
+def typed_page(size):
+    """Return a body with raw Decimal and datetime values handled by the encoder."""
+
+    created = datetime.datetime(2023, 8, 10, 9, 14, 1, 123456, tzinfo=datetime.timezone.utc)
+    return [
+        {"id": i, "price": Decimal(i) / 100, "created": created + datetime.timedelta(seconds=i)}
+        for i in range(size)
+    ]
+
+
+def best_of(func, repeat):
+    """Return the best time of a function in milliseconds."""
+
+    return min(timeit.repeat(func, number=1, repeat=repeat)) * 1000
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--sizes", type=int, nargs="+", default=[100, 1000, 10000])
+    parser.add_argument("--repeat", type=int, default=20)
+    args = parser.parse_args()
+
+    print(f"{'case':<24} {'items':>6} {'drf':>10} {'orjson':>10} {'speedup':>8}")
+
+    def report(case, size, baseline, candidate):
+        print(
+            f"{case:<24} {size:>6} {baseline:>8.2f}ms {candidate:>8.2f}ms "
+            f"{baseline / candidate:>7.1f}x"
+        )
+
+    for size in args.sizes:
+        for case, data in (
+            ("render recipes", recipe_page(size)),
+            ("render typed", typed_page(size)),
+        ):
+            expected = JSONRenderer().render(data)
+            assert ORJSONRenderer().render(data) == expected, f"{case} output differs"
+            report(
+                case,
+                size,
+                best_of(lambda: JSONRenderer().render(data), args.repeat),
+                best_of(lambda: ORJSONRenderer().render(data), args.repeat),
+            )
+
+        body = JSONRenderer().render(recipe_page(size))
+        assert ORJSONParser().parse(BytesIO(body)) == JSONParser().parse(BytesIO(body))
+        report(
+            "parse recipes",
+            size,
+            best_of(lambda: JSONParser().parse(BytesIO(body)), args.repeat),
+            best_of(lambda: ORJSONParser().parse(BytesIO(body)), args.repeat),
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,71 @@
+"""Compare the recipe serializer with the value rows read path of the recipe list.
+
+Usage: ``python -m benchmarks.list_serialization [--sizes 100 1000 10000] [--repeat N]``
+"""
+
+import argparse
+
+from django.db.models import Prefetch
+from rest_framework.renderers import JSONRenderer
+
+from benchmarks.utils import seed_database, test_database, timer
+from recipes.models import Recipe, Tag
+from recipes.serializers import RecipeSerializer, represent_recipe_rows
+
+
+def serializer_path(user):
+    """Render the recipes of a user through the model serializer."""
+
+    recipes = (
+        Recipe.objects.filter(user=user)
+        .defer("search_vector")
+        .prefetch_related(Prefetch("tags", queryset=Tag.objects.order_by("id")))
+        .order_by("-id")
+    )
+    return JSONRenderer().render(RecipeSerializer(recipes, many=True).data)
+
+
+def rows_path(user):
+    """Render the recipes of a user from value rows."""
+
+    serializer = RecipeSerializer()
+    columns = [name for name in serializer.fields if name != "tags"]
+    rows = Recipe.objects.filter(user=user).order_by("-id").values(*columns)
+    return JSONRenderer().render(represent_recipe_rows(serializer, rows))
+
+
+def best_time(func, user, repeat):
+    """Return the output and the best wall time of several runs."""
+
+    best = None
+    for _ in range(repeat):
+        with timer() as elapsed:
+            output = func(user)
+        best = elapsed["seconds"] if best is None else min(best, elapsed["seconds"])
+
+    return output, best
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--sizes", type=int, nargs="+", default=[100, 1000, 10000])
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    with test_database():
+        print(f"{'recipes':>8} {'serializer':>12} {'value rows':>12} {'speedup':>8}")
+        for size in args.sizes:
+            user = seed_database(users=1, recipes_per_user=size)[0]
+
+            expected, serializer_seconds = best_time(serializer_path, user, args.repeat)
+            output, rows_seconds = best_time(rows_path, user, args.repeat)
+            assert output == expected, "Value rows output differs from the serializer"
+
+            print(
+                f"{size:>8} {serializer_seconds * 1000:>10.1f}ms {rows_seconds * 1000:>10.1f}ms "
+                f"{serializer_seconds / rows_seconds:>7.1f}x"
+            )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,133 @@
+"""Measure recipe list latency during a storm of token requests.
+
+Gunicorn serves ``config.wsgi`` with a single threaded worker, once verifying passwords in the
+request threads and once in the password hasher pool. Each run reads recipes without logins,
+then again while clients keep requesting tokens.
+
+Usage: ``python -m benchmarks.login_storm [--readers N] [--logins N] [--requests N]``
+"""
+
+import argparse
+import asyncio
+import sys
+from collections import Counter
+
+import orjson
+from django.urls import reverse
+from rest_framework.authtoken.models import Token
+
+from benchmarks.utils import (
+    BENCHMARK_PASSWORD,
+    HOST,
+    http_request,
+    percentiles,
+    seed_database,
+    start_server,
+    test_database,
+)
+
+
+async def read_recipes(port, token, readers, requests):
+    """Read the recipe list with concurrent clients and return the latencies."""
+
+    path = reverse("recipes:recipe-list")
+    headers = {"Authorization": f"Token {token}"}
+    latencies = []
+    remaining = iter(range(requests))
+
+    async def reader():
+        for _ in remaining:
+            status_code, seconds = await http_request(port, "GET", path, headers)
+            assert status_code == 200, status_code
+            latencies.append(seconds)
+
+    await asyncio.gather(*(reader() for _ in range(readers)))
+    return latencies
+
+
+async def request_tokens(port, emails, stop, statuses):
+    """Request tokens in a loop until stopped, counting the status codes."""
+
+    path = reverse("users:token")
+    headers = {"Content-Type": "application/json"}
+    while not stop.is_set():
+        for email in emails:
+            body = orjson.dumps({"email": email, "password": BENCHMARK_PASSWORD})
+            status_code, _ = await http_request(port, "POST", path, headers, body)
+            statuses[status_code] += 1
+            if stop.is_set():
+                return
+
+
+async def measure(port, token, emails, readers, logins, requests):
+    """Return recipe read latencies while ``logins`` clients request tokens."""
+
+    stop = asyncio.Event()
+    statuses = Counter()
+    storm = [
+        asyncio.create_task(request_tokens(port, emails[i::logins], stop, statuses))
+        for i in range(logins)
+    ]
+    latencies = await read_recipes(port, token, readers, requests)
+    stop.set()
+    await asyncio.gather(*storm)
+
+    return latencies, statuses
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--readers", type=int, default=4)
+    parser.add_argument("--logins", type=int, default=32)
+    parser.add_argument("--requests", type=int, default=500)
+    parser.add_argument("--threads", type=int, default=16, help="Threads of the WSGI worker.")
+    parser.add_argument("--hasher-workers", type=int, default=2)
+    parser.add_argument("--hasher-queue-size", type=int, default=4)
+    parser.add_argument("--port", type=int, default=8100)
+    args = parser.parse_args()
+
+    command = [
+        *(sys.executable, "-m", "gunicorn", "config.wsgi", "--worker-class", "gthread"),
+        *("--workers", "1", "--threads", str(args.threads), "--bind", f"{HOST}:{args.port}"),
+    ]
+    modes = [
+        ("in-process", {"PASSWORD_HASHER_WORKERS": "0"}),
+        (
+            "pool",
+            {
+                "PASSWORD_HASHER_WORKERS": str(args.hasher_workers),
+                "PASSWORD_HASHER_QUEUE_SIZE": str(args.hasher_queue_size),
+            },
+        ),
+    ]
+
+    with test_database():
+        users = seed_database(users=args.logins, recipes_per_user=100)
+        token = Token.objects.create(user=users[0]).key
+        emails = [user.email for user in users]
+
+        print(
+            f"{'hashing':>10} {'logins':>7} {'p50':>9} {'p95':>9} {'p99':>9} "
+            f"{'200':>6} {'429':>6}"
+        )
+        for name, env in modes:
+            process = start_server(command, args.port, env)
+            try:
+                asyncio.run(read_recipes(args.port, token, 1, 10))
+                for logins in (0, args.logins):
+                    latencies, statuses = asyncio.run(
+                        measure(args.port, token, emails, args.readers, logins, args.requests)
+                    )
+                    latency = percentiles(latencies)
+                    print(
+                        f"{name:>10} {logins:>7} {latency['p50']:>7.1f}ms "
+                        f"{latency['p95']:>7.1f}ms {latency['p99']:>7.1f}ms "
+                        f"{statuses[200]:>6} {statuses[429]:>6}"
+                    )
+            finally:
+                process.terminate()
+                process.wait()
+
+
+if __name__ == "__main__":
+    main()
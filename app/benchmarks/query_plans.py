@@ -0,0 +1,70 @@
+"""Show query plans of the per-user recipe and tag queries before and after indexing.
+
+Usage: ``python -m benchmarks.query_plans [--users N] [--recipes N] [--tags N]``
+"""
+
+import argparse
+
+from django.core.management import call_command
+from django.db import connection
+
+from benchmarks.utils import analyze, seed_database, test_database, timer
+from recipes.models import Recipe, Tag
+
+
+BEFORE_MIGRATION = "0002_tag_recipe_tags"
+AFTER_MIGRATION = "0003_recipe_tag_indexes"
+
+# Columns present at both migrations, as later migrations add columns the models select
+RECIPE_COLUMNS = ("id", "user_id", "title", "description", "time_minutes", "price", "link")
+TAG_COLUMNS = ("id", "user_id", "name")
+
+
+def planned_queries(user):
+    """Return the queries issued by the recipe API for a user."""
+
+    recipes = Recipe.objects.values(*RECIPE_COLUMNS)
+    tags = Tag.objects.values(*TAG_COLUMNS)
+    return {
+        "recipe list": recipes.filter(user=user).order_by("-id")[:100],
+        "tag list": tags.filter(user=user).order_by("-name")[:100],
+        "tag lookup": tags.filter(user=user, name__in=["Tag 1", "Tag 2", "Tag 3"]),
+    }
+
+
+def explain(user):
+    """Print the plan and run time of every planned query."""
+
+    options = {"analyze": True} if connection.vendor == "postgresql" else {}
+
+    for name, queryset in planned_queries(user).items():
+        with timer() as elapsed:
+            list(queryset)
+        print(f"--- {name} ({elapsed['seconds'] * 1000:.2f} ms)")
+        print(queryset.explain(**options))
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--users", type=int, default=50)
+    parser.add_argument("--recipes", type=int, default=2000, help="Recipes per user")
+    parser.add_argument("--tags", type=int, default=50, help="Tags per user")
+    args = parser.parse_args()
+
+    with test_database():
+        users = seed_database(
+            users=args.users,
+            recipes_per_user=args.recipes,
+            tags_per_user=args.tags,
+        )
+        user = users[len(users) // 2]
+
+        for label, migration in (("BEFORE", BEFORE_MIGRATION), ("AFTER", AFTER_MIGRATION)):
+            call_command("migrate", "recipes", migration, verbosity=0)
+            analyze()
+            print(f"===== {label} ({migration}) =====")
+            explain(user)
+
+
+if __name__ == "__main__":
+    main()
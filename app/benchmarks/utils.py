@@ -0,0 +1,156 @@
+import asyncio
+import os
+import random
+import socket
+import statistics
+import subprocess
+import time
+from contextlib import contextmanager
+from decimal import Decimal
+
+from django.contrib.auth import get_user_model
+from django.contrib.auth.hashers import make_password
+from django.db import connection
+from django.test.utils import setup_test_environment, teardown_test_environment
+
+from recipes.models import Recipe, Tag
+
+
+UserModel = get_user_model()
+BENCHMARK_PASSWORD = "benchmarkpassword"
+HOST = "127.0.0.1"
+
+
+@contextmanager
+def test_database():
+    """Set up the test environment with a throwaway test database, destroyed on exit."""
+
+    setup_test_environment()
+    old_name = connection.creation.create_test_db(verbosity=0, autoclobber=True)
+    try:
+        yield connection
+    finally:
+        connection.creation.destroy_test_db(old_name, verbosity=0)
+        teardown_test_environment()
+
+
+@contextmanager
+def timer():
+    """Measure the wall time of the block, stored in the yielded dict under ``seconds``."""
+
+    result = {}
+    start = time.perf_counter()
+    try:
+        yield result
+    finally:
+        result["seconds"] = time.perf_counter() - start
+
+
+def analyze():
+    """Refresh planner statistics so query plans reflect the seeded data."""
+
+    if connection.vendor == "postgresql":
+        with connection.cursor() as cursor:
+            cursor.execute("ANALYZE")
+
+
+def seed_database(users=10, recipes_per_user=100, tags_per_user=20, tags_per_recipe=3, seed=0):
+    """Bulk insert users with recipes and tags and return the created users."""
+
+    rng = random.Random(seed)
+    password = make_password(BENCHMARK_PASSWORD)
+
+    offset = UserModel.objects.count()
+    user_objs = UserModel.objects.bulk_create(
+        [
+            UserModel(email=f"bench{i}@ex.com", name=f"Bench {i}", password=password)
+            for i in range(offset, offset + users)
+        ]
+    )
+    tag_objs = Tag.objects.bulk_create(
+        [Tag(user=user, name=f"Tag {i}") for user in user_objs for i in range(tags_per_user)]
+    )
+    recipe_objs = Recipe.objects.bulk_create(
+        [
+            Recipe(
+                user=user,
+                title=f"Recipe {i}",
+                description=f"Description of recipe {i}",
+                time_minutes=rng.randint(1, 240),
+                price=Decimal(rng.randint(100, 99999)) / 100,
+                link=f"https://ex.com/recipe{i}.pdf",
+            )
+            for user in user_objs
+            for i in range(recipes_per_user)
+        ]
+    )
+
+    tags_by_user = {}
+    for tag in tag_objs:
+        tags_by_user.setdefault(tag.user_id, []).append(tag)
+
+    RecipeTag = Recipe.tags.through
+    RecipeTag.objects.bulk_create(
+        [
+            RecipeTag(recipe_id=recipe.id, tag_id=tag.id)
+            for recipe in recipe_objs
+            for tag in rng.sample(tags_by_user[recipe.user_id], min(tags_per_recipe, tags_per_user))
+        ],
+        batch_size=5000,
+    )
+    analyze()
+
+    return user_objs
+
+
+def start_server(command, port, env=None):
+    """Start a server process on the test database and wait until it accepts connections."""
+
+    # Serve every request from the database, as the response cache would hide its cost
+    env = {
+        **os.environ,
+        "DB_NAME": connection.settings_dict["NAME"],
+        "API_RESPONSE_CACHE_TIMEOUT": "0",
+        **(env or {}),
+    }
+    process = subprocess.Popen(
+        command, env=env, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL
+    )
+
+    deadline = time.monotonic() + 30
+    while time.monotonic() < deadline:
+        try:
+            socket.create_connection((HOST, port), timeout=1).close()
+            return process
+        except OSError:
+            time.sleep(0.1)
+
+    process.terminate()
+    raise RuntimeError(f"Server did not start: {' '.join(command)}")
+
+
+async def http_request(port, method, path, headers=None, body=b""):
+    """Send a request to a local server and return the status code and the latency."""
+
+    headers = {"Host": HOST, "Connection": "close", **(headers or {})}
+    if body:
+        headers["Content-Length"] = str(len(body))
+    head = "".join(f"{name}: {value}\r\n" for name, value in headers.items())
+
+    start = time.perf_counter()
+    reader, writer = await asyncio.open_connection(HOST, port)
+    writer.write(f"{method} {path} HTTP/1.1\r\n{head}\r\n".encode() + body)
+    await writer.drain()
+    response = await reader.read()
+    writer.close()
+    await writer.wait_closed()
+
+    status_code = int(response.split(b" ", 2)[1])
+    return status_code, time.perf_counter() - start
+
+
+def percentiles(latencies):
+    """Return the p50, p95 and p99 of latencies in milliseconds."""
+
+    quantiles = statistics.quantiles(latencies, n=100)
+    return {f"p{n}": quantiles[n - 1] * 1000 for n in (50, 95, 99)}
@@ -1,4 +1,5 @@
 import os
+import tempfile
 from pathlib import Path
 
 
@@ -28,6 +29,7 @@ INSTALLED_APPS = [
     "django.contrib.sessions",
     "django.contrib.messages",
     "django.contrib.staticfiles",
+    "django.contrib.postgres",
     # Installed apps
     "rest_framework",
     "rest_framework.authtoken",
@@ -39,6 +41,7 @@ INSTALLED_APPS = [
 ]
 
 MIDDLEWARE = [
+    "core.middleware.RequestInstrumentationMiddleware",
     "django.middleware.security.SecurityMiddleware",
     "django.contrib.sessions.middleware.SessionMiddleware",
     "django.middleware.common.CommonMiddleware",
@@ -74,14 +77,89 @@ WSGI_APPLICATION = "config.wsgi.application"
 
 DATABASES = {
     "default": {
-        "ENGINE": "django.db.backends.postgresql",
+        "ENGINE": "core.db.backends.postgresql",
         "HOST": os.environ.get("DB_HOST"),
         "NAME": os.environ.get("DB_NAME"),
         "USER": os.environ.get("DB_USER"),
         "PASSWORD": os.environ.get("DB_PASS"),
+        # Connections closed at the end of requests go back to a per-process pool
+        "POOL": {
+            "MIN_SIZE": int(os.environ.get("DB_POOL_MIN_SIZE", 2)),
+            "MAX_SIZE": int(os.environ.get("DB_POOL_MAX_SIZE", 10)),
+            "TIMEOUT": float(os.environ.get("DB_POOL_TIMEOUT", 10)),
+            "MAX_IDLE": float(os.environ.get("DB_POOL_MAX_IDLE", 300)),
+            "MAX_LIFETIME": float(os.environ.get("DB_POOL_MAX_LIFETIME", 3600)),
+            "CHECK": os.environ.get("DB_POOL_CHECK", "1") == "1",
+        },
     }
 }
 
+# Read replicas as comma separated hosts, with the credentials and pool of the primary
+DATABASE_REPLICAS = []
+for index, host in enumerate(filter(None, os.environ.get("DB_REPLICA_HOSTS", "").split(","))):
+    DATABASE_REPLICAS.append(f"replica_{index}")
+    DATABASES[f"replica_{index}"] = {
+        **DATABASES["default"],
+        "HOST": host.strip(),
+        "TEST": {"MIRROR": "default"},
+    }
+
+DATABASE_ROUTERS = ["core.db.routers.PrimaryReplicaRouter"]
+
+# Seconds during which a user reads from the primary after writing, to see their writes
+DATABASE_PRIMARY_STICKINESS = float(os.environ.get("DB_PRIMARY_STICKINESS", 5))
+
+# Cache of the users pinned to the primary, which must be shared by all workers to use replicas
+DATABASE_STICKINESS_CACHE = os.environ.get("DB_STICKINESS_CACHE", "shared")
+
+
+# Cache
+# https://docs.djangoproject.com/en/4.2/topics/cache/
+
+# Optional Redis shared by the workers of all hosts, e.g. redis://redis:6379/0. Without it,
+# caches shared by workers are kept in files, which the workers of one host share.
+REDIS_URL = os.environ.get("REDIS_URL")
+CACHE_DIR = os.environ.get("CACHE_DIR", os.path.join(tempfile.gettempdir(), "recipe-api-cache"))
+
+
+def shared_cache(name, max_entries):
+    """Return the settings of a cache shared by all workers, in Redis or in files."""
+
+    if REDIS_URL:
+        return {
+            "BACKEND": "django.core.cache.backends.redis.RedisCache",
+            "LOCATION": REDIS_URL,
+            "KEY_PREFIX": name,
+        }
+    return {
+        "BACKEND": "django.core.cache.backends.filebased.FileBasedCache",
+        "LOCATION": os.path.join(CACHE_DIR, name),
+        "OPTIONS": {"MAX_ENTRIES": max_entries},
+    }
+
+
+CACHES = {
+    "default": {
+        "BACKEND": "django.core.cache.backends.locmem.LocMemCache",
+    },
+    # State shared by all workers, such as data versions and primary pins
+    "shared": shared_cache("shared", int(os.environ.get("SHARED_CACHE_MAX_ENTRIES", 100000))),
+    # Token to user resolution. Revoked tokens must be dropped for every worker, so the
+    # cache is shared by all workers.
+    "auth": {
+        **shared_cache("auth", int(os.environ.get("AUTH_TOKEN_CACHE_MAX_ENTRIES", 10000))),
+        "TIMEOUT": int(os.environ.get("AUTH_TOKEN_CACHE_TIMEOUT", 300)),
+    },
+}
+
+AUTH_TOKEN_CACHE = "auth"
+
+# Per-user versioned responses of recipe and tag reads. Each worker may cache responses on
+# its own, but the data versions invalidating them must be in a cache shared by all workers.
+API_RESPONSE_CACHE = "default"
+API_RESPONSE_VERSION_CACHE = "shared"
+API_RESPONSE_CACHE_TIMEOUT = int(os.environ.get("API_RESPONSE_CACHE_TIMEOUT", 300))
+
 
 # Password validation
 # https://docs.djangoproject.com/en/4.2/ref/settings/#auth-password-validators
@@ -128,4 +206,53 @@ AUTH_USER_MODEL = "users.User"
 
 REST_FRAMEWORK = {
     "DEFAULT_SCHEMA_CLASS": "drf_spectacular.openapi.AutoSchema",
+    "DEFAULT_RENDERER_CLASSES": [
+        "core.renderers.ORJSONRenderer",
+        "rest_framework.renderers.BrowsableAPIRenderer",
+    ],
+    "DEFAULT_PARSER_CLASSES": [
+        "core.parsers.ORJSONParser",
+        "rest_framework.parsers.FormParser",
+        "rest_framework.parsers.MultiPartParser",
+    ],
+}
+
+# Default number of items per page for cursor paginated lists
+API_PAGE_SIZE = int(os.environ.get("API_PAGE_SIZE", 100))
+
+# Maximum number of recipes accepted by the batch endpoint
+API_BATCH_MAX_SIZE = int(os.environ.get("API_BATCH_MAX_SIZE", 1000))
+
+# Processes verifying passwords for the token endpoint, 0 to verify in the request worker
+PASSWORD_HASHER_WORKERS = int(os.environ.get("PASSWORD_HASHER_WORKERS", 2))
+
+# Password checks running or waiting at once before the token endpoint answers 429, 0 for no
+# limit. Scales with the workers, so a check waits for at most 8 others per worker. The limit
+# applies per server process, so it requires a threaded worker class, e.g. gunicorn --threads:
+# a sync worker never has more than one check of its own waiting.
+PASSWORD_HASHER_QUEUE_SIZE = int(
+    os.environ.get("PASSWORD_HASHER_QUEUE_SIZE", 8 * PASSWORD_HASHER_WORKERS)
+)
+
+# Fraction of requests instrumented with SQL counts and Server-Timing headers
+REQUEST_INSTRUMENTATION_SAMPLE_RATE = float(
+    os.environ.get("REQUEST_INSTRUMENTATION_SAMPLE_RATE", 1.0)
+)
+
+# Queries per request above which instrumented requests are logged as warnings
+REQUEST_QUERY_BUDGET = int(os.environ.get("REQUEST_QUERY_BUDGET", 20))
+
+# Instrumented requests are logged as JSON lines, set the level to INFO to log all of them
+LOGGING = {
+    "version": 1,
+    "disable_existing_loggers": False,
+    "formatters": {"json": {"()": "core.logging.JSONFormatter"}},
+    "handlers": {"json": {"class": "logging.StreamHandler", "formatter": "json"}},
+    "loggers": {
+        "core.instrumentation": {
+            "handlers": ["json"],
+            "level": os.environ.get("REQUEST_INSTRUMENTATION_LOG_LEVEL", "WARNING"),
+            "propagate": False,
+        },
+    },
 }
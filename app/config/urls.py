@@ -2,6 +2,8 @@ from django.contrib import admin
 from django.urls import include, path
 from drf_spectacular.views import SpectacularAPIView, SpectacularSwaggerView
 
+from core.views import DatabasePoolStatsAPIView
+
 
 urlpatterns = [
     path("admin/", admin.site.urls),
@@ -9,4 +11,5 @@ urlpatterns = [
     path("api/docs/", SpectacularSwaggerView.as_view(url_name="api-schema"), name="api-docs"),
     path("api/users/", include("users.urls")),
     path("api/recipes/", include("recipes.urls")),
+    path("api/db-pool-stats/", DatabasePoolStatsAPIView.as_view(), name="db-pool-stats"),
 ]
@@ -0,0 +1,43 @@
+from django.conf import settings
+from django.core.cache import caches
+from django.core.cache.backends.dummy import DummyCache
+from django.core.cache.backends.locmem import LocMemCache
+from django.core.checks import Error, Tags, register
+
+
+@register(Tags.caches)
+def check_stickiness_cache(app_configs, **kwargs):
+    """Check the users pinned to the primary are seen by all workers when using replicas."""
+
+    if not settings.DATABASE_REPLICAS:
+        return []
+
+    cache = caches[settings.DATABASE_STICKINESS_CACHE]
+    if isinstance(cache, (DummyCache, LocMemCache)):
+        return [
+            Error(
+                "DATABASE_STICKINESS_CACHE must be shared by all workers to read from replicas.",
+                hint="Set REDIS_URL or point DB_STICKINESS_CACHE to a shared cache.",
+                obj=settings.DATABASE_STICKINESS_CACHE,
+                id="core.E001",
+            )
+        ]
+    return []
+
+
+@register(Tags.caches)
+def check_response_version_cache(app_configs, **kwargs):
+    """Check the data versions invalidating cached responses are seen by all workers."""
+
+    cache = caches[settings.API_RESPONSE_VERSION_CACHE]
+    if isinstance(cache, (DummyCache, LocMemCache)):
+        return [
+            Error(
+                "API_RESPONSE_VERSION_CACHE must be shared by all workers to invalidate "
+                "cached responses.",
+                hint="Point API_RESPONSE_VERSION_CACHE to a file or Redis cache.",
+                obj=settings.API_RESPONSE_VERSION_CACHE,
+                id="core.E002",
+            )
+        ]
+    return []
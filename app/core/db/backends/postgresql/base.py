@@ -0,0 +1,104 @@
+import functools
+import threading
+
+from django.db.backends.base.base import NO_DB_ALIAS
+from django.db.backends.postgresql import base, creation
+
+from core.db.backends.postgresql.pool import ConnectionPool
+
+
+_pools = {}
+_pools_lock = threading.Lock()
+
+
+def get_pool(alias, database_name):
+    """Return the connection pool of a database alias and name, or None."""
+
+    return _pools.get((alias, database_name))
+
+
+def get_pool_stats():
+    """Return the stats of the connection pools of this process, by database alias."""
+
+    with _pools_lock:
+        pools = list(_pools.items())
+
+    return {alias: pool.stats() for (alias, _), pool in pools}
+
+
+def close_pools(database_name):
+    """Close and forget the connection pools of a database name."""
+
+    with _pools_lock:
+        keys = [key for key in _pools if key[1] == database_name]
+        pools = [_pools.pop(key) for key in keys]
+
+    for pool in pools:
+        pool.close()
+
+
+class DatabaseCreation(creation.DatabaseCreation):
+    """Test database creation closing pooled connections before dropping a database."""
+
+    def _destroy_test_db(self, test_database_name, verbosity):
+        close_pools(test_database_name)
+        super()._destroy_test_db(test_database_name, verbosity)
+
+
+class DatabaseWrapper(base.DatabaseWrapper):
+    """PostgreSQL backend checking connections out of a per-process pool.
+
+    The pool is configured by the ``POOL`` dict of the database settings with the
+    ``MIN_SIZE``, ``MAX_SIZE``, ``TIMEOUT``, ``MAX_IDLE``, ``MAX_LIFETIME`` and ``CHECK``
+    keys. Closing a connection returns it to the pool. Without ``POOL``, connections are
+    opened and closed like the stock backend does.
+    """
+
+    creation_class = DatabaseCreation
+
+    def get_pool(self, conn_params):
+        """Return the pool of this database, creating it on first use."""
+
+        options = self.settings_dict.get("POOL")
+        if not options or self.alias == NO_DB_ALIAS:
+            return None
+
+        key = (self.alias, conn_params.get("dbname"))
+        with _pools_lock:
+            pool = _pools.get(key)
+            created = pool is None
+            if created:
+                connect = functools.partial(super().get_new_connection, conn_params)
+                pool = _pools[key] = ConnectionPool(
+                    connect,
+                    min_size=options.get("MIN_SIZE", 0),
+                    max_size=options.get("MAX_SIZE", 10),
+                    timeout=options.get("TIMEOUT", 10),
+                    max_idle=options.get("MAX_IDLE", 300),
+                    max_lifetime=options.get("MAX_LIFETIME", 3600),
+                    check=options.get("CHECK", True),
+                )
+
+        if created:
+            pool.fill()
+        return pool
+
+    def get_new_connection(self, conn_params):
+        """Check out a connection of the pool, or open one when pooling is off."""
+
+        self.pool = self.get_pool(conn_params)
+        if self.pool is None:
+            return super().get_new_connection(conn_params)
+
+        return self.pool.getconn()
+
+    def _close(self):
+        """Return the connection to the pool, or close it when pooling is off."""
+
+        pool = getattr(self, "pool", None)
+        if self.connection is None or pool is None:
+            return super()._close()
+
+        with self.wrap_database_errors:
+            # Django keeps using the connection object when closed in an atomic block
+            pool.putconn(self.connection, close=self.in_atomic_block)
@@ -0,0 +1,259 @@
+import threading
+import time
+from collections import deque
+
+import psycopg2
+from psycopg2 import extensions
+
+
+class PoolTimeout(psycopg2.OperationalError):
+    """No connection of the pool became available in time."""
+
+
+class ConnectionPool:
+    """Thread-safe pool of PostgreSQL connections.
+
+    At most ``max_size`` connections are open at once; checkouts wait up to ``timeout``
+    seconds for one to be returned. ``fill`` opens ``min_size`` connections ahead of the
+    first checkouts, and connections discarded below that size are reopened in the
+    background. Idle connections beyond ``min_size`` are closed after ``max_idle`` seconds
+    and every connection is closed after ``max_lifetime`` seconds. With ``check`` enabled,
+    connections are pinged before they are handed out.
+    """
+
+    def __init__(
+        self,
+        connect,
+        min_size=0,
+        max_size=10,
+        timeout=10,
+        max_idle=300,
+        max_lifetime=3600,
+        check=True,
+    ):
+        self.connect = connect
+        self.min_size = min_size
+        self.max_size = max_size
+        self.timeout = timeout
+        self.max_idle = max_idle
+        self.max_lifetime = max_lifetime
+        self.check = check
+
+        self._condition = threading.Condition()
+        self._idle = deque()
+        self._created = {}
+        self._size = 0
+        self._waiting = 0
+        self._closed = False
+        self._filling = False
+        self._counters = dict.fromkeys(
+            [
+                "checkouts",
+                "checkout_failures",
+                "health_check_failures",
+                "connections_opened",
+                "connections_closed",
+            ],
+            0,
+        )
+        self._wait_seconds = 0.0
+        self._max_wait_seconds = 0.0
+
+    def fill(self):
+        """Open connections until the pool holds ``min_size`` of them."""
+
+        while True:
+            with self._condition:
+                if self._closed or self._size >= self.min_size:
+                    return
+                self._size += 1
+
+            try:
+                conn = self.connect()
+            except Exception:
+                self._discard(None)
+                raise
+
+            with self._condition:
+                self._counters["connections_opened"] += 1
+                self._created[id(conn)] = time.monotonic()
+            self.putconn(conn)
+
+    def getconn(self):
+        """Return a healthy connection, opening one if the pool is not full."""
+
+        start = time.monotonic()
+        deadline = start + self.timeout
+
+        while True:
+            conn, expired = self._acquire(deadline)
+            self._close_all(expired)
+
+            if conn is None:
+                try:
+                    conn = self.connect()
+                except Exception:
+                    self._discard(None, failed=True)
+                    raise
+                with self._condition:
+                    self._counters["connections_opened"] += 1
+                    self._created[id(conn)] = time.monotonic()
+            elif not self._is_healthy(conn):
+                with self._condition:
+                    self._counters["health_check_failures"] += 1
+                self._discard(conn)
+                continue
+
+            waited = time.monotonic() - start
+            with self._condition:
+                self._counters["checkouts"] += 1
+                self._wait_seconds += waited
+                self._max_wait_seconds = max(self._max_wait_seconds, waited)
+            return conn
+
+    def putconn(self, conn, close=False):
+        """Return a connection to the pool, closing it when unusable, expired or asked to."""
+
+        if not close and not conn.closed:
+            try:
+                if conn.info.transaction_status != extensions.TRANSACTION_STATUS_IDLE:
+                    conn.rollback()
+            except psycopg2.Error:
+                close = True
+
+        with self._condition:
+            age = time.monotonic() - self._created.get(id(conn), 0)
+            if close or conn.closed or self._closed or age > self.max_lifetime:
+                close = True
+            else:
+                self._idle.append((conn, time.monotonic()))
+                self._condition.notify()
+
+        if close:
+            self._discard(conn)
+
+    def close(self):
+        """Close the idle connections and those returned from now on."""
+
+        with self._condition:
+            self._closed = True
+            idle = [conn for conn, _ in self._idle]
+            self._idle.clear()
+            self._size -= len(idle)
+            self._condition.notify_all()
+        self._close_all(idle)
+
+    def stats(self):
+        """Return the size of the pool and its checkout counters."""
+
+        with self._condition:
+            checkouts = self._counters["checkouts"]
+            return {
+                "min_size": self.min_size,
+                "max_size": self.max_size,
+                "size": self._size,
+                "idle": len(self._idle),
+                "in_use": self._size - len(self._idle),
+                "waiting": self._waiting,
+                **self._counters,
+                "wait_seconds_total": self._wait_seconds,
+                "wait_seconds_max": self._max_wait_seconds,
+                "wait_seconds_avg": self._wait_seconds / checkouts if checkouts else None,
+            }
+
+    def _acquire(self, deadline):
+        """Take an idle connection or reserve room for a new one, with expired idle ones.
+
+        Returns a ``None`` connection when a new connection must be opened.
+        """
+
+        with self._condition:
+            self._waiting += 1
+            try:
+                while True:
+                    expired = self._expire_idle()
+                    if self._idle:
+                        # Reuse the most recently returned connection so the others can expire
+                        return self._idle.pop()[0], expired
+                    if self._size < self.max_size:
+                        self._size += 1
+                        return None, expired
+
+                    remaining = deadline - time.monotonic()
+                    if remaining <= 0:
+                        self._counters["checkout_failures"] += 1
+                        self._close_all(expired)
+                        raise PoolTimeout(
+                            f"No database connection available within {self.timeout} seconds."
+                        )
+                    self._close_all(expired)
+                    self._condition.wait(remaining)
+            finally:
+                self._waiting -= 1
+
+    def _expire_idle(self):
+        """Remove the connections idle for too long from the pool and return them."""
+
+        expired = []
+        now = time.monotonic()
+        while self._idle and self._size > self.min_size and now - self._idle[0][1] > self.max_idle:
+            expired.append(self._idle.popleft()[0])
+            self._size -= 1
+
+        return expired
+
+    def _is_healthy(self, conn):
+        """Return whether a pooled connection is open and, if checked, responds."""
+
+        if conn.closed:
+            return False
+        if not self.check:
+            return True
+
+        try:
+            with conn.cursor() as cursor:
+                cursor.execute("SELECT 1")
+            if not conn.autocommit:
+                conn.rollback()
+        except psycopg2.Error:
+            return False
+        return True
+
+    def _discard(self, conn, failed=False):
+        """Close a connection taken out of the pool and free its slot."""
+
+        with self._condition:
+            self._size -= 1
+            if failed:
+                self._counters["checkout_failures"] += 1
+            self._condition.notify()
+            refill = not self._filling and not self._closed and self._size < self.min_size
+            self._filling = self._filling or refill
+        if conn is not None:
+            self._close_all([conn])
+        if refill:
+            threading.Thread(target=self._refill, daemon=True).start()
+
+    def _refill(self):
+        """Reopen connections up to ``min_size`` in a background thread."""
+
+        try:
+            self.fill()
+        except Exception:
+            # Checkouts open connections themselves until the database is back
+            pass
+        finally:
+            with self._condition:
+                self._filling = False
+
+    def _close_all(self, conns):
+        """Close connections already removed from the pool."""
+
+        for conn in conns:
+            with self._condition:
+                self._created.pop(id(conn), None)
+                self._counters["connections_closed"] += 1
+            try:
+                conn.close()
+            except psycopg2.Error:
+                pass
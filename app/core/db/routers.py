@@ -0,0 +1,107 @@
+import random
+from contextvars import ContextVar
+
+from django.conf import settings
+from django.core.cache import caches
+from django.db import DEFAULT_DB_ALIAS
+from rest_framework.permissions import SAFE_METHODS
+
+
+class RoutingState:
+    """Database routing of the current request."""
+
+    def __init__(self, replica=None):
+        self.replica = replica
+        self.wrote = False
+
+
+_routing = ContextVar("database_routing", default=None)
+
+
+def get_stickiness_cache():
+    """Return the cache remembering which users read from the primary."""
+
+    return caches[settings.DATABASE_STICKINESS_CACHE]
+
+
+def _pin_key(user_id):
+    return f"db:primary-pin:{user_id}"
+
+
+def pin_to_primary(user_id):
+    """Send the reads of a user to the primary for the stickiness window."""
+
+    get_stickiness_cache().set(_pin_key(user_id), True, settings.DATABASE_PRIMARY_STICKINESS)
+
+
+async def apin_to_primary(user_id):
+    """Async version of ``pin_to_primary``."""
+
+    await get_stickiness_cache().aset(_pin_key(user_id), True, settings.DATABASE_PRIMARY_STICKINESS)
+
+
+def is_pinned_to_primary(user_id):
+    """Return whether a user wrote within the stickiness window."""
+
+    return get_stickiness_cache().get(_pin_key(user_id), False)
+
+
+class PrimaryReplicaRouter:
+    """Route reads of opted in requests to a replica and everything else to the primary.
+
+    Requests opt in with ``ReplicaReadMixin``. Once a request writes, its remaining reads
+    go to the primary too.
+    """
+
+    def db_for_read(self, model, **hints):
+        state = _routing.get()
+        if state is None or state.wrote:
+            return None
+        return state.replica
+
+    def db_for_write(self, model, **hints):
+        state = _routing.get()
+        if state is not None:
+            state.wrote = True
+        return DEFAULT_DB_ALIAS
+
+    def allow_relation(self, obj1, obj2, **hints):
+        databases = {DEFAULT_DB_ALIAS, *settings.DATABASE_REPLICAS}
+        if obj1._state.db in databases and obj2._state.db in databases:
+            return True
+        return None
+
+    def allow_migrate(self, db, app_label, model_name=None, **hints):
+        # Replicas copy the schema of the primary
+        return False if db in settings.DATABASE_REPLICAS else None
+
+
+class ReplicaReadMixin:
+    """Read from a replica in safe requests, unless the user wrote recently.
+
+    Requests that write pin their user to the primary for ``DATABASE_PRIMARY_STICKINESS``
+    seconds, so the user reads their own writes despite the replication lag.
+    """
+
+    def dispatch(self, request, *args, **kwargs):
+        token = _routing.set(RoutingState())
+        try:
+            return super().dispatch(request, *args, **kwargs)
+        finally:
+            _routing.reset(token)
+
+    def initial(self, request, *args, **kwargs):
+        super().initial(request, *args, **kwargs)
+
+        if (
+            settings.DATABASE_REPLICAS
+            and request.method in SAFE_METHODS
+            and not is_pinned_to_primary(request.user.id)
+        ):
+            _routing.get().replica = random.choice(settings.DATABASE_REPLICAS)
+
+    def finalize_response(self, request, response, *args, **kwargs):
+        if _routing.get().wrote and request.user.is_authenticated:
+            pin_to_primary(request.user.id)
+
+        return super().finalize_response(request, response, *args, **kwargs)
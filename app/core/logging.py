@@ -0,0 +1,28 @@
+import logging
+
+import orjson
+
+
+# Attributes of every log record, the others come from ``extra``
+RECORD_ATTRIBUTES = set(vars(logging.makeLogRecord({}))) | {"message", "asctime"}
+
+
+class JSONFormatter(logging.Formatter):
+    """Format log records as JSON lines with their ``extra`` fields."""
+
+    def format(self, record):
+        """Return the record as a JSON object."""
+
+        data = {
+            "time": self.formatTime(record),
+            "level": record.levelname,
+            "logger": record.name,
+            "message": record.getMessage(),
+        }
+        data.update(
+            (key, value) for key, value in vars(record).items() if key not in RECORD_ATTRIBUTES
+        )
+        if record.exc_info:
+            data["exception"] = self.formatException(record.exc_info)
+
+        return orjson.dumps(data, default=str).decode()
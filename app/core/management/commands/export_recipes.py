@@ -0,0 +1,165 @@
+import csv
+import gzip
+import json
+import os
+import shutil
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from django.contrib.auth import get_user_model
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection
+from django.db.models import Max, Min, Prefetch
+
+from recipes.models import Recipe, Tag
+
+
+UserModel = get_user_model()
+
+EXPORT_FIELDS = ("id", "user", "title", "description", "time_minutes", "price", "link", "tags")
+TAG_SEPARATOR = "|"
+FORMATS = ("ndjson", "csv")
+
+
+def open_export_file(path, compress):
+    """Open a text file for writing, gzip compressed if requested."""
+
+    if compress:
+        return gzip.open(path, "wt", encoding="utf-8", newline="")
+    return open(path, "w", encoding="utf-8", newline="")
+
+
+def iter_recipes(user_range, chunk_size):
+    """Yield export rows of recipes owned by users in the id range, one chunk in memory."""
+
+    tags = Prefetch("tags", queryset=Tag.objects.only("id", "name").order_by("name"))
+    queryset = (
+        Recipe.objects.filter(user_id__gte=user_range[0], user_id__lte=user_range[1])
+        .select_related("user")
+        .only("title", "description", "time_minutes", "price", "link", "user__email")
+        .prefetch_related(tags)
+        .order_by("user_id", "id")
+    )
+
+    for recipe in queryset.iterator(chunk_size=chunk_size):
+        yield {
+            "id": recipe.id,
+            "user": recipe.user.email,
+            "title": recipe.title,
+            "description": recipe.description,
+            "time_minutes": recipe.time_minutes,
+            "price": str(recipe.price),
+            "link": recipe.link,
+            "tags": [tag.name for tag in recipe.tags.all()],
+        }
+
+
+def write_rows(rows, stream, export_format, header=True):
+    """Write export rows to a text stream and return how many were written."""
+
+    count = 0
+    if export_format == "csv":
+        writer = csv.DictWriter(stream, fieldnames=EXPORT_FIELDS)
+        if header:
+            writer.writeheader()
+        for row in rows:
+            writer.writerow({**row, "tags": TAG_SEPARATOR.join(row["tags"])})
+            count += 1
+    else:
+        for row in rows:
+            stream.write(json.dumps(row, ensure_ascii=False) + "\n")
+            count += 1
+
+    return count
+
+
+def split_range(start, end, parts):
+    """Split an inclusive id range into at most ``parts`` contiguous ranges."""
+
+    size = max((end - start + 1) // parts, 1)
+    bounds = list(range(start, end + 1, size))[:parts]
+    return [(low, high - 1) for low, high in zip(bounds, bounds[1:] + [end + 1])]
+
+
+class Command(BaseCommand):
+    """Django command to export recipes with their tags to NDJSON or CSV."""
+
+    help = "Stream recipes with tag names to an NDJSON or CSV file using server-side cursors."
+
+    def add_arguments(self, parser):
+        parser.add_argument("output", help="Output file path, '-' for stdout.")
+        parser.add_argument("--format", choices=FORMATS, default="ndjson")
+        parser.add_argument("--gzip", action="store_true", help="Gzip compress the output.")
+        parser.add_argument("--chunk-size", type=int, default=2000)
+        parser.add_argument(
+            "--workers",
+            type=int,
+            default=1,
+            help="Export user id ranges in parallel, each over its own connection.",
+        )
+
+    def handle(self, *args, **options):
+        """Entrypoint for command."""
+
+        output = options["output"]
+        workers = options["workers"]
+        if output == "-" and (workers > 1 or options["gzip"]):
+            raise CommandError("Parallel and compressed exports need an output file.")
+
+        bounds = UserModel.objects.aggregate(start=Min("id"), end=Max("id"))
+        if bounds["start"] is None:
+            bounds = {"start": 0, "end": 0}
+        ranges = split_range(bounds["start"], bounds["end"], max(workers, 1))
+
+        started = time.perf_counter()
+        if output == "-":
+            count = sum(
+                write_rows(
+                    iter_recipes(user_range, options["chunk_size"]),
+                    self.stdout,
+                    options["format"],
+                    header=index == 0,
+                )
+                for index, user_range in enumerate(ranges)
+            )
+        else:
+            count = self.export_parts(output, ranges, options)
+        elapsed = time.perf_counter() - started
+
+        self.stderr.write(f"Exported {count} recipes in {elapsed:.2f}s")
+
+    def export_parts(self, output, ranges, options):
+        """Export every range to its own part file and join the parts into the output."""
+
+        parts = [f"{output}.part{index}" for index in range(len(ranges))]
+
+        def export_part(index):
+            with open_export_file(parts[index], options["gzip"]) as stream:
+                rows = iter_recipes(ranges[index], options["chunk_size"])
+                return write_rows(rows, stream, options["format"], header=index == 0)
+
+        def export_part_in_thread(index):
+            try:
+                return export_part(index)
+            finally:
+                connection.close()
+
+        try:
+            if len(parts) == 1:
+                count = export_part(0)
+                os.replace(parts[0], output)
+            else:
+                with ThreadPoolExecutor(max_workers=len(parts)) as executor:
+                    count = sum(executor.map(export_part_in_thread, range(len(parts))))
+
+                # Concatenated gzip members form a valid gzip file
+                with open(output, "wb") as destination:
+                    for part in parts:
+                        with open(part, "rb") as source:
+                            shutil.copyfileobj(source, destination)
+        finally:
+            for part in parts:
+                if os.path.exists(part):
+                    os.remove(part)
+
+        return count
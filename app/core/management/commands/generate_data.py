@@ -0,0 +1,210 @@
+import random
+import time
+from decimal import Decimal
+from itertools import accumulate
+
+from django.contrib.auth import get_user_model
+from django.contrib.auth.hashers import make_password
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection, transaction
+
+from core.management.commands.import_recipes import RECIPE_COLUMNS, copy_rows, reserve_ids
+from recipes.models import Recipe, Tag, recount_recipe_counts
+
+
+UserModel = get_user_model()
+
+RecipeTag = Recipe.tags.through
+# Fields of the generated recipe values, the columns of the COPY rows without the id
+RECIPE_FIELDS = ("user_id", "title", "description", "time_minutes", "price", "link")
+
+ADJECTIVES = (
+    "Classic, Crispy, Creamy, Smoky, Spicy, Tangy, Roasted, Grilled, Braised, Quick,"
+    " Rustic, Zesty, Hearty, Sweet, Savory, Herbed, Garlicky, Golden"
+).split(", ")
+INGREDIENTS = (
+    "Chicken, Beef, Pork, Salmon, Shrimp, Tofu, Lentil, Chickpea, Mushroom, Spinach,"
+    " Tomato, Potato, Pumpkin, Eggplant, Lemon, Apple, Chocolate, Rice"
+).split(", ")
+DISHES = (
+    "Curry, Stew, Soup, Salad, Pie, Tacos, Pasta, Risotto, Stir Fry, Bake, Skewers,"
+    " Burger, Bowl, Casserole, Cake, Tart, Noodles, Sandwich"
+).split(", ")
+TAG_NAMES = (
+    "Dinner, Lunch, Breakfast, Dessert, Vegan, Vegetarian, Gluten Free, Quick, Healthy,"
+    " Comfort Food, Spicy, Budget, Party, Kids, Italian, Mexican, Indian, Asian, French,"
+    " Baking, Grill, One Pot, Meal Prep, Holiday"
+).split(", ")
+
+
+def allocate(total, weights):
+    """Split a total into integer parts proportional to weights, by largest remainder."""
+
+    weight_sum = sum(weights)
+    shares = [total * weight / weight_sum for weight in weights]
+    counts = [int(share) for share in shares]
+
+    by_remainder = sorted(range(len(shares)), key=lambda i: counts[i] - shares[i])
+    for i in by_remainder[: total - sum(counts)]:
+        counts[i] += 1
+
+    return counts
+
+
+def tag_names(count):
+    """Return ``count`` distinct tag names."""
+
+    names = []
+    for i in range(count):
+        cycle, index = divmod(i, len(TAG_NAMES))
+        names.append(f"{TAG_NAMES[index]} {cycle + 1}" if cycle else TAG_NAMES[index])
+
+    return names
+
+
+class Command(BaseCommand):
+    """Django command to generate a deterministic synthetic dataset."""
+
+    help = (
+        "Generate users with a heavy-tailed number of recipes and tags shared across their "
+        "recipes. The same options and seed always generate the same data."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--users", type=int, default=1000)
+        parser.add_argument("--recipes", type=int, default=50000, help="Recipes of all users.")
+        parser.add_argument("--tags-per-user", type=int, default=30)
+        parser.add_argument("--max-tags-per-recipe", type=int, default=5)
+        parser.add_argument(
+            "--skew",
+            type=float,
+            default=1.2,
+            help="Pareto shape of recipes per user, lower values give a heavier tail.",
+        )
+        parser.add_argument("--seed", type=int, default=0)
+        parser.add_argument("--email-prefix", default="synthetic")
+        parser.add_argument("--password", default="password123", help="Password of all users.")
+        parser.add_argument("--batch-size", type=int, default=10000)
+        parser.add_argument(
+            "--no-copy", action="store_true", help="Use bulk_create even on PostgreSQL."
+        )
+
+    def handle(self, *args, **options):
+        """Entrypoint for command."""
+
+        if options["batch_size"] < 1 or options["skew"] <= 0:
+            raise CommandError("Batch size and skew must be positive.")
+
+        prefix = options["email_prefix"]
+        if UserModel.objects.filter(email__startswith=prefix, email__endswith="@ex.com").exists():
+            raise CommandError(f"Users with the email prefix {prefix!r} already exist.")
+
+        self.rng = random.Random(options["seed"])
+        self.options = options
+        self.use_copy = connection.vendor == "postgresql" and not options["no_copy"]
+        self.inserted = 0
+        self.started = time.perf_counter()
+
+        weights = [self.rng.paretovariate(options["skew"]) for _ in range(options["users"])]
+        counts = allocate(options["recipes"], weights) if options["users"] else []
+        # Hashing is slow by design, so every user shares one hash of the password
+        password = make_password(options["password"])
+        names = tag_names(options["tags_per_user"])
+        # Tags are picked with Zipf-like popularity, so a few tags cover most recipes
+        cum_weights = list(accumulate(1 / (rank + 1) for rank in range(len(names))))
+
+        batch_size = options["batch_size"]
+        pending = []
+        for start in range(0, options["users"], batch_size):
+            with transaction.atomic():
+                users = UserModel.objects.bulk_create(
+                    [
+                        UserModel(email=f"{prefix}{i}@ex.com", name=f"User {i}", password=password)
+                        for i in range(start, min(start + batch_size, options["users"]))
+                    ]
+                )
+                tags = Tag.objects.bulk_create(
+                    [Tag(user=user, name=name) for user in users for name in names],
+                    batch_size=batch_size,
+                )
+
+            for index, user in enumerate(users):
+                user_tags = tags[index * len(names) : (index + 1) * len(names)]
+                for _ in range(counts[start + index]):
+                    pending.append(self.build_recipe(user, user_tags, cum_weights))
+                    if len(pending) == batch_size:
+                        self.insert_recipes(pending)
+                        pending = []
+
+        if pending:
+            self.insert_recipes(pending)
+
+        # Counting once at the end is cheaper than per batch, the generated tags are new
+        tags = Tag.objects.filter(user__email__startswith=prefix, user__email__endswith="@ex.com")
+        recount_recipe_counts(tags)
+
+        if connection.vendor == "postgresql":
+            with connection.cursor() as cursor:
+                cursor.execute("ANALYZE")
+
+        elapsed = time.perf_counter() - self.started
+        self.stdout.write(
+            self.style.SUCCESS(
+                f"Generated {options['users']} users and {self.inserted} recipes in {elapsed:.2f}s"
+            )
+        )
+
+    def build_recipe(self, user, tags, cum_weights):
+        """Return the field values of a recipe of a user, without id, and its tag ids."""
+
+        rng = self.rng
+        ingredient = rng.choice(INGREDIENTS)
+        dish = rng.choice(DISHES)
+        values = (
+            user.id,
+            f"{rng.choice(ADJECTIVES)} {ingredient} {dish}",
+            f"A {dish.lower()} with {ingredient.lower()}, serves {rng.randint(1, 8)}.",
+            rng.randint(5, 240),
+            Decimal(rng.randint(100, 9999)) / 100,
+            f"https://ex.com/recipes/{rng.getrandbits(48):012x}.pdf",
+        )
+
+        count = rng.randint(0, min(self.options["max_tags_per_recipe"], len(tags)))
+        picked = rng.choices(tags, cum_weights=cum_weights, k=count) if count else []
+
+        return values, list({tag.id: tag for tag in picked})
+
+    def insert_recipes(self, pending):
+        """Insert a batch of recipes with their tags."""
+
+        with transaction.atomic():
+            if self.use_copy:
+                # Copy plain rows, as building model instances would dominate the run time
+                ids = reserve_ids(Recipe, len(pending))
+                copy_rows(
+                    Recipe,
+                    RECIPE_COLUMNS,
+                    ((recipe_id, *values) for recipe_id, (values, _) in zip(ids, pending)),
+                )
+            else:
+                recipes = Recipe.objects.bulk_create(
+                    [Recipe(**dict(zip(RECIPE_FIELDS, values))) for values, _ in pending]
+                )
+                ids = [recipe.id for recipe in recipes]
+
+            links = [
+                (recipe_id, tag_id)
+                for recipe_id, (_, tag_ids) in zip(ids, pending)
+                for tag_id in tag_ids
+            ]
+            if self.use_copy:
+                copy_rows(RecipeTag, ("recipe", "tag"), links)
+            else:
+                RecipeTag.objects.bulk_create(
+                    [RecipeTag(recipe_id=recipe_id, tag_id=tag_id) for recipe_id, tag_id in links],
+                    batch_size=self.options["batch_size"],
+                )
+
+        self.inserted += len(pending)
+        elapsed = time.perf_counter() - self.started
+        self.stdout.write(f"{self.inserted} recipes inserted, {self.inserted / elapsed:.0f} rows/s")
@@ -0,0 +1,292 @@
+import csv
+import gzip
+import io
+import json
+import os
+import time
+from decimal import Decimal, InvalidOperation
+from itertools import islice
+
+from django.contrib.auth import get_user_model
+from django.core.exceptions import ValidationError
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection, transaction
+
+from core.management.commands.export_recipes import FORMATS, TAG_SEPARATOR
+from recipes.cache import bump_data_version
+from recipes.models import Recipe, Tag, recount_recipe_counts
+
+
+UserModel = get_user_model()
+
+RecipeTag = Recipe.tags.through
+RECIPE_COLUMNS = ("id", "user", "title", "description", "time_minutes", "price", "link")
+TAG_NAME_MAX_LENGTH = Tag._meta.get_field("name").max_length
+# Largest value of an integer column, checked as SQLite has no range for the validators
+MAX_TIME_MINUTES = 2**31 - 1
+
+
+def open_import_file(path):
+    """Open a text file for reading, decompressing it if it has a ``.gz`` suffix."""
+
+    if path.endswith(".gz"):
+        return gzip.open(path, "rt", encoding="utf-8", newline="")
+    return open(path, encoding="utf-8", newline="")
+
+
+def detect_format(path):
+    """Guess the import format from the file name."""
+
+    name = path[:-3] if path.endswith(".gz") else path
+    return "csv" if name.endswith(".csv") else "ndjson"
+
+
+def iter_rows(stream, import_format):
+    """Yield rows as dicts with tags as a list of names, and lines that are not JSON as is."""
+
+    if import_format == "csv":
+        for row in csv.DictReader(stream):
+            row["tags"] = [name for name in row.get("tags", "").split(TAG_SEPARATOR) if name]
+            yield row
+    else:
+        for line in stream:
+            if line.strip():
+                try:
+                    yield json.loads(line)
+                except json.JSONDecodeError:
+                    # Still yielded, to be reported as invalid and counted in the checkpoint
+                    yield line.strip()
+
+
+def read_checkpoint(path):
+    """Return the number of rows already imported according to the checkpoint file."""
+
+    if not path or not os.path.exists(path):
+        return 0
+    with open(path) as stream:
+        return int(stream.read().strip() or 0)
+
+
+def write_checkpoint(path, rows_done):
+    """Atomically store the number of imported rows."""
+
+    tmp_path = f"{path}.tmp"
+    with open(tmp_path, "w") as stream:
+        stream.write(str(rows_done))
+    os.replace(tmp_path, path)
+
+
+def copy_rows(model, columns, rows):
+    """Load rows into the table of a model with PostgreSQL COPY."""
+
+    buffer = io.StringIO()
+    # Quoted empty strings stay empty strings, only unquoted empty values are NULL
+    csv.writer(buffer, quoting=csv.QUOTE_ALL).writerows(rows)
+    buffer.seek(0)
+
+    quote_name = connection.ops.quote_name
+    db_columns = ", ".join(quote_name(model._meta.get_field(name).column) for name in columns)
+    sql = f"COPY {quote_name(model._meta.db_table)} ({db_columns}) FROM STDIN WITH (FORMAT csv)"
+    with connection.cursor() as cursor:
+        cursor.copy_expert(sql, buffer)
+
+
+def reserve_ids(model, count):
+    """Return ``count`` new ids from the id sequence of a model table."""
+
+    with connection.cursor() as cursor:
+        cursor.execute(
+            "SELECT nextval(pg_get_serial_sequence(%s, 'id')) FROM generate_series(1, %s)",
+            [model._meta.db_table, count],
+        )
+        return [row[0] for row in cursor.fetchall()]
+
+
+def copy_recipes(recipes):
+    """Insert recipes with COPY, reserving their ids from the sequence first."""
+
+    for recipe, recipe_id in zip(recipes, reserve_ids(Recipe, len(recipes))):
+        recipe.id = recipe_id
+
+    copy_rows(
+        Recipe,
+        RECIPE_COLUMNS,
+        (
+            (r.id, r.user_id, r.title, r.description, r.time_minutes, r.price, r.link)
+            for r in recipes
+        ),
+    )
+
+
+def resolve_tags(pairs):
+    """Return a mapping of (user id, name) pairs to tag ids, creating missing tags in bulk."""
+
+    user_ids = {user_id for user_id, _ in pairs}
+    names = {name for _, name in pairs}
+
+    def lookup(user_ids, names):
+        tags = Tag.objects.filter(user_id__in=user_ids, name__in=names)
+        return {
+            (user_id, name): tag_id
+            for user_id, name, tag_id in tags.values_list("user_id", "name", "id")
+            if (user_id, name) in pairs
+        }
+
+    tag_ids = lookup(user_ids, names)
+    missing = pairs - tag_ids.keys()
+    if missing:
+        Tag.objects.bulk_create(
+            [Tag(user_id=user_id, name=name) for user_id, name in missing],
+            ignore_conflicts=True,
+        )
+        tag_ids.update(lookup({pair[0] for pair in missing}, {pair[1] for pair in missing}))
+
+    return tag_ids
+
+
+class Command(BaseCommand):
+    """Django command to import recipes with their tags from NDJSON or CSV."""
+
+    help = "Load recipes with tag names in batches, using COPY on PostgreSQL."
+
+    def add_arguments(self, parser):
+        parser.add_argument("input", help="Input file path, gzip compressed if it ends with .gz.")
+        parser.add_argument("--format", choices=FORMATS, help="Defaults to the file extension.")
+        parser.add_argument("--batch-size", type=int, default=5000)
+        parser.add_argument(
+            "--checkpoint",
+            help="File storing the number of imported rows, used to resume an interrupted import.",
+        )
+        parser.add_argument(
+            "--no-copy", action="store_true", help="Use bulk_create even on PostgreSQL."
+        )
+
+    def handle(self, *args, **options):
+        """Entrypoint for command."""
+
+        if options["batch_size"] < 1:
+            raise CommandError("Batch size must be positive.")
+
+        import_format = options["format"] or detect_format(options["input"])
+        checkpoint = options["checkpoint"]
+        self.use_copy = connection.vendor == "postgresql" and not options["no_copy"]
+        self.user_ids = {}
+
+        rows_done = read_checkpoint(checkpoint)
+        imported = skipped = 0
+        started = time.perf_counter()
+
+        with open_import_file(options["input"]) as stream:
+            rows = islice(iter_rows(stream, import_format), rows_done, None)
+            while batch := list(islice(rows, options["batch_size"])):
+                with transaction.atomic():
+                    batch_imported = self.import_batch(batch)
+                rows_done += len(batch)
+                imported += batch_imported
+                skipped += len(batch) - batch_imported
+                if checkpoint:
+                    write_checkpoint(checkpoint, rows_done)
+
+                elapsed = time.perf_counter() - started
+                self.stdout.write(f"{rows_done} rows processed, {imported / elapsed:.0f} rows/s")
+
+        elapsed = time.perf_counter() - started
+        rate = imported / elapsed if elapsed else 0
+        self.stdout.write(
+            self.style.SUCCESS(
+                f"Imported {imported} recipes, skipped {skipped}, "
+                f"in {elapsed:.2f}s ({rate:.0f} rows/s)"
+            )
+        )
+
+    def get_user_ids(self, emails):
+        """Return user ids by email, looking up unknown emails in one query."""
+
+        unknown = set(emails) - self.user_ids.keys()
+        if unknown:
+            users = UserModel.objects.filter(email__in=unknown).values_list("email", "id")
+            self.user_ids.update(users)
+            self.user_ids.update((email, None) for email in unknown - self.user_ids.keys())
+
+        return self.user_ids
+
+    def build_recipe(self, row, user_ids):
+        """Return an unsaved recipe for a row, or None when the row is invalid.
+
+        Values are checked with the validators of the model fields, so a value not fitting
+        its column skips the row instead of failing the whole batch.
+        """
+
+        if not isinstance(row, dict):
+            return None
+        user_id = user_ids.get(row.get("user"))
+        if user_id is None:
+            return None
+
+        try:
+            recipe = Recipe(
+                user_id=user_id,
+                title=row["title"],
+                description=row.get("description") or "",
+                time_minutes=int(row["time_minutes"]),
+                price=Decimal(row["price"]),
+                link=row.get("link") or "",
+            )
+            recipe.clean_fields(exclude=["user"])
+        except (KeyError, TypeError, ValueError, InvalidOperation, ValidationError):
+            return None
+
+        tags = row.get("tags") or []
+        if not 0 <= recipe.time_minutes <= MAX_TIME_MINUTES or not isinstance(tags, list):
+            return None
+        if not all(isinstance(name, str) and len(name) <= TAG_NAME_MAX_LENGTH for name in tags):
+            return None
+
+        return recipe
+
+    def import_batch(self, batch):
+        """Insert a batch of rows and return the number of imported recipes."""
+
+        user_ids = self.get_user_ids(row.get("user") for row in batch if isinstance(row, dict))
+
+        recipes = []
+        recipe_tags = []
+        for row in batch:
+            recipe = self.build_recipe(row, user_ids)
+            if recipe is None:
+                self.stderr.write(f"Skipping invalid row: {row}")
+                continue
+            recipes.append(recipe)
+            recipe_tags.append(list(dict.fromkeys(row.get("tags") or [])))
+
+        if not recipes:
+            return 0
+
+        pairs = {
+            (recipe.user_id, name) for recipe, names in zip(recipes, recipe_tags) for name in names
+        }
+        tag_ids = resolve_tags(pairs) if pairs else {}
+
+        if self.use_copy:
+            copy_recipes(recipes)
+        else:
+            Recipe.objects.bulk_create(recipes)
+
+        links = [
+            (recipe.id, tag_ids[(recipe.user_id, name)])
+            for recipe, names in zip(recipes, recipe_tags)
+            for name in names
+        ]
+        if self.use_copy:
+            copy_rows(RecipeTag, ("recipe", "tag"), links)
+        else:
+            RecipeTag.objects.bulk_create(
+                [RecipeTag(recipe_id=recipe_id, tag_id=tag_id) for recipe_id, tag_id in links]
+            )
+        if links:
+            recount_recipe_counts(Tag.objects.filter(id__in={tag_id for _, tag_id in links}))
+
+        for user_id in {recipe.user_id for recipe in recipes}:
+            bump_data_version(user_id)
+
+        return len(recipes)
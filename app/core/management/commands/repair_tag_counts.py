@@ -0,0 +1,35 @@
+import time
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db.models import Max, Min
+
+from recipes.models import Tag, recount_recipe_counts
+
+
+class Command(BaseCommand):
+    """Django command to recompute the recipe counts of tags."""
+
+    help = "Recompute the denormalized recipe counts of tags in batches of tag ids."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--batch-size", type=int, default=10000, help="Tag ids per update.")
+
+    def handle(self, *args, **options):
+        """Entrypoint for command."""
+
+        batch_size = options["batch_size"]
+        if batch_size < 1:
+            raise CommandError("Batch size must be positive.")
+
+        started = time.perf_counter()
+        bounds = Tag.objects.aggregate(low=Min("id"), high=Max("id"))
+        repaired = 0
+        if bounds["low"] is not None:
+            for start in range(bounds["low"], bounds["high"] + 1, batch_size):
+                tags = Tag.objects.filter(id__gte=start, id__lt=start + batch_size)
+                repaired += recount_recipe_counts(tags)
+
+        elapsed = time.perf_counter() - started
+        self.stdout.write(
+            self.style.SUCCESS(f"Repaired the recipe counts of {repaired} tags in {elapsed:.2f}s")
+        )
@@ -0,0 +1,138 @@
+import logging
+import random
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction
+from django.conf import settings
+
+
+logger = logging.getLogger("core.instrumentation")
+
+
+class QueryCounter:
+    """Database execute wrapper counting queries and their duration."""
+
+    def __init__(self):
+        self.count = 0
+        self.seconds = 0.0
+
+    def __call__(self, execute, sql, params, many, context):
+        start = time.perf_counter()
+        try:
+            return execute(sql, params, many, context)
+        finally:
+            self.count += 1
+            self.seconds += time.perf_counter() - start
+
+
+_query_counter = ContextVar("query_counter", default=None)
+
+
+def count_query(execute, sql, params, many, context):
+    """Database execute wrapper passing queries to the counter of the current request.
+
+    The counter is looked up in a context variable rather than installed per connection, as
+    connections are thread local and ``sync_to_async`` runs the queries of ASGI requests in
+    another thread than the middleware, with a copy of its context.
+    """
+
+    counter = _query_counter.get()
+    if counter is None:
+        return execute(sql, params, many, context)
+    return counter(execute, sql, params, many, context)
+
+
+def install_query_counter(sender, connection, **kwargs):
+    """Add ``count_query`` to the execute wrappers of a new database connection."""
+
+    if count_query not in connection.execute_wrappers:
+        connection.execute_wrappers.insert(0, count_query)
+
+
+class RequestInstrumentationMiddleware:
+    """Record SQL queries and timing of a sample of requests.
+
+    Sampled responses get a ``Server-Timing`` header with the database and total time,
+    and are logged with the view name and query count as structured fields. Requests with
+    more queries than ``REQUEST_QUERY_BUDGET`` are logged as warnings.
+    """
+
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        if iscoroutinefunction(get_response):
+            markcoroutinefunction(self)
+
+    def __call__(self, request):
+        if iscoroutinefunction(self):
+            return self.__acall__(request)
+        if not self.is_sampled():
+            return self.get_response(request)
+
+        counter = QueryCounter()
+        start = time.perf_counter()
+        with self.count_queries(counter):
+            response = self.get_response(request)
+        self.record(request, response, counter, time.perf_counter() - start)
+
+        return response
+
+    async def __acall__(self, request):
+        if not self.is_sampled():
+            return await self.get_response(request)
+
+        counter = QueryCounter()
+        start = time.perf_counter()
+        with self.count_queries(counter):
+            response = await self.get_response(request)
+        self.record(request, response, counter, time.perf_counter() - start)
+
+        return response
+
+    def is_sampled(self):
+        """Return whether to instrument the current request."""
+
+        rate = settings.REQUEST_INSTRUMENTATION_SAMPLE_RATE
+        return rate >= 1 or random.random() < rate
+
+    @contextmanager
+    def count_queries(self, counter):
+        """Count the queries of all databases within the block with the counter."""
+
+        token = _query_counter.set(counter)
+        try:
+            yield
+        finally:
+            _query_counter.reset(token)
+
+    def record(self, request, response, counter, seconds):
+        """Add the Server-Timing header to the response and log the request."""
+
+        db_ms = counter.seconds * 1000
+        total_ms = seconds * 1000
+        response[
+            "Server-Timing"
+        ] = f'db;dur={db_ms:.1f};desc="{counter.count} queries", total;dur={total_ms:.1f}'
+
+        match = request.resolver_match
+        over_budget = counter.count > settings.REQUEST_QUERY_BUDGET
+        logger.log(
+            logging.WARNING if over_budget else logging.INFO,
+            "%s %s",
+            request.method,
+            request.path,
+            extra={
+                "view": match.view_name if match else None,
+                "method": request.method,
+                "path": request.path,
+                "status": response.status_code,
+                "queries": counter.count,
+                "db_ms": round(db_ms, 1),
+                "duration_ms": round(total_ms, 1),
+                "over_query_budget": over_budget,
+            },
+        )
@@ -0,0 +1,38 @@
+from io import BytesIO
+
+import orjson
+from django.conf import settings
+from rest_framework.parsers import JSONParser
+
+
+# Maps digits to 0 and other bytes to spaces, to find runs of digits faster than a regex
+DIGITS = bytes(ord("0") if byte in b"0123456789" else ord(" ") for byte in range(256))
+
+# Integers of 19 digits or more may be beyond the 64 bit range, where orjson returns floats
+LONG_INTEGER = b"0" * 19
+
+
+class ORJSONParser(JSONParser):
+    """JSON parser decoding UTF-8 bodies with orjson.
+
+    Bodies in other encodings, with integers of 19 digits or more, which orjson turns into
+    floats past 64 bits, or which orjson rejects, are parsed by the standard parser.
+    """
+
+    def parse(self, stream, media_type=None, parser_context=None):
+        """Parse the incoming bytestream as JSON and return the resulting data."""
+
+        parser_context = parser_context or {}
+        encoding = parser_context.get("encoding", settings.DEFAULT_CHARSET)
+        if encoding.lower().replace("-", "") != "utf8":
+            return super().parse(stream, media_type, parser_context)
+
+        data = stream.read()
+        if LONG_INTEGER not in data.translate(DIGITS):
+            try:
+                return orjson.loads(data)
+            except orjson.JSONDecodeError:
+                # e.g. lone surrogates the standard parser accepts
+                pass
+
+        return super().parse(BytesIO(data), media_type, parser_context)
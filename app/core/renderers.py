@@ -0,0 +1,85 @@
+import math
+
+import orjson
+from rest_framework.renderers import JSONRenderer
+
+
+ORJSON_OPTIONS = orjson.OPT_NON_STR_KEYS | orjson.OPT_PASSTHROUGH_DATETIME
+
+# Maps digits to 0, "e" to itself and other bytes to spaces, to find float exponents such
+# as 1e16, which the standard renderer writes 1e+16, faster than a regex
+EXPONENTS = bytes(
+    ord("0") if byte in b"0123456789" else byte if byte == ord("e") else ord(" ")
+    for byte in range(256)
+)
+
+
+def has_non_finite_float(data):
+    """Return whether NaN or an infinite float is nested in the dicts, lists and tuples of data."""
+
+    stack = [data]
+    while stack:
+        item = stack.pop()
+        if isinstance(item, float):
+            if not math.isfinite(item):
+                return True
+        elif isinstance(item, dict):
+            stack.extend(item)
+            stack.extend(item.values())
+        elif isinstance(item, (list, tuple)):
+            stack.extend(item)
+    return False
+
+
+def count_top_level_none(data):
+    """Return the number of None values in a dict or items in a list."""
+
+    if isinstance(data, dict):
+        return list(data.values()).count(None)
+    if isinstance(data, (list, tuple)):
+        return data.count(None)
+    return 0
+
+
+class ORJSONRenderer(JSONRenderer):
+    """JSON renderer encoding with orjson, with the same output as DRF's JSONRenderer.
+
+    Dates, times and other types orjson passes through are encoded by DRF's encoder.
+    Indented, ASCII-only or non-compact output is left to the standard renderer, as is data
+    orjson renders differently: integers over 64 bits, floats with an exponent, and NaN and
+    infinite floats, for which the standard renderer raises a ``ValueError``.
+    """
+
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        """Render ``data`` into JSON, returning a bytestring."""
+
+        if data is None:
+            return b""
+
+        renderer_context = renderer_context or {}
+        indent = self.get_indent(accepted_media_type, renderer_context)
+        if indent is not None or self.ensure_ascii or not self.compact:
+            return super().render(data, accepted_media_type, renderer_context)
+
+        try:
+            ret = orjson.dumps(data, default=self.encoder_class().default, option=ORJSON_OPTIONS)
+        except orjson.JSONEncodeError:
+            # e.g. integers over 64 bits
+            return super().render(data, accepted_media_type, renderer_context)
+
+        # orjson renders NaN and infinity as null. Nulls of top level None values, such as
+        # pagination links, are counted cheaply. Otherwise data of JSON types decodes back
+        # equal unless it had some, so only data that does not is searched for them.
+        if (
+            ret.count(b"null") > count_top_level_none(data)
+            and orjson.loads(ret) != data
+            and has_non_finite_float(data)
+        ):
+            return super().render(data, accepted_media_type, renderer_context)
+
+        # Also matches text such as "2eggs", which is rendered the same by either renderer
+        if b"0e" in ret.translate(EXPONENTS):
+            return super().render(data, accepted_media_type, renderer_context)
+
+        # Escape \u2028 and \u2029 like DRF does, to output a strict javascript subset
+        return ret.replace(b"\xe2\x80\xa8", b"\\u2028").replace(b"\xe2\x80\xa9", b"\\u2029")
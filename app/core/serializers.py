@@ -0,0 +1,15 @@
+def save_changed_fields(instance, values, changed_fields=()):
+    """Set the values that differ from the instance and save only those columns.
+
+    ``changed_fields`` names fields already changed on the instance. Nothing is written
+    when no field changed. Return the names of the saved fields.
+    """
+
+    changed = [name for name, value in values.items() if getattr(instance, name) != value]
+    for name in changed:
+        setattr(instance, name, values[name])
+
+    update_fields = [*changed_fields, *changed]
+    if update_fields:
+        instance.save(update_fields=update_fields)
+    return update_fields
@@ -0,0 +1,6 @@
+from django.db.backends.signals import connection_created
+
+from core.middleware import install_query_counter
+
+
+connection_created.connect(install_query_counter, dispatch_uid="core.install_query_counter")
@@ -0,0 +1,83 @@
+from django.db import connection, transaction
+from django.test.utils import CaptureQueriesContext
+from django.urls import get_resolver
+
+
+def iter_route_names(patterns=None, namespace=None):
+    """Yield the namespaced names of the URL patterns, by default of the root URLconf."""
+
+    for pattern in get_resolver().url_patterns if patterns is None else patterns:
+        if hasattr(pattern, "url_patterns"):
+            nested = ":".join(filter(None, [namespace, pattern.namespace])) or None
+            yield from iter_route_names(pattern.url_patterns, nested)
+        elif pattern.name:
+            yield f"{namespace}:{pattern.name}" if namespace else pattern.name
+
+
+class QueryBudgetMixin:
+    """Check the number of queries of every route against a budget, at two data sizes.
+
+    Mixed into a ``TestCase``, subclasses must define:
+
+    - ``budgets``, a mapping of ``(route name, method)`` to the maximum number of queries,
+    - ``seed(size)``, creating the data of a size and returning a context,
+    - ``get_request(route, method, context)``, returning the URL and payload of a request.
+
+    A route fails when its query count exceeds the budget or differs between the ``sizes``,
+    which points at queries run per item.
+    """
+
+    sizes = (2, 20)
+    excluded_namespaces = ("admin",)
+
+    @classmethod
+    def setUpClass(cls):
+        """Check the subclass defines the budgets and hooks."""
+
+        missing = [name for name in ("budgets", "seed", "get_request") if not hasattr(cls, name)]
+        if missing:
+            raise TypeError(f"{cls.__name__} must define {', '.join(missing)}.")
+
+        super().setUpClass()
+
+    def prepare_request(self, context):
+        """Reset state, such as caches, before a measured request."""
+
+    def count_queries(self, route, method, size):
+        """Return the number of queries of a request to the route at a data size."""
+
+        with transaction.atomic():
+            context = self.seed(size)
+            url, data = self.get_request(route, method, context)
+            self.prepare_request(context)
+
+            with CaptureQueriesContext(connection) as queries:
+                response = getattr(self.client, method.lower())(url, data, format="json")
+            self.assertLess(response.status_code, 400, f"{method} {route}: {response.content}")
+
+            transaction.set_rollback(True)
+
+        return len(queries)
+
+    def test_every_route_has_a_budget(self):
+        """Test every route of the URLconf declares a query budget."""
+
+        routes = {
+            name
+            for name in iter_route_names()
+            if name.split(":")[0] not in self.excluded_namespaces
+        }
+
+        self.assertEqual(routes - {route for route, _ in self.budgets}, set())
+
+    def test_query_budgets(self):
+        """Test every route stays within its budget and does not scale with the data."""
+
+        for (route, method), budget in self.budgets.items():
+            with self.subTest(route=route, method=method):
+                counts = [self.count_queries(route, method, size) for size in self.sizes]
+
+                self.assertEqual(
+                    len(set(counts)), 1, f"Queries grow with data size {self.sizes}: {counts}"
+                )
+                self.assertLessEqual(counts[0], budget)
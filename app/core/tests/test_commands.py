@@ -1,10 +1,25 @@
+import csv
+import gzip
+import json
+import os
+import tempfile
+from decimal import Decimal
+from io import StringIO
+from unittest import skipUnless
 from unittest.mock import MagicMock, patch
 
-from django.core.management import call_command
+from django.contrib.auth import get_user_model
+from django.core.management import CommandError, call_command
+from django.db import connection, models
 from django.db.utils import OperationalError
-from django.test import SimpleTestCase
+from django.test import SimpleTestCase, TestCase, TransactionTestCase
 from psycopg2 import OperationalError as Psycopg2Error
 
+from recipes.models import Recipe, Tag
+
+
+UserModel = get_user_model()
+
 
 @patch("core.management.commands.wait_for_db.Command.check")
 class CommandTest(SimpleTestCase):
@@ -29,3 +44,339 @@ class CommandTest(SimpleTestCase):
 
         self.assertEqual(patched_check.call_count, 6)
         patched_check.assert_called_with(databases=["default"])
+
+
+def create_recipe(user, tags=(), **params):
+    """Create and return a new recipe with tags."""
+
+    defaults = {"title": "Test recipe title", "time_minutes": 10, "price": Decimal("10.10")}
+    defaults.update(params)
+    recipe = Recipe.objects.create(user=user, **defaults)
+    for name in tags:
+        tag, _ = Tag.objects.get_or_create(user=user, name=name)
+        recipe.tags.add(tag)
+
+    return recipe
+
+
+class ExportRecipesCommandTest(TransactionTestCase):
+    """Test exporting recipes."""
+
+    def setUp(self):
+        self.tmp_dir = tempfile.TemporaryDirectory()
+        self.output = os.path.join(self.tmp_dir.name, "recipes.out")
+        self.user = UserModel.objects.create_user(email="test@ex.com", password="testpassword")
+        self.other_user = UserModel.objects.create_user(email="other@ex.com", password="pass123")
+        self.recipe = create_recipe(self.user, tags=["Vegan", "Dinner"], title="Curry")
+        create_recipe(self.other_user, title="Soup")
+
+    def tearDown(self):
+        self.tmp_dir.cleanup()
+
+    def test_export_ndjson(self):
+        """Test recipes are exported as one JSON object per line."""
+
+        call_command("export_recipes", self.output, stderr=StringIO())
+
+        with open(self.output) as stream:
+            rows = [json.loads(line) for line in stream]
+
+        self.assertEqual(len(rows), 2)
+        self.assertEqual(
+            rows[0],
+            {
+                "id": self.recipe.id,
+                "user": self.user.email,
+                "title": "Curry",
+                "description": "",
+                "time_minutes": 10,
+                "price": "10.10",
+                "link": "",
+                "tags": ["Dinner", "Vegan"],
+            },
+        )
+        self.assertEqual(rows[1]["user"], self.other_user.email)
+
+    def test_export_csv_gzip(self):
+        """Test recipes are exported as gzip compressed CSV."""
+
+        call_command("export_recipes", self.output, format="csv", gzip=True, stderr=StringIO())
+
+        with gzip.open(self.output, "rt", newline="") as stream:
+            rows = list(csv.DictReader(stream))
+
+        self.assertEqual([row["title"] for row in rows], ["Curry", "Soup"])
+        self.assertEqual(rows[0]["tags"], "Dinner|Vegan")
+
+    def test_export_parallel(self):
+        """Test a parallel export contains the same rows as a serial one."""
+
+        for i in range(5):
+            user = UserModel.objects.create_user(email=f"user{i}@ex.com", password="pass123")
+            create_recipe(user, tags=[f"Tag {i}"])
+        serial_output = os.path.join(self.tmp_dir.name, "serial.csv.gz")
+
+        call_command("export_recipes", serial_output, format="csv", gzip=True, stderr=StringIO())
+        call_command(
+            "export_recipes", self.output, format="csv", gzip=True, workers=3, stderr=StringIO()
+        )
+
+        with gzip.open(serial_output, "rt") as serial, gzip.open(self.output, "rt") as parallel:
+            self.assertEqual(serial.read(), parallel.read())
+        self.assertEqual(sorted(os.listdir(self.tmp_dir.name)), ["recipes.out", "serial.csv.gz"])
+
+    def test_export_parallel_to_stdout_error(self):
+        """Test a parallel export needs an output file."""
+
+        with self.assertRaises(CommandError):
+            call_command("export_recipes", "-", workers=2)
+
+
+class ImportRecipesCommandTest(TestCase):
+    """Test importing recipes."""
+
+    def setUp(self):
+        self.tmp_dir = tempfile.TemporaryDirectory()
+        self.user = UserModel.objects.create_user(email="test@ex.com", password="testpassword")
+        self.tag = Tag.objects.create(user=self.user, name="Vegan")
+
+    def tearDown(self):
+        self.tmp_dir.cleanup()
+
+    def write_ndjson(self, rows, name="recipes.ndjson"):
+        """Write rows to an NDJSON file and return its path."""
+
+        path = os.path.join(self.tmp_dir.name, name)
+        with open(path, "w") as stream:
+            for row in rows:
+                stream.write(json.dumps(row) + "\n")
+
+        return path
+
+    def recipe_row(self, title, tags=(), **params):
+        """Return an import row for a recipe of the test user."""
+
+        row = {"user": self.user.email, "title": title, "time_minutes": 5, "price": "2.50"}
+        row.update(params, tags=list(tags))
+        return row
+
+    def test_import_ndjson(self):
+        """Test recipes are imported with existing and new tags."""
+
+        path = self.write_ndjson(
+            [
+                self.recipe_row("Curry", tags=["Vegan", "Dinner"], description="Spicy"),
+                self.recipe_row("Salad", tags=["Vegan"]),
+            ]
+        )
+
+        call_command("import_recipes", path, batch_size=1, stdout=StringIO())
+
+        curry = Recipe.objects.get(title="Curry")
+        self.assertEqual(curry.user, self.user)
+        self.assertEqual(
+            dict(Tag.objects.values_list("name", "recipe_count")), {"Vegan": 2, "Dinner": 1}
+        )
+        self.assertEqual(curry.description, "Spicy")
+        self.assertEqual(curry.price, Decimal("2.50"))
+        self.assertEqual(set(curry.tags.values_list("name", flat=True)), {"Vegan", "Dinner"})
+        self.assertIn(self.tag, Recipe.objects.get(title="Salad").tags.all())
+        self.assertEqual(Tag.objects.filter(user=self.user).count(), 2)
+
+    def test_import_csv_gzip(self):
+        """Test recipes are imported from gzip compressed CSV."""
+
+        path = os.path.join(self.tmp_dir.name, "recipes.csv.gz")
+        with gzip.open(path, "wt", newline="") as stream:
+            writer = csv.DictWriter(
+                stream, fieldnames=["user", "title", "time_minutes", "price", "tags"]
+            )
+            writer.writeheader()
+            writer.writerow({**self.recipe_row("Curry"), "tags": "Vegan|Dinner"})
+
+        call_command("import_recipes", path, stdout=StringIO())
+
+        curry = Recipe.objects.get(title="Curry")
+        self.assertEqual(set(curry.tags.values_list("name", flat=True)), {"Vegan", "Dinner"})
+
+    def test_import_skips_invalid_rows(self):
+        """Test rows of unknown users or with invalid values are skipped."""
+
+        path = self.write_ndjson(
+            [
+                self.recipe_row("Curry"),
+                self.recipe_row("Unknown user", user="unknown@ex.com"),
+                self.recipe_row("Bad price", price="cheap"),
+            ]
+        )
+
+        call_command("import_recipes", path, stdout=StringIO(), stderr=StringIO())
+
+        self.assertEqual(list(Recipe.objects.values_list("title", flat=True)), ["Curry"])
+
+    def write_invalid_rows(self):
+        """Write valid rows around rows with values not fitting the columns and return the path."""
+
+        path = self.write_ndjson(
+            [
+                self.recipe_row("Curry"),
+                self.recipe_row("Long title" * 30),
+                self.recipe_row("Long link", link="https://ex.com/" + "a" * 250),
+                self.recipe_row("Too many digits", price="1000.00"),
+                self.recipe_row("Too many decimals", price="1.005"),
+                self.recipe_row("Negative time", time_minutes=-5),
+                self.recipe_row("Overflowing time", time_minutes=2**31),
+                self.recipe_row("Long tag", tags=["Tag" * 100]),
+                {**self.recipe_row("Tags not a list"), "tags": "Vegan"},
+                ["not", "an", "object"],
+            ]
+        )
+        with open(path, "a") as stream:
+            stream.write('{"user": "test@ex.com", "title": \n')
+            stream.write(json.dumps(self.recipe_row("Soup")) + "\n")
+
+        return path
+
+    def test_import_skips_values_not_fitting_columns(self):
+        """Test rows with values too long or too large, or lines not JSON, are skipped."""
+
+        path = self.write_invalid_rows()
+        stderr = StringIO()
+
+        call_command("import_recipes", path, no_copy=True, stdout=StringIO(), stderr=stderr)
+
+        titles = sorted(Recipe.objects.values_list("title", flat=True))
+        self.assertEqual(titles, ["Curry", "Soup"])
+        self.assertEqual(stderr.getvalue().count("Skipping invalid row"), 10)
+
+    @skipUnless(connection.vendor == "postgresql", "COPY requires PostgreSQL.")
+    def test_import_copy_skips_values_not_fitting_columns(self):
+        """Test invalid rows are skipped before they can fail the COPY of their batch."""
+
+        path = self.write_invalid_rows()
+
+        call_command("import_recipes", path, stdout=StringIO(), stderr=StringIO())
+
+        titles = sorted(Recipe.objects.values_list("title", flat=True))
+        self.assertEqual(titles, ["Curry", "Soup"])
+
+    def test_import_resumes_from_checkpoint(self):
+        """Test an import skips the rows stored in the checkpoint and updates it."""
+
+        path = self.write_ndjson([self.recipe_row(f"Recipe {i}") for i in range(5)])
+        checkpoint = os.path.join(self.tmp_dir.name, "checkpoint")
+        with open(checkpoint, "w") as stream:
+            stream.write("2")
+
+        call_command("import_recipes", path, batch_size=2, checkpoint=checkpoint, stdout=StringIO())
+
+        titles = sorted(Recipe.objects.values_list("title", flat=True))
+        self.assertEqual(titles, ["Recipe 2", "Recipe 3", "Recipe 4"])
+        with open(checkpoint) as stream:
+            self.assertEqual(stream.read(), "5")
+
+    def test_export_import_round_trip(self):
+        """Test an export can be imported back."""
+
+        create_recipe(self.user, tags=["Vegan", "Dinner"], title="Curry", link="https://ex.com")
+        path = os.path.join(self.tmp_dir.name, "recipes.csv")
+        call_command("export_recipes", path, format="csv", stderr=StringIO())
+        Recipe.objects.all().delete()
+
+        call_command("import_recipes", path, stdout=StringIO())
+
+        curry = Recipe.objects.get(title="Curry")
+        self.assertEqual(curry.link, "https://ex.com")
+        self.assertEqual(set(curry.tags.values_list("name", flat=True)), {"Vegan", "Dinner"})
+
+
+class GenerateDataCommandTest(TestCase):
+    """Test the synthetic data generator command."""
+
+    def generate(self, **options):
+        """Run the command with small defaults and return the generated users."""
+
+        options = {"users": 20, "recipes": 300, "tags_per_user": 8, "seed": 1, **options}
+        call_command("generate_data", stdout=StringIO(), **options)
+        prefix = options.get("email_prefix", "synthetic")
+        return UserModel.objects.filter(email__startswith=prefix).order_by("id")
+
+    def dataset(self, users):
+        """Return the recipes and tag names of users, independent of database ids."""
+
+        return [
+            [
+                (r.title, r.time_minutes, r.price, r.link, sorted(t.name for t in r.tags.all()))
+                for r in Recipe.objects.filter(user=user).prefetch_related("tags").order_by("id")
+            ]
+            for user in users
+        ]
+
+    def test_generate_data(self):
+        """Test the requested users, recipes and tags are generated with one password hash."""
+
+        users = self.generate()
+
+        self.assertEqual(users.count(), 20)
+        self.assertEqual(Recipe.objects.filter(user__in=users).count(), 300)
+        self.assertEqual(Tag.objects.filter(user__in=users).count(), 160)
+        self.assertEqual(len({user.password for user in users}), 1)
+        self.assertTrue(users[0].check_password("password123"))
+        self.assertFalse(
+            Recipe.tags.through.objects.exclude(tag__user=models.F("recipe__user")).exists()
+        )
+        self.assertFalse(
+            Tag.objects.annotate(actual=models.Count("recipe"))
+            .exclude(recipe_count=models.F("actual"))
+            .exists()
+        )
+
+    def test_recipes_per_user_heavy_tailed(self):
+        """Test a few users own many more recipes than the average."""
+
+        users = self.generate(users=100, recipes=2000)
+
+        counts = sorted((Recipe.objects.filter(user=user).count() for user in users), reverse=True)
+        self.assertGreater(counts[0], 5 * 2000 / 100)
+        self.assertGreater(sum(counts[:10]), 2000 * 0.4)
+
+    def test_same_seed_same_data(self):
+        """Test the same seed generates the same data, whatever the batch size."""
+
+        first = self.dataset(self.generate(email_prefix="first"))
+        second = self.dataset(self.generate(email_prefix="second", batch_size=7))
+        other = self.dataset(self.generate(email_prefix="other", seed=2))
+
+        self.assertEqual(first, second)
+        self.assertNotEqual(first, other)
+
+    def test_existing_prefix_rejected(self):
+        """Test generating again with the same email prefix is refused."""
+
+        self.generate()
+
+        with self.assertRaises(CommandError):
+            self.generate()
+
+
+class RepairTagCountsCommandTest(TestCase):
+    """Test repairing the recipe counts of tags."""
+
+    def test_repair_tag_counts(self):
+        """Test wrong recipe counts are recomputed in batches."""
+
+        user = UserModel.objects.create_user(email="test@ex.com", password="testpassword")
+        tags = [Tag.objects.create(user=user, name=name) for name in ("Vegan", "Dinner", "Lunch")]
+        recipe = Recipe.objects.create(user=user, title="Curry", time_minutes=5, price=2)
+        recipe.tags.add(tags[0], tags[1])
+        Tag.objects.filter(id=tags[0].id).update(recipe_count=0)
+        Tag.objects.filter(id=tags[2].id).update(recipe_count=4)
+
+        out = StringIO()
+        call_command("repair_tag_counts", batch_size=1, stdout=out)
+
+        self.assertIn("Repaired the recipe counts of 2 tags", out.getvalue())
+        self.assertEqual(
+            dict(Tag.objects.values_list("name", "recipe_count")),
+            {"Vegan": 1, "Dinner": 1, "Lunch": 0},
+        )
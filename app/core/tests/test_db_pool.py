@@ -0,0 +1,215 @@
+import threading
+import time
+from unittest import skipUnless
+
+import psycopg2
+from django.contrib.auth import get_user_model
+from django.db import connection
+from django.test import SimpleTestCase, TestCase, TransactionTestCase
+from django.urls import reverse
+from psycopg2 import extensions
+from rest_framework import status
+from rest_framework.test import APIClient
+
+from core.db.backends.postgresql.pool import ConnectionPool, PoolTimeout
+
+
+POOL_STATS_URL = reverse("db-pool-stats")
+
+
+@skipUnless(connection.vendor == "postgresql", "Connection pooling is PostgreSQL only")
+class ConnectionPoolTest(SimpleTestCase):
+    """Test the connection pool against the local PostgreSQL."""
+
+    def setUp(self):
+        self.params = {
+            key: value
+            for key, value in connection.get_connection_params().items()
+            if key != "cursor_factory"
+        }
+        self.pools = []
+
+    def tearDown(self):
+        for pool in self.pools:
+            pool.close()
+
+    def create_pool(self, **kwargs):
+        """Create a pool of connections to the database, closed after the test."""
+
+        pool = ConnectionPool(lambda: psycopg2.connect(**self.params), **kwargs)
+        self.pools.append(pool)
+        return pool
+
+    def test_reuses_returned_connection(self):
+        """Test a returned connection is handed out again."""
+
+        pool = self.create_pool()
+
+        conn = pool.getconn()
+        pool.putconn(conn)
+
+        self.assertIs(pool.getconn(), conn)
+        stats = pool.stats()
+        self.assertEqual(stats["connections_opened"], 1)
+        self.assertEqual(stats["checkouts"], 2)
+        self.assertEqual(stats["in_use"], 1)
+
+    def test_checkout_times_out_when_full(self):
+        """Test checkouts fail after the timeout when all connections are in use."""
+
+        pool = self.create_pool(max_size=1, timeout=0.05)
+        pool.getconn()
+
+        with self.assertRaises(PoolTimeout):
+            pool.getconn()
+
+        self.assertTrue(issubclass(PoolTimeout, psycopg2.OperationalError))
+        self.assertEqual(pool.stats()["checkout_failures"], 1)
+        self.assertEqual(pool.stats()["size"], 1)
+
+    def test_checkout_waits_for_returned_connection(self):
+        """Test a checkout of a full pool gets the next returned connection."""
+
+        pool = self.create_pool(max_size=1, timeout=5)
+        conn = pool.getconn()
+        threading.Timer(0.05, pool.putconn, args=[conn]).start()
+
+        self.assertIs(pool.getconn(), conn)
+        self.assertGreater(pool.stats()["wait_seconds_max"], 0)
+
+    def test_fill_opens_min_size_connections(self):
+        """Test filling the pool opens the minimum number of connections ahead of checkouts."""
+
+        pool = self.create_pool(min_size=2)
+
+        pool.fill()
+        conn = pool.getconn()
+
+        stats = pool.stats()
+        self.assertEqual(stats["connections_opened"], 2)
+        self.assertEqual((stats["size"], stats["idle"]), (2, 1))
+        self.assertFalse(conn.closed)
+
+    def test_refills_discarded_connection_below_min_size(self):
+        """Test a connection discarded below the minimum size is reopened in the background."""
+
+        pool = self.create_pool(min_size=1)
+        pool.fill()
+
+        pool.putconn(pool.getconn(), close=True)
+
+        deadline = time.monotonic() + 5
+        while pool.stats()["idle"] < 1 and time.monotonic() < deadline:
+            time.sleep(0.01)
+        stats = pool.stats()
+        self.assertEqual((stats["size"], stats["idle"]), (1, 1))
+        self.assertEqual(stats["connections_opened"], 2)
+
+    def test_health_check_replaces_dead_connection(self):
+        """Test a connection terminated by the server is replaced on checkout."""
+
+        pool = self.create_pool()
+        conn = pool.getconn()
+        pid = conn.get_backend_pid()
+        pool.putconn(conn)
+
+        with connection.cursor() as cursor:
+            cursor.execute("SELECT pg_terminate_backend(%s)", [pid])
+
+        new_conn = pool.getconn()
+
+        self.assertNotEqual(new_conn.get_backend_pid(), pid)
+        self.assertEqual(pool.stats()["health_check_failures"], 1)
+        self.assertEqual(pool.stats()["size"], 1)
+
+    def test_rolls_back_returned_connection(self):
+        """Test an open transaction is rolled back when the connection is returned."""
+
+        pool = self.create_pool()
+        conn = pool.getconn()
+        with conn.cursor() as cursor:
+            cursor.execute("SELECT 1")
+
+        pool.putconn(conn)
+
+        self.assertEqual(conn.info.transaction_status, extensions.TRANSACTION_STATUS_IDLE)
+
+    def test_recycles_idle_connections_above_min_size(self):
+        """Test connections idle for too long are closed, keeping the minimum size."""
+
+        pool = self.create_pool(min_size=1, max_idle=0.01)
+        first, second = pool.getconn(), pool.getconn()
+        pool.putconn(first)
+        pool.putconn(second)
+        time.sleep(0.02)
+
+        pool.getconn()
+
+        self.assertTrue(first.closed)
+        self.assertFalse(second.closed)
+        self.assertEqual(pool.stats()["size"], 1)
+
+    def test_closes_connections_past_max_lifetime(self):
+        """Test connections are closed when returned after their lifetime."""
+
+        pool = self.create_pool(max_lifetime=0)
+        conn = pool.getconn()
+
+        pool.putconn(conn)
+
+        self.assertTrue(conn.closed)
+        self.assertEqual(pool.stats()["size"], 0)
+
+
+@skipUnless(connection.vendor == "postgresql", "Connection pooling is PostgreSQL only")
+class PooledBackendTest(TransactionTestCase):
+    """Test the database backend checks connections out of the pool."""
+
+    def test_close_returns_connection_to_pool(self):
+        """Test closing the Django connection keeps the database connection open."""
+
+        connection.ensure_connection()
+        conn = connection.connection
+        connection.close()
+        connection.ensure_connection()
+
+        self.assertIs(connection.connection, conn)
+        self.assertFalse(conn.closed)
+
+    def test_pool_filled_to_min_size(self):
+        """Test the pool of the database holds at least its minimum size of connections."""
+
+        connection.ensure_connection()
+        pool = connection.pool
+
+        self.assertGreaterEqual(pool.stats()["size"], pool.min_size)
+
+
+class PoolStatsAPITest(TestCase):
+    """Test the connection pool metrics endpoint."""
+
+    def setUp(self):
+        self.client = APIClient()
+
+    def test_pool_stats_admin_only(self):
+        """Test the pool metrics are not exposed to regular users."""
+
+        user = get_user_model().objects.create_user(email="user@ex.com", password="pass123")
+        self.client.force_authenticate(user)
+
+        res = self.client.get(POOL_STATS_URL)
+
+        self.assertEqual(res.status_code, status.HTTP_403_FORBIDDEN)
+
+    def test_pool_stats(self):
+        """Test the pool metrics of the process are listed by database alias."""
+
+        admin = get_user_model().objects.create_superuser(email="admin@ex.com", password="pass")
+        self.client.force_authenticate(admin)
+
+        res = self.client.get(POOL_STATS_URL)
+
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        if connection.vendor == "postgresql":
+            self.assertIn("default", res.data)
+            self.assertIn("wait_seconds_avg", res.data["default"])
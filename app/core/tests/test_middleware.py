@@ -0,0 +1,112 @@
+import logging
+import re
+
+import orjson
+from django.contrib.auth import get_user_model
+from django.db import connection
+from django.test import AsyncClient, SimpleTestCase, TestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from rest_framework.authtoken.models import Token
+from rest_framework.test import APIClient
+
+from core.logging import JSONFormatter
+from recipes.cache import get_response_cache
+from users.authentication import get_token_cache
+
+
+RECIPES_URL = reverse("recipes:recipe-list")
+ASYNC_RECIPES_URL = reverse("recipes:async-recipe-list")
+SERVER_TIMING = re.compile(r'db;dur=[\d.]+;desc="(\d+) queries", total;dur=[\d.]+')
+
+
+class RequestInstrumentationMiddlewareTest(TestCase):
+    """Test the request instrumentation middleware."""
+
+    def setUp(self):
+        self.user = get_user_model().objects.create_user(email="user@ex.com", password="pass123")
+        token = Token.objects.create(user=self.user)
+        self.client = APIClient()
+        self.client.credentials(HTTP_AUTHORIZATION=f"Token {token.key}")
+        get_token_cache().clear()
+        get_response_cache().clear()
+
+    def test_server_timing_header(self):
+        """Test the Server-Timing header reports the queries of the request."""
+
+        with CaptureQueriesContext(connection) as queries:
+            res = self.client.get(RECIPES_URL)
+
+        match = SERVER_TIMING.fullmatch(res["Server-Timing"])
+        self.assertIsNotNone(match)
+        self.assertEqual(int(match[1]), len(queries))
+
+    def test_logs_request_fields(self):
+        """Test instrumented requests are logged with the view name and query count."""
+
+        with self.assertLogs("core.instrumentation", logging.INFO) as logs:
+            res = self.client.get(RECIPES_URL)
+
+        record = logs.records[0]
+        self.assertEqual(record.levelno, logging.INFO)
+        self.assertEqual(record.view, "recipes:recipe-list")
+        self.assertEqual(record.status, 200)
+        self.assertEqual(record.queries, int(SERVER_TIMING.fullmatch(res["Server-Timing"])[1]))
+        self.assertFalse(record.over_query_budget)
+
+    @override_settings(REQUEST_QUERY_BUDGET=1)
+    def test_flags_requests_over_query_budget(self):
+        """Test requests with more queries than the budget are logged as warnings."""
+
+        with self.assertLogs("core.instrumentation", logging.INFO) as logs:
+            self.client.get(RECIPES_URL)
+
+        self.assertEqual(logs.records[0].levelno, logging.WARNING)
+        self.assertTrue(logs.records[0].over_query_budget)
+
+    @override_settings(REQUEST_INSTRUMENTATION_SAMPLE_RATE=0)
+    def test_unsampled_requests_not_instrumented(self):
+        """Test requests outside the sample get no Server-Timing header."""
+
+        res = self.client.get(RECIPES_URL)
+
+        self.assertNotIn("Server-Timing", res)
+
+    def test_async_view_instrumented(self):
+        """Test queries of async views are counted."""
+
+        res = self.client.get(ASYNC_RECIPES_URL)
+
+        match = SERVER_TIMING.fullmatch(res["Server-Timing"])
+        self.assertGreater(int(match[1]), 0)
+
+    async def test_asgi_request_instrumented(self):
+        """Test queries run in sync_to_async threads of ASGI requests are counted."""
+
+        token = await Token.objects.aget(user=self.user)
+        headers = {"Authorization": f"Token {token.key}"}
+
+        res = await AsyncClient().get(RECIPES_URL, headers=headers)
+
+        match = SERVER_TIMING.fullmatch(res["Server-Timing"])
+        self.assertGreater(int(match[1]), 0)
+
+
+class JSONFormatterTest(SimpleTestCase):
+    """Test the JSON log formatter."""
+
+    def test_format_extra_fields(self):
+        """Test records are formatted as JSON with their extra fields."""
+
+        record = logging.makeLogRecord(
+            {"name": "test", "levelno": logging.INFO, "levelname": "INFO", "msg": "GET %s"}
+        )
+        record.args = ("/api/",)
+        record.queries = 3
+
+        data = orjson.loads(JSONFormatter().format(record))
+
+        self.assertEqual(data["message"], "GET /api/")
+        self.assertEqual(data["level"], "INFO")
+        self.assertEqual(data["queries"], 3)
+        self.assertNotIn("args", data)
@@ -0,0 +1,52 @@
+from io import BytesIO
+
+from django.test import SimpleTestCase
+from rest_framework.exceptions import ParseError
+
+from core.parsers import ORJSONParser
+
+
+class ORJSONParserTest(SimpleTestCase):
+    """Test the orjson parser."""
+
+    def test_parse(self):
+        """Test parsing a JSON body."""
+
+        stream = BytesIO('{"title": "Çılbır", "price": 5.5, "tags": [{"name": "a"}]}'.encode())
+
+        data = ORJSONParser().parse(stream)
+
+        self.assertEqual(data, {"title": "Çılbır", "price": 5.5, "tags": [{"name": "a"}]})
+
+    def test_parse_other_encoding(self):
+        """Test parsing a body in a declared encoding."""
+
+        stream = BytesIO('{"title": "Çılbır"}'.encode("utf-16"))
+
+        data = ORJSONParser().parse(stream, parser_context={"encoding": "utf-16"})
+
+        self.assertEqual(data, {"title": "Çılbır"})
+
+    def test_parse_invalid(self):
+        """Test invalid JSON and non-standard constants raise a parse error."""
+
+        for body in (b"{", b'{"price": NaN}'):
+            with self.assertRaises(ParseError):
+                ORJSONParser().parse(BytesIO(body))
+
+    def test_parse_big_integers(self):
+        """Test integers beyond 64 bits are kept exact like with the standard parser."""
+
+        body = f'{{"ids": [{2**64}, {-(2**63) - 1}, {10**30}], "price": 5.5}}'.encode()
+
+        data = ORJSONParser().parse(BytesIO(body))
+
+        self.assertEqual(data, {"ids": [2**64, -(2**63) - 1, 10**30], "price": 5.5})
+        self.assertIsInstance(data["ids"][2], int)
+
+    def test_parse_rejected_by_orjson(self):
+        """Test JSON that orjson rejects but the standard parser accepts still parses."""
+
+        data = ORJSONParser().parse(BytesIO(b'{"title": "\\ud800"}'))
+
+        self.assertEqual(data, {"title": "\ud800"})
@@ -0,0 +1,176 @@
+from decimal import Decimal
+
+from django.contrib.auth import get_user_model
+from django.test import SimpleTestCase, TestCase, override_settings
+from django.urls import reverse
+from rest_framework.authtoken.models import Token
+from rest_framework.test import APIClient
+
+from core.testing import QueryBudgetMixin
+from recipes.cache import get_response_cache
+from recipes.models import Recipe, Tag, recount_recipe_counts
+from users.authentication import get_token_cache
+
+
+UserModel = get_user_model()
+PASSWORD = "testpass123"
+
+
+# Fast hashing, as the users of both data sizes are created for every route
+@override_settings(
+    PASSWORD_HASHER_WORKERS=0,
+    PASSWORD_HASHERS=["django.contrib.auth.hashers.MD5PasswordHasher"],
+)
+class APIQueryBudgetTest(QueryBudgetMixin, TestCase):
+    """Test the query budgets of the API routes."""
+
+    # Each budget is the query plan of the request. Authenticated requests resolve their token
+    # first, as prepare_request empties the token cache. The test runs each request in a
+    # transaction, so the transactions of writes add a SAVEPOINT and a RELEASE. Getting or
+    # creating tags selects them, inserts the missing ones ignoring conflicts and selects those.
+    budgets = {
+        # No database access
+        ("api-schema", "GET"): 0,
+        ("api-docs", "GET"): 0,
+        # Token
+        ("db-pool-stats", "GET"): 1,
+        # Email clash check, insert
+        ("users:create", "POST"): 2,
+        # User by email, existing token
+        ("users:token", "POST"): 2,
+        # Token
+        ("users:me", "GET"): 1,
+        # Token, email clash check, update, token keys to drop from the token cache
+        ("users:me", "PUT"): 4,
+        # Token, update, token keys to drop from the token cache
+        ("users:me", "PATCH"): 3,
+        # No database access
+        ("recipes:api-root", "GET"): 0,
+        # Token
+        ("recipes:cache-stats", "GET"): 1,
+        # Token, recipe page, tags of the page
+        ("recipes:recipe-list", "GET"): 3,
+        # Token, savepoint, insert, 3 to get or create tags, link insert, count update,
+        # release, response tags
+        ("recipes:recipe-list", "POST"): 10,
+        # Token, recipe, tags
+        ("recipes:recipe-detail", "GET"): 3,
+        # Token, recipe, savepoint, row lock, current links, link delete, count update, 3 to get
+        # or create tags, link insert, count update, recipe update, release, response tags
+        ("recipes:recipe-detail", "PUT"): 15,
+        ("recipes:recipe-detail", "PATCH"): 15,
+        # Token, recipe, count update, link delete, delete
+        ("recipes:recipe-detail", "DELETE"): 5,
+        # Token, id check, savepoint, 3 to get or create tags, locked read of the updated
+        # recipes, insert, update, current links, link delete, count update, link insert, a
+        # count update per distinct count change (2 here), release, response recipes and tags
+        ("recipes:recipe-batch", "POST"): 18,
+        # Token, tag page
+        ("recipes:tag-list", "GET"): 2,
+        # Token, tag, name clash check, update
+        ("recipes:tag-detail", "PUT"): 4,
+        ("recipes:tag-detail", "PATCH"): 4,
+        # Token, tag, link delete, delete
+        ("recipes:tag-detail", "DELETE"): 4,
+        # Token, recipe page, tags of the page
+        ("recipes:async-recipe-list", "GET"): 3,
+        # Token, the 8 queries of the sync create before its response, recipe and tags
+        ("recipes:async-recipe-list", "POST"): 11,
+        # Token, recipe, tags
+        ("recipes:async-recipe-detail", "GET"): 3,
+        # Token, tag page
+        ("recipes:async-tag-list", "GET"): 2,
+    }
+
+    def setUp(self):
+        self.client = APIClient()
+
+    def seed(self, size):
+        """Create a staff user and another user with ``size`` recipes and tags each.
+
+        Recipe ``i`` has the first ``i + 1`` tags, so the number of tags per recipe grows
+        with the size and the context recipe has them all.
+        """
+
+        context = {}
+        for i in range(2):
+            user = UserModel.objects.create_user(
+                email=f"user{i}@ex.com", password=PASSWORD, is_staff=i == 0
+            )
+            tags = Tag.objects.bulk_create([Tag(user=user, name=f"Tag {i}") for i in range(size)])
+            recipes = Recipe.objects.bulk_create(
+                [
+                    Recipe(user=user, title=f"Recipe {i}", time_minutes=i, price=Decimal("5.50"))
+                    for i in range(size)
+                ]
+            )
+            Recipe.tags.through.objects.bulk_create(
+                [
+                    Recipe.tags.through(recipe_id=recipe.id, tag_id=tag.id)
+                    for i, recipe in enumerate(recipes)
+                    for tag in tags[: i + 1]
+                ]
+            )
+            recount_recipe_counts(Tag.objects.filter(user=user))
+            context = context or {"user": user, "recipe": recipes[-1], "tag": tags[0]}
+
+        return context
+
+    def get_request(self, route, method, context):
+        """Return the URL and payload of a request to the route."""
+
+        recipe = {"title": "Curry", "time_minutes": 30, "price": "5.50"}
+        tags = [{"name": "Tag 0"}, {"name": "New tag"}]
+        requests = {
+            ("users:create", "POST"): {
+                "email": "new@ex.com",
+                "password": PASSWORD,
+                "name": "New user",
+            },
+            ("users:token", "POST"): {"email": context["user"].email, "password": PASSWORD},
+            ("users:me", "PUT"): {
+                "email": context["user"].email,
+                "password": "newpass123",
+                "name": "New name",
+            },
+            ("users:me", "PATCH"): {"name": "New name"},
+            ("recipes:recipe-list", "POST"): {**recipe, "tags": tags},
+            ("recipes:recipe-detail", "PUT"): {**recipe, "tags": tags},
+            ("recipes:recipe-detail", "PATCH"): {"title": "New title", "tags": tags},
+            ("recipes:recipe-batch", "POST"): [
+                {**recipe, "tags": tags},
+                {**recipe, "id": context["recipe"].id, "tags": tags},
+            ],
+            ("recipes:tag-detail", "PUT"): {"name": "Renamed"},
+            ("recipes:tag-detail", "PATCH"): {"name": "Renamed"},
+            ("recipes:async-recipe-list", "POST"): {**recipe, "tags": tags},
+        }
+
+        args = []
+        if route.endswith("recipe-detail"):
+            args = [context["recipe"].id]
+        elif route.endswith("tag-detail"):
+            args = [context["tag"].id]
+
+        return reverse(route, args=args), requests.get((route, method))
+
+    def prepare_request(self, context):
+        """Authenticate with a token and start from empty caches."""
+
+        token = Token.objects.create(user=context["user"])
+        self.client.credentials(HTTP_AUTHORIZATION=f"Token {token.key}")
+        get_token_cache().clear()
+        get_response_cache().clear()
+
+
+class QueryBudgetMixinTest(SimpleTestCase):
+    """Test the query budget mixin."""
+
+    def test_hooks_required(self):
+        """Test a test case missing the budgets or hooks fails to set up."""
+
+        class IncompleteTest(QueryBudgetMixin, TestCase):
+            budgets = {}
+
+        with self.assertRaisesMessage(TypeError, "IncompleteTest must define seed, get_request."):
+            IncompleteTest.setUpClass()
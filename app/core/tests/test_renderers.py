@@ -0,0 +1,90 @@
+import datetime
+import uuid
+from decimal import Decimal
+
+from django.test import SimpleTestCase
+from django.utils.translation import gettext_lazy as _
+from rest_framework.renderers import JSONRenderer
+
+from core.renderers import ORJSONRenderer
+
+
+class ORJSONRendererTest(SimpleTestCase):
+    """Test the orjson renderer matches the standard JSON renderer."""
+
+    def assertRendersSame(self, data, accepted_media_type=None, renderer_context=None):
+        """Assert both renderers produce the same bytes."""
+
+        expected = JSONRenderer().render(data, accepted_media_type, renderer_context)
+        rendered = ORJSONRenderer().render(data, accepted_media_type, renderer_context)
+
+        self.assertEqual(rendered, expected)
+
+    def test_render_recipes(self):
+        """Test rendering nested recipes with unicode text."""
+
+        data = {
+            "next": None,
+            "results": [
+                {
+                    "id": 1,
+                    "title": "Çılbır ☕",
+                    "price": "10.10",
+                    "tags": [{"id": 1, "name": "Breakfast"}],
+                }
+            ],
+        }
+
+        self.assertRendersSame(data)
+
+    def test_render_decimal_and_dates(self):
+        """Test Decimal, date and time values are encoded like DRF does."""
+
+        tz = datetime.timezone(datetime.timedelta(hours=2))
+        data = {
+            "price": Decimal("5.50"),
+            "utc": datetime.datetime(2023, 8, 10, 9, 14, 1, 123456, tzinfo=datetime.timezone.utc),
+            "local": datetime.datetime(2023, 8, 10, 9, 14, 1, 123456, tzinfo=tz),
+            "naive": datetime.datetime(2023, 8, 10, 9, 14),
+            "date": datetime.date(2023, 8, 10),
+            "time": datetime.time(9, 14, 1, 500),
+            "duration": datetime.timedelta(minutes=5),
+            "uuid": uuid.UUID("12345678-1234-5678-1234-567812345678"),
+            "lazy": _("Recipe does not exist."),
+            1: "non string key",
+        }
+
+        self.assertRendersSame(data)
+
+    def test_render_line_separators(self):
+        """Test line and paragraph separators are escaped."""
+
+        self.assertRendersSame({"title": "a\u2028b\u2029c"})
+
+    def test_render_indented(self):
+        """Test indented output falls back to the standard renderer."""
+
+        self.assertRendersSame({"id": 1}, accepted_media_type="application/json; indent=4")
+
+    def test_render_big_integer(self):
+        """Test integers out of the 64 bit range fall back to the standard renderer."""
+
+        self.assertRendersSame({"id": 2**70})
+
+    def test_render_floats(self):
+        """Test floats, with and without exponents, are formatted like DRF does."""
+
+        self.assertRendersSame({"values": [0.1 + 0.2, 1e16, 1e-7, -0.0, 1.5], "title": "2eggs"})
+
+    def test_render_out_of_range_floats(self):
+        """Test NaN and infinite floats raise like with the standard renderer."""
+
+        for value in (float("nan"), float("inf"), float("-inf")):
+            for data in ({"next": None, "values": [1, None, value]}, [None, value], {value: 1}):
+                with self.assertRaises(ValueError):
+                    ORJSONRenderer().render(data)
+
+    def test_render_none(self):
+        """Test rendering no data returns an empty body."""
+
+        self.assertEqual(ORJSONRenderer().render(None), b"")
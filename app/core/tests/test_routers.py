@@ -0,0 +1,272 @@
+from contextlib import ExitStack
+from decimal import Decimal
+from unittest import skipUnless
+
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.db import connections
+from django.test import SimpleTestCase, TestCase, TransactionTestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from rest_framework import status
+from rest_framework.authtoken.models import Token
+from rest_framework.test import APIClient
+
+from core.checks import check_stickiness_cache
+from core.db.routers import (
+    PrimaryReplicaRouter,
+    RoutingState,
+    _routing,
+    get_stickiness_cache,
+    is_pinned_to_primary,
+)
+from recipes.models import Recipe
+from users.authentication import get_token_cache
+
+
+RECIPES_URL = reverse("recipes:recipe-list")
+ASYNC_RECIPES_URL = reverse("recipes:async-recipe-list")
+ME_URL = reverse("users:me")
+
+
+class RecordingRouter(PrimaryReplicaRouter):
+    """Router recording its read decisions while reading everything from the primary."""
+
+    reads = []
+
+    def db_for_read(self, model, **hints):
+        self.reads.append((model, super().db_for_read(model, **hints)))
+        return None
+
+
+@override_settings(DATABASE_REPLICAS=["replica"])
+class PrimaryReplicaRouterTest(SimpleTestCase):
+    """Test the primary replica router."""
+
+    def setUp(self):
+        self.router = PrimaryReplicaRouter()
+
+    def test_reads_outside_requests_use_primary(self):
+        """Test reads without a routing state go to the primary."""
+
+        self.assertIsNone(self.router.db_for_read(Recipe))
+
+    def test_reads_after_write_use_primary(self):
+        """Test reads of a request go to the primary once it wrote."""
+
+        token = _routing.set(RoutingState("replica"))
+        try:
+            self.assertEqual(self.router.db_for_read(Recipe), "replica")
+            self.assertEqual(self.router.db_for_write(Recipe), "default")
+            self.assertIsNone(self.router.db_for_read(Recipe))
+        finally:
+            _routing.reset(token)
+
+    def test_no_migrations_on_replicas(self):
+        """Test migrations only run on the primary."""
+
+        self.assertFalse(self.router.allow_migrate("replica", "recipes"))
+        self.assertIsNone(self.router.allow_migrate("default", "recipes"))
+
+
+class StickinessCacheCheckTest(SimpleTestCase):
+    """Test the check of the stickiness cache."""
+
+    @override_settings(
+        DATABASE_REPLICAS=["replica"],
+        DATABASE_STICKINESS_CACHE="sticky",
+        CACHES={"sticky": {"BACKEND": "django.core.cache.backends.locmem.LocMemCache"}},
+    )
+    def test_process_local_cache_with_replicas(self):
+        """Test a cache local to the worker is rejected when reading from replicas."""
+
+        errors = check_stickiness_cache(None)
+
+        self.assertEqual([error.id for error in errors], ["core.E001"])
+
+    @override_settings(
+        DATABASE_REPLICAS=["replica"],
+        DATABASE_STICKINESS_CACHE="sticky",
+        CACHES={
+            "sticky": {
+                "BACKEND": "django.core.cache.backends.filebased.FileBasedCache",
+                "LOCATION": "/tmp/sticky",
+            }
+        },
+    )
+    def test_shared_cache_with_replicas(self):
+        """Test a cache shared by the workers is accepted."""
+
+        self.assertEqual(check_stickiness_cache(None), [])
+
+    @override_settings(DATABASE_REPLICAS=[], DATABASE_STICKINESS_CACHE="default")
+    def test_process_local_cache_without_replicas(self):
+        """Test any cache is accepted when not reading from replicas."""
+
+        self.assertEqual(check_stickiness_cache(None), [])
+
+
+@override_settings(
+    DATABASE_REPLICAS=["replica"],
+    DATABASE_ROUTERS=["core.tests.test_routers.RecordingRouter"],
+    API_RESPONSE_CACHE_TIMEOUT=0,
+)
+class ReplicaReadMixinTest(TestCase):
+    """Test the routing of API requests to replicas."""
+
+    def setUp(self):
+        self.user = get_user_model().objects.create_user(email="user@ex.com", password="pass123")
+        self.client = self.get_client(self.user)
+        get_stickiness_cache().clear()
+        RecordingRouter.reads.clear()
+
+    def get_client(self, user):
+        """Return a client authenticated with a token of the user."""
+
+        token = Token.objects.create(user=user)
+        client = APIClient()
+        client.credentials(HTTP_AUTHORIZATION=f"Token {token.key}")
+        get_token_cache().clear()
+        return client
+
+    def create_recipe(self):
+        """Create a recipe through the API."""
+
+        payload = {"title": "Curry", "time_minutes": 30, "price": Decimal("5.50"), "tags": []}
+        res = self.client.post(RECIPES_URL, payload, format="json")
+        self.assertEqual(res.status_code, status.HTTP_201_CREATED)
+
+    def recipe_reads(self):
+        """Return the databases of the recipe reads since the last call."""
+
+        reads = [database for model, database in RecordingRouter.reads if model is Recipe]
+        RecordingRouter.reads.clear()
+        return reads
+
+    def test_reads_use_replica(self):
+        """Test list and detail reads go to the replica."""
+
+        Recipe.objects.create(user=self.user, title="Curry", time_minutes=30, price=5)
+        recipe = Recipe.objects.get()
+        self.recipe_reads()
+
+        self.client.get(RECIPES_URL)
+        self.client.get(reverse("recipes:recipe-detail", args=[recipe.id]))
+
+        reads = self.recipe_reads()
+        self.assertTrue(reads)
+        self.assertEqual(set(reads), {"replica"})
+
+    def test_write_pins_user_to_primary(self):
+        """Test reads go to the primary after the user wrote."""
+
+        self.create_recipe()
+        self.assertTrue(is_pinned_to_primary(self.user.id))
+        self.recipe_reads()
+
+        self.client.get(RECIPES_URL)
+
+        self.assertEqual(set(self.recipe_reads()), {None})
+
+    @override_settings(DATABASE_PRIMARY_STICKINESS=0)
+    def test_pin_expires(self):
+        """Test reads go back to the replica after the stickiness window."""
+
+        self.create_recipe()
+        self.recipe_reads()
+
+        self.client.get(RECIPES_URL)
+
+        self.assertEqual(set(self.recipe_reads()), {"replica"})
+
+    def test_pin_is_per_user(self):
+        """Test the writes of a user do not pin other users."""
+
+        self.create_recipe()
+        other = get_user_model().objects.create_user(email="other@ex.com", password="pass123")
+        client = self.get_client(other)
+        self.recipe_reads()
+
+        client.get(RECIPES_URL)
+
+        self.assertEqual(set(self.recipe_reads()), {"replica"})
+
+    def test_routing_state_reset(self):
+        """Test the routing state does not outlive the request, even when it fails."""
+
+        self.client.get(RECIPES_URL)
+        self.client.get(reverse("recipes:recipe-detail", args=[0]))
+
+        self.assertIsNone(_routing.get())
+
+    def test_invalid_write_does_not_pin(self):
+        """Test a rejected write leaves the reads on the replica."""
+
+        res = self.client.post(RECIPES_URL, {"title": ""}, format="json")
+
+        self.assertEqual(res.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertFalse(is_pinned_to_primary(self.user.id))
+
+    def test_user_update_pins_user(self):
+        """Test updating the profile pins the user to the primary."""
+
+        res = self.client.patch(ME_URL, {"name": "New name"}, format="json")
+
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        self.assertTrue(is_pinned_to_primary(self.user.id))
+
+    def test_async_create_pins_user(self):
+        """Test creating a recipe through the async view pins the user to the primary."""
+
+        payload = {"title": "Curry", "time_minutes": 30, "price": "5.50", "tags": []}
+        res = self.client.post(ASYNC_RECIPES_URL, payload, format="json")
+
+        self.assertEqual(res.status_code, status.HTTP_201_CREATED)
+        self.assertTrue(is_pinned_to_primary(self.user.id))
+
+
+@skipUnless(settings.DATABASE_REPLICAS, "Requires a replica database, see DB_REPLICA_HOSTS.")
+@override_settings(API_RESPONSE_CACHE_TIMEOUT=0)
+class MirrorReplicaTest(TransactionTestCase):
+    """Test reading from a replica configured as a test mirror of the primary."""
+
+    databases = {"default", *settings.DATABASE_REPLICAS}
+
+    def setUp(self):
+        get_stickiness_cache().clear()
+        user = get_user_model().objects.create_user(email="user@ex.com", password="pass123")
+        Recipe.objects.create(user=user, title="Curry", time_minutes=30, price=5)
+        token = Token.objects.create(user=user)
+        self.client = APIClient()
+        self.client.credentials(HTTP_AUTHORIZATION=f"Token {token.key}")
+        get_token_cache().clear()
+
+    def replica_queries(self, method, *args, **kwargs):
+        """Return the response of a request and the recipe queries it ran on replicas."""
+
+        with ExitStack() as stack:
+            replicas = [
+                stack.enter_context(CaptureQueriesContext(connections[alias]))
+                for alias in settings.DATABASE_REPLICAS
+            ]
+            res = getattr(self.client, method)(RECIPES_URL, *args, format="json", **kwargs)
+
+        queries = [query["sql"] for replica in replicas for query in replica.captured_queries]
+        return res, [sql for sql in queries if "recipes_recipe" in sql]
+
+    def test_reads_from_replica_until_write(self):
+        """Test reads hit the replica, and the primary after the user wrote."""
+
+        res, queries = self.replica_queries("get")
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        self.assertEqual(res.data["results"][0]["title"], "Curry")
+        self.assertTrue(queries)
+
+        payload = {"title": "Soup", "time_minutes": 10, "price": "2.00", "tags": []}
+        res, queries = self.replica_queries("post", payload)
+        self.assertEqual(res.status_code, status.HTTP_201_CREATED)
+        self.assertEqual(queries, [])
+
+        res, queries = self.replica_queries("get")
+        self.assertEqual(len(res.data["results"]), 2)
+        self.assertEqual(queries, [])
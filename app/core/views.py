@@ -0,0 +1,25 @@
+from drf_spectacular.types import OpenApiTypes
+from drf_spectacular.utils import OpenApiResponse, extend_schema
+from rest_framework.permissions import IsAdminUser
+from rest_framework.response import Response
+from rest_framework.views import APIView
+
+from core.db.backends.postgresql.base import get_pool_stats
+from users.authentication import CachedTokenAuthentication
+
+
+class DatabasePoolStatsAPIView(APIView):
+    """Show the database connection pool metrics of the serving process."""
+
+    authentication_classes = [CachedTokenAuthentication]
+    permission_classes = [IsAdminUser]
+
+    @extend_schema(
+        responses=OpenApiResponse(
+            OpenApiTypes.OBJECT, description="Pool size and checkout counters by database alias."
+        )
+    )
+    def get(self, request):
+        """Return the pool metrics by database alias."""
+
+        return Response(get_pool_stats())
@@ -0,0 +1,151 @@
+from django.http import HttpResponse
+from django.views import View
+from django.views.decorators.csrf import csrf_exempt
+from rest_framework import exceptions, status
+from rest_framework.request import Request
+
+from core.db.routers import apin_to_primary
+from core.parsers import ORJSONParser
+from core.renderers import ORJSONRenderer
+from recipes.filters import filter_by_tags, parse_tag_ids
+from recipes.models import Recipe, Tag
+from recipes.pagination import AsyncRecipeCursorPagination, AsyncTagCursorPagination
+from recipes.serializers import RecipeDetailSerializer, RecipeSerializer, arepresent_recipe_rows
+from users.authentication import CachedTokenAuthentication
+
+
+class AsyncAPIView(View):
+    """Base view authenticating with tokens and rendering JSON without blocking the loop.
+
+    Handlers are coroutines returning data, and raise API exceptions for error responses
+    like DRF views do.
+    """
+
+    http_method_names = ["get", "post"]
+    authentication = CachedTokenAuthentication()
+    parser = ORJSONParser()
+    renderer = ORJSONRenderer()
+
+    @classmethod
+    def as_view(cls, **initkwargs):
+        """Return the view exempt from CSRF checks, as token authentication needs none."""
+
+        return csrf_exempt(super().as_view(**initkwargs))
+
+    async def dispatch(self, request, *args, **kwargs):
+        """Authenticate the request and render the result of the handler."""
+
+        try:
+            credentials = await self.authentication.aauthenticate(request)
+            if credentials is None:
+                raise exceptions.NotAuthenticated()
+            request.user, request.auth = credentials
+
+            method = request.method.lower()
+            handler = getattr(self, method, None) if method in self.http_method_names else None
+            if handler is None:
+                raise exceptions.MethodNotAllowed(request.method)
+
+            data, status_code = await handler(request, *args, **kwargs)
+        except exceptions.APIException as exc:
+            return self.render_exception(exc)
+
+        return self.render(data, status_code)
+
+    def render(self, data, status_code=status.HTTP_200_OK):
+        """Return a JSON response of data."""
+
+        return HttpResponse(
+            self.renderer.render(data), status=status_code, content_type="application/json"
+        )
+
+    def render_exception(self, exc):
+        """Return the JSON response of an API exception, like the DRF exception handler."""
+
+        if isinstance(exc.detail, (list, dict)):
+            data = exc.detail
+        else:
+            data = {"detail": exc.detail}
+
+        response = self.render(data, exc.status_code)
+        if exc.status_code == status.HTTP_401_UNAUTHORIZED:
+            response["WWW-Authenticate"] = self.authentication.authenticate_header(request=None)
+        return response
+
+    def parse(self, request):
+        """Return the parsed JSON body of the request."""
+
+        if request.content_type != "application/json":
+            raise exceptions.UnsupportedMediaType(request.content_type)
+
+        parser_context = {"encoding": request.encoding} if request.encoding else None
+        return self.parser.parse(request, parser_context=parser_context)
+
+
+async def arecipe_data(serializer, queryset):
+    """Return the representation of recipes of a queryset read as value rows."""
+
+    columns = [name for name in serializer.fields if name != "tags"]
+    rows = [row async for row in queryset.values(*columns)]
+    return await arepresent_recipe_rows(serializer, rows)
+
+
+class AsyncRecipeListView(AsyncAPIView):
+    """List and create recipes of the authenticated user."""
+
+    async def get(self, request):
+        """List recipes, filtered by ``?tags=`` and ``?tags_mode=`` like the sync list."""
+
+        queryset = Recipe.objects.filter(user=request.user)
+
+        tag_ids = parse_tag_ids(request.GET.get("tags", ""))
+        if tag_ids:
+            queryset = filter_by_tags(queryset, tag_ids, request.GET.get("tags_mode", "any"))
+
+        serializer = RecipeSerializer()
+        columns = [name for name in serializer.fields if name != "tags"]
+
+        paginator = AsyncRecipeCursorPagination()
+        rows = await paginator.apaginate_queryset(queryset.values(*columns), Request(request))
+        data = await arepresent_recipe_rows(serializer, rows)
+
+        return paginator.get_paginated_data(data), status.HTTP_200_OK
+
+    async def post(self, request):
+        """Create a recipe, in a thread like the sync create, and read it back asynchronously."""
+
+        serializer = RecipeDetailSerializer(data=self.parse(request), context={"request": request})
+        serializer.is_valid(raise_exception=True)
+        recipe = await serializer.acreate({**serializer.validated_data, "user": request.user})
+        await apin_to_primary(request.user.id)
+
+        data = await arecipe_data(RecipeDetailSerializer(), Recipe.objects.filter(id=recipe.id))
+        return data[0], status.HTTP_201_CREATED
+
+
+class AsyncRecipeDetailView(AsyncAPIView):
+    """Retrieve a recipe of the authenticated user."""
+
+    async def get(self, request, pk):
+        """Retrieve a recipe."""
+
+        queryset = Recipe.objects.filter(user=request.user, id=pk)
+        data = await arecipe_data(RecipeDetailSerializer(), queryset)
+        if not data:
+            raise exceptions.NotFound()
+
+        return data[0], status.HTTP_200_OK
+
+
+class AsyncTagListView(AsyncAPIView):
+    """List tags of the authenticated user."""
+
+    async def get(self, request):
+        """List tags."""
+
+        queryset = Tag.objects.filter(user=request.user).values("id", "name")
+
+        paginator = AsyncTagCursorPagination()
+        rows = await paginator.apaginate_queryset(queryset, Request(request))
+
+        return paginator.get_paginated_data(rows), status.HTTP_200_OK
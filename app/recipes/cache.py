@@ -0,0 +1,115 @@
+import hashlib
+import time
+
+from django.conf import settings
+from django.core.cache import caches
+from django.db import transaction
+from rest_framework import status
+from rest_framework.response import Response
+
+
+HITS_KEY = "recipes:response-cache:hits"
+MISSES_KEY = "recipes:response-cache:misses"
+
+
+def get_response_cache():
+    """Return the cache used for recipe and tag responses."""
+
+    return caches[settings.API_RESPONSE_CACHE]
+
+
+def get_version_cache():
+    """Return the cache shared by all workers holding the data versions and counters."""
+
+    return caches[settings.API_RESPONSE_VERSION_CACHE]
+
+
+def _version_key(user_id):
+    return f"recipes:data-version:{user_id}"
+
+
+def _increment(key):
+    cache = get_version_cache()
+    try:
+        return cache.incr(key)
+    except ValueError:
+        cache.add(key, 1, timeout=None)
+        return 1
+
+
+def get_data_version(user_id):
+    """Return the current version of the recipes and tags of a user."""
+
+    cache = get_version_cache()
+    key = _version_key(user_id)
+    # Start from a unique value so an evicted version never revives old responses
+    cache.add(key, time.time_ns(), timeout=None)
+    return cache.get(key)
+
+
+def bump_data_version(user_id):
+    """Invalidate the cached responses of a user once the current transaction commits."""
+
+    def bump():
+        try:
+            get_version_cache().incr(_version_key(user_id))
+        except ValueError:
+            get_data_version(user_id)
+
+    transaction.on_commit(bump)
+
+
+def get_cache_stats():
+    """Return the hit and miss counters of the response cache."""
+
+    cache = get_version_cache()
+    hits = cache.get(HITS_KEY, 0)
+    misses = cache.get(MISSES_KEY, 0)
+    total = hits + misses
+
+    return {
+        "hits": hits,
+        "misses": misses,
+        "hit_rate": hits / total if total else None,
+    }
+
+
+class VersionedCacheMixin:
+    """Cache responses of read actions per user and data version.
+
+    Read actions opt in by returning ``self.cached_response(super().<action>, ...)``.
+    Writes through the view bump the version of the user, so the next read misses.
+    """
+
+    def get_cache_key(self, request):
+        """Return the cache key of a response for the current request."""
+
+        version = get_data_version(request.user.id)
+        url = hashlib.sha256(request.build_absolute_uri().encode()).hexdigest()
+        return f"recipes:response:{request.user.id}:{version}:{self.basename}:{self.action}:{url}"
+
+    def cached_response(self, handler, request, *args, **kwargs):
+        """Return the cached response of a read action or cache a fresh one."""
+
+        cache = get_response_cache()
+        key = self.get_cache_key(request)
+
+        data = cache.get(key)
+        if data is not None:
+            _increment(HITS_KEY)
+            return Response(data, headers={"X-Cache": "HIT"})
+
+        _increment(MISSES_KEY)
+        response = handler(request, *args, **kwargs)
+        if response.status_code == status.HTTP_200_OK:
+            cache.set(key, response.data, timeout=settings.API_RESPONSE_CACHE_TIMEOUT)
+        response["X-Cache"] = "MISS"
+        return response
+
+    def perform_update(self, serializer):
+        super().perform_update(serializer)
+        bump_data_version(self.request.user.id)
+
+    def perform_destroy(self, instance):
+        super().perform_destroy(instance)
+        bump_data_version(self.request.user.id)
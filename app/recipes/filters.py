@@ -0,0 +1,51 @@
+from django.db.models import Count
+from django.utils.translation import gettext_lazy as _
+from rest_framework.exceptions import ValidationError
+
+from recipes.models import Recipe
+
+
+RecipeTag = Recipe.tags.through
+TAG_FILTER_MODES = ("any", "all")
+
+
+def parse_tag_ids(value):
+    """Return the tag ids of a comma separated query parameter."""
+
+    try:
+        return sorted({int(tag_id) for tag_id in value.split(",") if tag_id.strip()})
+    except ValueError:
+        raise ValidationError({"tags": [_("Tags must be a comma separated list of ids.")]})
+
+
+def filter_by_tags(queryset, tag_ids, mode="any"):
+    """Filter recipes having any or all of the tags with a subquery on the through table."""
+
+    if mode not in TAG_FILTER_MODES:
+        raise ValidationError({"tags_mode": [_("Mode must be one of: any, all.")]})
+
+    recipe_tags = RecipeTag.objects.filter(tag_id__in=tag_ids)
+    if mode == "all":
+        recipe_tags = (
+            recipe_tags.values("recipe_id")
+            .annotate(tag_count=Count("tag_id"))
+            .filter(tag_count=len(tag_ids))
+        )
+
+    return queryset.filter(id__in=recipe_tags.values("recipe_id"))
+
+
+def tag_facets(queryset):
+    """Return how many of the recipes carry each tag, in a single aggregate query."""
+
+    facets = (
+        RecipeTag.objects.filter(recipe_id__in=queryset.values("id"))
+        .values("tag_id", "tag__name")
+        .annotate(count=Count("recipe_id"))
+        .order_by("-count", "tag__name")
+    )
+
+    return [
+        {"id": facet["tag_id"], "name": facet["tag__name"], "count": facet["count"]}
+        for facet in facets
+    ]
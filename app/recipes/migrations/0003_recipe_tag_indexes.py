@@ -0,0 +1,50 @@
+# Generated by Django 4.2.3 on 2026-10-18 05:00
+
+from django.db import migrations, models
+
+
+def merge_duplicate_tags(apps, schema_editor):
+    """Merge tags sharing the same (user, name) so the unique constraint can be added."""
+
+    Tag = apps.get_model("recipes", "Tag")
+    RecipeTag = apps.get_model("recipes", "Recipe").tags.through
+
+    duplicates = (
+        Tag.objects.values("user_id", "name")
+        .annotate(count=models.Count("id"), keep_id=models.Min("id"))
+        .filter(count__gt=1)
+    )
+    for duplicate in duplicates:
+        stale_ids = list(
+            Tag.objects.filter(user_id=duplicate["user_id"], name=duplicate["name"])
+            .exclude(id=duplicate["keep_id"])
+            .values_list("id", flat=True)
+        )
+        recipe_ids = RecipeTag.objects.filter(tag_id__in=stale_ids).values_list(
+            "recipe_id", flat=True
+        )
+        RecipeTag.objects.bulk_create(
+            [RecipeTag(recipe_id=recipe_id, tag_id=duplicate["keep_id"]) for recipe_id in recipe_ids],
+            ignore_conflicts=True,
+        )
+        Tag.objects.filter(id__in=stale_ids).delete()
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("recipes", "0002_tag_recipe_tags"),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name="recipe",
+            index=models.Index(fields=["user", "-id"], name="recipe_user_id_idx"),
+        ),
+        migrations.RunPython(merge_duplicate_tags, migrations.RunPython.noop),
+        migrations.AddConstraint(
+            model_name="tag",
+            constraint=models.UniqueConstraint(
+                fields=("user", "name"), name="unique_tag_user_name"
+            ),
+        ),
+    ]
@@ -0,0 +1,18 @@
+# Generated by Django 4.2.3 on 2026-10-18 08:00
+
+from django.db import migrations
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("recipes", "0004_recipe_search_vector"),
+    ]
+
+    operations = [
+        # The auto-created through table takes no Meta options. Its unique (recipe_id, tag_id)
+        # index serves lookups by recipe, this one serves tag filters and facet counts.
+        migrations.RunSQL(
+            "CREATE INDEX recipe_tags_tag_recipe_idx ON recipes_recipe_tags (tag_id, recipe_id);",
+            "DROP INDEX recipe_tags_tag_recipe_idx;",
+        ),
+    ]
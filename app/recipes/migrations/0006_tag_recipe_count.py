@@ -0,0 +1,37 @@
+# Generated by Django 4.2.3 on 2026-10-18 09:00
+
+from django.db import migrations, models
+from django.db.models import Count, OuterRef, Subquery, Value
+from django.db.models.functions import Coalesce
+
+
+def count_tag_recipes(apps, schema_editor):
+    """Set the recipe counts of the existing tags."""
+
+    Recipe = apps.get_model("recipes", "Recipe")
+    Tag = apps.get_model("recipes", "Tag")
+
+    links = Recipe.tags.through.objects.filter(tag_id=OuterRef("id"))
+    counts = links.order_by().values("tag_id").annotate(count=Count("*")).values("count")
+    Tag.objects.update(recipe_count=Coalesce(Subquery(counts), Value(0)))
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("recipes", "0005_recipe_tags_tag_recipe_idx"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="tag",
+            name="recipe_count",
+            field=models.IntegerField(default=0, editable=False),
+        ),
+        migrations.RunPython(count_tag_recipes, migrations.RunPython.noop),
+        migrations.AddIndex(
+            model_name="tag",
+            index=models.Index(
+                fields=["user", "-recipe_count", "-id"], name="tag_user_recipe_count_idx"
+            ),
+        ),
+    ]
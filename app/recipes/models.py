@@ -1,5 +1,26 @@
+from collections import Counter, defaultdict
+
 from django.conf import settings
-from django.db import models
+from django.contrib.postgres.indexes import GinIndex
+from django.contrib.postgres.search import SearchVectorField
+from django.db import connections, models, router, transaction
+from django.db.models import Count, F, OuterRef, Subquery, Value
+from django.db.models.functions import Coalesce
+
+
+# Text search configuration of the search vector kept up to date by a database trigger
+SEARCH_CONFIG = "english"
+
+
+class RecipeQuerySet(models.QuerySet):
+    """Queryset of recipes keeping the recipe counts of tags up to date on deletion."""
+
+    def delete(self):
+        """Delete the recipes, decrementing the recipe counts of their tags."""
+
+        with transaction.atomic(savepoint=False):
+            remove_recipe_counts(Recipe.tags.through.objects.filter(recipe__in=self.values("id")))
+            return super().delete()
 
 
 class Recipe(models.Model):
@@ -12,20 +33,151 @@ class Recipe(models.Model):
     price = models.DecimalField(max_digits=5, decimal_places=2)
     link = models.CharField(max_length=255, blank=True)
     tags = models.ManyToManyField("Tag")
+    search_vector = SearchVectorField(null=True, editable=False)
+
+    objects = RecipeQuerySet.as_manager()
+
+    class Meta:
+        indexes = [
+            models.Index(fields=["user", "-id"], name="recipe_user_id_idx"),
+            GinIndex(fields=["search_vector"], name="recipe_search_vector_idx"),
+        ]
 
     def __str__(self):
         """Return readable representation of the model."""
 
         return self.title
 
+    def delete(self, *args, **kwargs):
+        """Delete the recipe, decrementing the recipe counts of its tags."""
+
+        with transaction.atomic(savepoint=False):
+            links = Recipe.tags.through.objects.filter(recipe_id=self.pk)
+            remove_recipe_counts(links, distinct_tags=True)
+            return super().delete(*args, **kwargs)
+
 
 class Tag(models.Model):
     """Model to represent a tag for filtering recipes."""
 
     name = models.CharField(max_length=255)
     user = models.ForeignKey(settings.AUTH_USER_MODEL, on_delete=models.CASCADE)
+    # Number of recipes with the tag, kept up to date by every code path changing recipe tags
+    recipe_count = models.IntegerField(default=0, editable=False)
+
+    class Meta:
+        indexes = [
+            models.Index(fields=["user", "-recipe_count", "-id"], name="tag_user_recipe_count_idx"),
+        ]
+        constraints = [
+            models.UniqueConstraint(fields=["user", "name"], name="unique_tag_user_name"),
+        ]
 
     def __str__(self):
         """Return readable representation of the model."""
 
         return self.name
+
+
+def _group_by_count(tag_ids):
+    tag_ids_by_count = defaultdict(list)
+    for tag_id, count in Counter(tag_ids).items():
+        tag_ids_by_count[count].append(tag_id)
+    return tag_ids_by_count.items()
+
+
+def change_recipe_counts(tag_ids, delta):
+    """Add ``delta`` to the recipe count of a tag once for every occurrence of its id.
+
+    Tags are updated with one query per distinct number of occurrences.
+    """
+
+    for count, ids in _group_by_count(tag_ids):
+        Tag.objects.filter(id__in=ids).update(recipe_count=F("recipe_count") + delta * count)
+
+
+# Links inserted per query, keeping the parameters within the limits of the databases
+LINK_BATCH_SIZE = 1000
+
+
+def _recipe_tag_table():
+    RecipeTag = Recipe.tags.through
+    connection = connections[router.db_for_write(RecipeTag)]
+    quote_name = connection.ops.quote_name
+    columns = [RecipeTag._meta.get_field(name).column for name in ("recipe", "tag")]
+    return connection, quote_name(RecipeTag._meta.db_table), *map(quote_name, columns)
+
+
+def add_recipe_tags(links):
+    """Link recipes to tags from ``(recipe_id, tag_id)`` pairs, skipping existing links.
+
+    Only the links the insert returns are counted, so links created concurrently are not
+    counted twice. Returns the tag ids of the inserted links.
+    """
+
+    links = list(links)
+    connection, table, recipe_column, tag_column = _recipe_tag_table()
+
+    tag_ids = []
+    with connection.cursor() as cursor:
+        for start in range(0, len(links), LINK_BATCH_SIZE):
+            batch = links[start : start + LINK_BATCH_SIZE]
+            values = ", ".join(["(%s, %s)"] * len(batch))
+            cursor.execute(
+                f"INSERT INTO {table} ({recipe_column}, {tag_column}) VALUES {values} "
+                f"ON CONFLICT DO NOTHING RETURNING {tag_column}",
+                [value for link in batch for value in link],
+            )
+            tag_ids.extend(tag_id for tag_id, in cursor.fetchall())
+
+    change_recipe_counts(tag_ids, 1)
+    return tag_ids
+
+
+def delete_recipe_tags(links):
+    """Delete a queryset of recipe tag links, decrementing the counts of the deleted rows.
+
+    Only the links the delete returns are counted, so links deleted concurrently are not
+    counted twice. Returns the tag ids of the deleted links.
+    """
+
+    connection, table, _, tag_column = _recipe_tag_table()
+    ids_sql, params = links.values("id").query.get_compiler(connection=connection).as_sql()
+
+    with connection.cursor() as cursor:
+        cursor.execute(
+            f"DELETE FROM {table} WHERE {connection.ops.quote_name('id')} IN ({ids_sql}) "
+            f"RETURNING {tag_column}",
+            params,
+        )
+        tag_ids = [tag_id for tag_id, in cursor.fetchall()]
+
+    change_recipe_counts(tag_ids, -1)
+    return tag_ids
+
+
+def remove_recipe_counts(links, distinct_tags=False):
+    """Decrement the recipe counts of the tags of recipe tag links about to be deleted.
+
+    When no tag appears in more than one link, like in the links of a single recipe, pass
+    ``distinct_tags`` to decrement in a single query.
+    """
+
+    if distinct_tags:
+        tags = Tag.objects.filter(id__in=links.values("tag_id"))
+        tags.update(recipe_count=F("recipe_count") - 1)
+    else:
+        change_recipe_counts(links.values_list("tag_id", flat=True), -1)
+
+
+def recount_recipe_counts(tags):
+    """Recompute the recipe counts of a queryset of tags from the recipe tag links.
+
+    Only tags with a wrong count are updated, and their number is returned.
+    """
+
+    links = Recipe.tags.through.objects.filter(tag_id=OuterRef("id"))
+    counts = links.order_by().values("tag_id").annotate(count=Count("*")).values("count")
+    actual = Coalesce(Subquery(counts), Value(0))
+
+    return tags.exclude(recipe_count=actual).update(recipe_count=actual)
@@ -0,0 +1,99 @@
+from django.conf import settings
+from rest_framework.pagination import Cursor, CursorPagination
+
+
+class RecipeCursorPagination(CursorPagination):
+    """Cursor pagination for recipes ordered by the newest first."""
+
+    ordering = "-id"
+    page_size = settings.API_PAGE_SIZE
+    page_size_query_param = "page_size"
+    max_page_size = 1000
+
+    def get_ordering(self, request, queryset, view):
+        """Order search results by rank, keeping the id as a tiebreaker."""
+
+        if "rank" in queryset.query.annotations:
+            return ("-rank", "-id")
+        return super().get_ordering(request, queryset, view)
+
+
+class TagCursorPagination(CursorPagination):
+    """Cursor pagination for tags ordered by name descending."""
+
+    ordering = "-name"
+    page_size = settings.API_PAGE_SIZE
+    page_size_query_param = "page_size"
+    max_page_size = 1000
+
+    def get_ordering(self, request, queryset, view):
+        """Break ties of recipe counts by id, so pages do not depend on the order of rows."""
+
+        ordering = super().get_ordering(request, queryset, view)
+        if len(ordering) == 1 and ordering[0].lstrip("-") == "recipe_count":
+            return (ordering[0], "-id" if ordering[0].startswith("-") else "id")
+        return ordering
+
+
+class AsyncCursorPaginationMixin:
+    """Paginate querysets with the async ORM using the cursors of the sync pagination.
+
+    The ordering must be a single unique field, so a page is found by filtering on the
+    position of the cursor. Call ``apaginate_queryset`` with a DRF request wrapping the
+    Django request, then ``get_paginated_data`` with the representation of the page.
+    """
+
+    async def apaginate_queryset(self, queryset, request):
+        """Return the rows of the requested page."""
+
+        self.page_size = self.get_page_size(request)
+        self.base_url = request.build_absolute_uri()
+        self.ordering = self.get_ordering(request, queryset, None)
+        assert len(self.ordering) == 1, "Async cursor pagination needs a single ordering field."
+
+        self.cursor = self.decode_cursor(request)
+        reverse = self.cursor is not None and self.cursor.reverse
+        position = self.cursor.position if self.cursor is not None else None
+
+        descending = self.ordering[0].startswith("-")
+        field = self.ordering[0].lstrip("-")
+        if reverse:
+            queryset = queryset.order_by(field if descending else f"-{field}")
+        else:
+            queryset = queryset.order_by(*self.ordering)
+        if position is not None:
+            lookup = "lt" if descending != reverse else "gt"
+            queryset = queryset.filter(**{f"{field}__{lookup}": position})
+
+        rows = [row async for row in queryset[: self.page_size + 1]]
+        has_more = len(rows) > self.page_size
+        rows = rows[: self.page_size]
+        if reverse:
+            rows.reverse()
+
+        self.next_link = None
+        self.previous_link = None
+        if rows:
+            has_next = True if reverse else has_more
+            has_previous = has_more if reverse else position is not None
+            if has_next:
+                cursor = Cursor(offset=0, reverse=False, position=str(rows[-1][field]))
+                self.next_link = self.encode_cursor(cursor)
+            if has_previous:
+                cursor = Cursor(offset=0, reverse=True, position=str(rows[0][field]))
+                self.previous_link = self.encode_cursor(cursor)
+
+        return rows
+
+    def get_paginated_data(self, data):
+        """Return the page data in the shape of the sync paginated responses."""
+
+        return {"next": self.next_link, "previous": self.previous_link, "results": data}
+
+
+class AsyncRecipeCursorPagination(AsyncCursorPaginationMixin, RecipeCursorPagination):
+    """Async cursor pagination for recipes ordered by the newest first."""
+
+
+class AsyncTagCursorPagination(AsyncCursorPaginationMixin, TagCursorPagination):
+    """Async cursor pagination for tags ordered by name descending."""
@@ -1,6 +1,27 @@
+from asgiref.sync import sync_to_async
+from django.db import transaction
+from django.shortcuts import get_object_or_404
+from django.utils.translation import gettext_lazy as _
 from rest_framework import serializers
 
-from recipes.models import Recipe, Tag
+from core.serializers import save_changed_fields
+from recipes.cache import bump_data_version
+from recipes.models import Recipe, Tag, add_recipe_tags, delete_recipe_tags
+
+
+def get_or_create_tags(user, names):
+    """Return a mapping of names to tags of a user, creating the missing tags in bulk."""
+
+    tag_objs = {tag.name: tag for tag in Tag.objects.filter(user=user, name__in=names)}
+    missing = [Tag(user=user, name=name) for name in names if name not in tag_objs]
+    if missing:
+        # Tags created concurrently are skipped here and picked up by the lookup below
+        Tag.objects.bulk_create(missing, ignore_conflicts=True)
+        missing_names = [tag.name for tag in missing]
+        created = Tag.objects.filter(user=user, name__in=missing_names)
+        tag_objs.update((tag.name, tag) for tag in created)
+
+    return tag_objs
 
 
 class TagSerializer(serializers.ModelSerializer):
@@ -11,12 +32,40 @@ class TagSerializer(serializers.ModelSerializer):
         fields = ("id", "name")
         read_only_field = ("id",)
 
+    def validate_name(self, value):
+        """Check the renamed tag does not clash with another tag of the user."""
+
+        if self.instance is not None:
+            other_tags = Tag.objects.filter(user_id=self.instance.user_id, name=value)
+            if other_tags.exclude(id=self.instance.id).exists():
+                raise serializers.ValidationError(_("Tag with this name already exists."))
+
+        return value
+
+    def update(self, instance, validated_data):
+        """Update and return a tag, leaving its recipe count to the link writes."""
+
+        save_changed_fields(instance, validated_data)
+        return instance
+
 
 class RecipeSerializer(serializers.ModelSerializer):
-    """Serializer for recipes."""
+    """Serializer for recipes.
+
+    ``fields`` limits the serialized fields and ``tags_format="ids"`` renders tags as ids.
+    """
 
     tags = TagSerializer(many=True, required=False)
 
+    def __init__(self, *args, fields=None, tags_format=None, **kwargs):
+        super().__init__(*args, **kwargs)
+
+        if fields is not None:
+            for name in set(self.fields) - set(fields):
+                self.fields.pop(name)
+        if tags_format == "ids" and "tags" in self.fields:
+            self.fields["tags"] = serializers.PrimaryKeyRelatedField(many=True, read_only=True)
+
     class Meta:
         model = Recipe
         fields = ("id", "title", "time_minutes", "price", "link", "tags")
@@ -26,37 +75,263 @@ class RecipeSerializer(serializers.ModelSerializer):
         """Handle getting or creating tags if needed."""
 
         user = self.context["request"].user
+        names = list(dict.fromkeys(tag["name"] for tag in tags))
+        if not names:
+            return
+
+        tag_objs = get_or_create_tags(user, names)
+        add_recipe_tags((recipe.id, tag_objs[name].id) for name in names)
+
+    def _update_tags(self, tags, recipe):
+        """Link the recipe to exactly the given tags, writing only the changed links.
+
+        Return whether any link changed.
+        """
+
+        names = {tag["name"] for tag in tags}
+        links = Recipe.tags.through.objects.filter(recipe_id=recipe.id)
+        linked = dict(links.values_list("tag__name", "tag_id"))
+
+        removed_ids = [tag_id for name, tag_id in linked.items() if name not in names]
+        if removed_ids:
+            delete_recipe_tags(links.filter(tag_id__in=removed_ids))
 
-        for tag in tags:
-            tag_obj, _ = Tag.objects.get_or_create(user=user, **tag)
-            recipe.tags.add(tag_obj)
+        added = [tag for tag in tags if tag["name"] not in linked]
+        self._get_or_create_tags(added, recipe)
+
+        changed = bool(removed_ids or added)
+        if changed:
+            # Prefetched tags no longer match the links
+            getattr(recipe, "_prefetched_objects_cache", {}).pop("tags", None)
+        return changed
 
     def create(self, validated_data):
         """Create a recipe."""
 
         tags = validated_data.pop("tags", [])
-        recipe = Recipe.objects.create(**validated_data)
-        self._get_or_create_tags(tags, recipe)
+        with transaction.atomic():
+            recipe = Recipe.objects.create(**validated_data)
+            self._get_or_create_tags(tags, recipe)
+            bump_data_version(recipe.user_id)
 
         return recipe
 
+    async def acreate(self, validated_data):
+        """Async version of ``create``, running the sync ``create`` in a thread.
+
+        The transaction needs a single connection, which the async ORM of Django 4.2 does not
+        keep across queries, and it runs each query in a thread anyway. Only the reads of the
+        async views use the async ORM.
+        """
+
+        return await sync_to_async(self.create)(validated_data)
+
     def update(self, instance, validated_data):
         """Update and return a recipe."""
 
         tags = validated_data.pop("tags", None)
-        if tags is not None:
-            instance.tags.clear()
-            self._get_or_create_tags(tags, instance)
-
-        for attr, value in validated_data.items():
-            setattr(instance, attr, value)
+        with transaction.atomic():
+            # Concurrent updates of the recipe wait for this one, and then see its tags
+            get_object_or_404(Recipe.objects.select_for_update().only("id"), pk=instance.pk)
+            tags_changed = tags is not None and self._update_tags(tags, instance)
 
-        instance.save()
+            if save_changed_fields(instance, validated_data) or tags_changed:
+                bump_data_version(instance.user_id)
         return instance
 
 
+def recipe_tags_query(serializer, recipe_ids):
+    """Return the query of tag rows of recipes as ``serializer`` renders tags, or None."""
+
+    tags_field = serializer.fields.get("tags")
+    if tags_field is None or not recipe_ids:
+        return None
+
+    recipe_tags = Recipe.tags.through.objects.filter(recipe_id__in=recipe_ids).order_by("tag_id")
+    if isinstance(tags_field, serializers.ManyRelatedField):
+        return recipe_tags.values_list("recipe_id", "tag_id")
+    return recipe_tags.values_list("recipe_id", "tag_id", "tag__name")
+
+
+def build_recipe_representations(serializer, rows, tag_rows):
+    """Return the representation of recipe value rows and their tag rows."""
+
+    fields = list(serializer.fields.items())
+    tags = {row["id"]: [] for row in rows}
+
+    ids_only = isinstance(serializer.fields.get("tags"), serializers.ManyRelatedField)
+    for recipe_id, tag_id, *name in tag_rows:
+        tags[recipe_id].append(tag_id if ids_only else {"id": tag_id, "name": name[0]})
+
+    data = []
+    for row in rows:
+        item = {}
+        for name, field in fields:
+            if name == "tags":
+                item[name] = tags[row["id"]]
+            else:
+                value = row[name]
+                item[name] = None if value is None else field.to_representation(value)
+        data.append(item)
+
+    return data
+
+
+def represent_recipe_rows(serializer, rows):
+    """Return the representation of recipe value rows as ``serializer`` would render them.
+
+    Tags of all rows are read in a single query, ordered by id like the recipe views prefetch
+    them. Rows must contain the ``id`` and every non-tag field of the serializer.
+    """
+
+    rows = list(rows)
+    query = recipe_tags_query(serializer, [row["id"] for row in rows])
+
+    return build_recipe_representations(serializer, rows, query if query is not None else [])
+
+
+async def arepresent_recipe_rows(serializer, rows):
+    """Async version of ``represent_recipe_rows`` for a list of rows."""
+
+    query = recipe_tags_query(serializer, [row["id"] for row in rows])
+    tag_rows = [tag_row async for tag_row in query] if query is not None else []
+
+    return build_recipe_representations(serializer, rows, tag_rows)
+
+
 class RecipeDetailSerializer(RecipeSerializer):
     """Serializer for the detailed recipe object."""
 
     class Meta(RecipeSerializer.Meta):
         fields = RecipeSerializer.Meta.fields + ("description",)
+
+
+class RecipeBatchListSerializer(serializers.ListSerializer):
+    """Serializer for creating and updating many recipes with bulk queries."""
+
+    update_fields = ("title", "time_minutes", "price", "link", "description")
+
+    def to_internal_value(self, data):
+        """Check the recipes to update exist in one query before validating the items."""
+
+        ids = []
+        for item in data if isinstance(data, list) else []:
+            try:
+                ids.append(int(item["id"]))
+            except (KeyError, TypeError, ValueError):
+                continue
+
+        user = self.context["request"].user
+        self.recipe_ids = set(
+            Recipe.objects.filter(user=user, id__in=ids).values_list("id", flat=True)
+        )
+        self.seen_ids = set()
+
+        return super().to_internal_value(data)
+
+    def create(self, validated_data):
+        """Create and update recipes and return them in the order of the input.
+
+        Must run in a transaction, like the batch view does: the recipes to update are read
+        again and locked, so fields left out of an item keep values written concurrently.
+        """
+
+        user = self.context["request"].user
+        names = {tag["name"] for item in validated_data for tag in item.get("tags", [])}
+        tag_objs = get_or_create_tags(user, names) if names else {}
+
+        updates = [item for item in validated_data if "id" in item]
+        # Only the fields given by some item are written, and locking in id order keeps
+        # concurrent batches from deadlocking
+        update_fields = [
+            name for name in self.update_fields if any(name in item for item in updates)
+        ]
+        instances = (
+            Recipe.objects.select_for_update()
+            .order_by("id")
+            .in_bulk([item["id"] for item in updates])
+            if updates
+            else {}
+        )
+
+        recipes = []
+        new_recipes = []
+        updated_recipes = []
+        recipe_tags = []
+        for item in validated_data:
+            tags = item.pop("tags", None)
+            recipe_id = item.pop("id", None)
+
+            if recipe_id is None:
+                recipe = Recipe(user=user, **item)
+                new_recipes.append(recipe)
+            else:
+                recipe = instances[recipe_id]
+                for attr, value in item.items():
+                    setattr(recipe, attr, value)
+                updated_recipes.append(recipe)
+
+            recipes.append(recipe)
+            recipe_tags.append(tags)
+
+        Recipe.objects.bulk_create(new_recipes)
+        if update_fields:
+            Recipe.objects.bulk_update(updated_recipes, update_fields)
+
+        RecipeTag = Recipe.tags.through
+        updated_ids = {recipe.id for recipe in updated_recipes}
+        retagged_ids = [
+            recipe.id
+            for recipe, tags in zip(recipes, recipe_tags)
+            if tags is not None and recipe.id in updated_ids
+        ]
+        links = {
+            (recipe.id, tag_objs[tag["name"]].id)
+            for recipe, tags in zip(recipes, recipe_tags)
+            for tag in tags or []
+        }
+
+        # Only the links that changed are written, retagging with the same tags writes nothing
+        current = RecipeTag.objects.filter(recipe_id__in=retagged_ids)
+        removed = []
+        for link_id, recipe_id, tag_id in current.values_list("id", "recipe_id", "tag_id"):
+            if (recipe_id, tag_id) in links:
+                links.remove((recipe_id, tag_id))
+            else:
+                removed.append(link_id)
+        if removed:
+            delete_recipe_tags(RecipeTag.objects.filter(id__in=removed))
+        if links:
+            add_recipe_tags(links)
+
+        bump_data_version(user.id)
+        return recipes
+
+
+class RecipeBatchSerializer(RecipeDetailSerializer):
+    """Serializer for an item of a recipe batch, updating the recipe when ``id`` is given."""
+
+    id = serializers.IntegerField(required=False)
+
+    class Meta(RecipeDetailSerializer.Meta):
+        list_serializer_class = RecipeBatchListSerializer
+
+    def validate_id(self, value):
+        """Check the recipe belongs to the user and is updated only once per batch."""
+
+        batch = self.parent
+        if value not in batch.recipe_ids:
+            raise serializers.ValidationError(_("Recipe does not exist."))
+        if value in batch.seen_ids:
+            raise serializers.ValidationError(_("Recipe is updated more than once."))
+
+        batch.seen_ids.add(value)
+        return value
+
+
+class ResponseCacheStatsSerializer(serializers.Serializer):
+    """Serializer for the hit and miss counters of the response cache."""
+
+    hits = serializers.IntegerField()
+    misses = serializers.IntegerField()
+    hit_rate = serializers.FloatField(allow_null=True)
@@ -0,0 +1,24 @@
+from django.db.models.signals import m2m_changed
+from django.dispatch import receiver
+
+from recipes.models import Recipe, change_recipe_counts, remove_recipe_counts
+
+
+RecipeTag = Recipe.tags.through
+
+
+@receiver(m2m_changed, sender=RecipeTag)
+def update_tag_recipe_counts(sender, instance, action, reverse, pk_set, **kwargs):
+    """Keep the recipe counts of tags up to date when tags change through related managers.
+
+    Bulk operations on the through table, which send no signals, update the counts
+    themselves.
+    """
+
+    if action == "post_add":
+        change_recipe_counts([instance.pk] * len(pk_set) if reverse else pk_set, 1)
+    elif action in ("pre_remove", "pre_clear"):
+        links = RecipeTag.objects.filter(**{"tag" if reverse else "recipe": instance})
+        if action == "pre_remove":
+            links = links.filter(**{"recipe__in" if reverse else "tag__in": pk_set})
+        remove_recipe_counts(links, distinct_tags=not reverse)
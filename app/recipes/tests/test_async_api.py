@@ -0,0 +1,224 @@
+from decimal import Decimal
+
+from django.contrib.auth import get_user_model
+from django.test import TestCase
+from django.urls import reverse
+from rest_framework import status
+from rest_framework.authtoken.models import Token
+from rest_framework.test import APIClient
+
+from recipes.cache import get_response_cache
+from recipes.models import Recipe, Tag
+from users.authentication import get_token_cache
+
+
+UserModel = get_user_model()
+ASYNC_RECIPES_URL = reverse("recipes:async-recipe-list")
+ASYNC_TAGS_URL = reverse("recipes:async-tag-list")
+RECIPES_URL = reverse("recipes:recipe-list")
+TAGS_URL = reverse("recipes:tag-list")
+
+
+def async_detail_url(recipe_id):
+    """Create and return an async recipe detail URL."""
+
+    return reverse("recipes:async-recipe-detail", args=[recipe_id])
+
+
+def create_recipe(user, **params):
+    """Create and return a new recipe."""
+
+    defaults = {
+        "title": "Test recipe title",
+        "time_minutes": 10,
+        "price": Decimal("10.10"),
+        "description": "Test recipe description",
+        "link": "https://ex.com/recipe.pdf",
+    }
+    defaults.update(params)
+    return Recipe.objects.create(user=user, **defaults)
+
+
+class PublicAsyncAPITests(TestCase):
+    """Test unauthenticated requests to the async endpoints."""
+
+    def setUp(self):
+        self.client = APIClient()
+        get_token_cache().clear()
+
+    def test_auth_required(self):
+        """Test auth is required to call the async endpoints."""
+
+        for url in (ASYNC_RECIPES_URL, ASYNC_TAGS_URL, async_detail_url(1)):
+            res = self.client.get(url)
+
+            self.assertEqual(res.status_code, status.HTTP_401_UNAUTHORIZED)
+            self.assertEqual(res["WWW-Authenticate"], "Token")
+
+    def test_invalid_token(self):
+        """Test an invalid token is rejected with the message of the sync endpoints."""
+
+        self.client.credentials(HTTP_AUTHORIZATION="Token invalid")
+        res = self.client.get(ASYNC_RECIPES_URL)
+
+        self.assertEqual(res.status_code, status.HTTP_401_UNAUTHORIZED)
+        self.assertEqual(res.json(), {"detail": "Invalid token."})
+
+
+class PrivateAsyncAPITests(TestCase):
+    """Test authenticated requests to the async endpoints."""
+
+    def setUp(self):
+        self.user = UserModel.objects.create_user(email="user@ex.com", password="testpass123")
+        token = Token.objects.create(user=self.user)
+        self.client = APIClient()
+        self.client.credentials(HTTP_AUTHORIZATION=f"Token {token.key}")
+        get_token_cache().clear()
+        get_response_cache().clear()
+
+    def test_list_recipes_matches_sync_list(self):
+        """Test the async recipe list renders like the sync list."""
+
+        for i in range(3):
+            recipe = create_recipe(user=self.user, title=f"Recipe {i}")
+            recipe.tags.add(Tag.objects.create(user=self.user, name=f"Tag {i}"))
+        create_recipe(user=UserModel.objects.create_user(email="other@ex.com", password="pass"))
+
+        res = self.client.get(ASYNC_RECIPES_URL)
+
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        self.assertEqual(res.json(), self.client.get(RECIPES_URL).json())
+
+    def test_list_recipes_pages(self):
+        """Test paging through recipes forward and back with the sync cursors."""
+
+        recipes = [create_recipe(user=self.user, title=f"Recipe {i}") for i in range(5)]
+        ids = [recipe.id for recipe in reversed(recipes)]
+
+        first = self.client.get(ASYNC_RECIPES_URL, {"page_size": 2}).json()
+        sync_first = self.client.get(RECIPES_URL, {"page_size": 2}).json()
+        second = self.client.get(first["next"]).json()
+        third = self.client.get(second["next"]).json()
+        back = self.client.get(third["previous"]).json()
+
+        self.assertEqual([r["id"] for r in first["results"]], ids[:2])
+        self.assertEqual(first["next"].split("cursor=")[1], sync_first["next"].split("cursor=")[1])
+        self.assertIsNone(first["previous"])
+        self.assertEqual([r["id"] for r in second["results"]], ids[2:4])
+        self.assertEqual([r["id"] for r in third["results"]], ids[4:])
+        self.assertIsNone(third["next"])
+        self.assertEqual(back, second)
+
+    def test_list_recipes_invalid_cursor(self):
+        """Test an invalid cursor returns 404."""
+
+        res = self.client.get(ASYNC_RECIPES_URL, {"cursor": "invalid"})
+
+        self.assertEqual(res.status_code, status.HTTP_404_NOT_FOUND)
+
+    def test_list_recipes_filtered_by_tags(self):
+        """Test filtering the async recipe list by tags."""
+
+        tag = Tag.objects.create(user=self.user, name="Vegan")
+        recipe = create_recipe(user=self.user, title="Tofu")
+        recipe.tags.add(tag)
+        create_recipe(user=self.user, title="Steak")
+
+        res = self.client.get(ASYNC_RECIPES_URL, {"tags": str(tag.id)})
+
+        self.assertEqual([r["id"] for r in res.json()["results"]], [recipe.id])
+
+    def test_retrieve_recipe(self):
+        """Test the async recipe detail renders like the sync detail."""
+
+        recipe = create_recipe(user=self.user)
+        recipe.tags.add(Tag.objects.create(user=self.user, name="Dinner"))
+
+        res = self.client.get(async_detail_url(recipe.id))
+        sync_res = self.client.get(reverse("recipes:recipe-detail", args=[recipe.id]))
+
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        self.assertEqual(res.json(), sync_res.json())
+
+    def test_retrieve_other_users_recipe_not_found(self):
+        """Test retrieving a recipe of another user returns 404."""
+
+        other_user = UserModel.objects.create_user(email="other@ex.com", password="pass")
+        recipe = create_recipe(user=other_user)
+
+        res = self.client.get(async_detail_url(recipe.id))
+
+        self.assertEqual(res.status_code, status.HTTP_404_NOT_FOUND)
+
+    def test_create_recipe_with_tags(self):
+        """Test creating a recipe with new and existing tags."""
+
+        Tag.objects.create(user=self.user, name="Dinner")
+        payload = {
+            "title": "Curry",
+            "time_minutes": 30,
+            "price": "5.50",
+            "tags": [{"name": "Dinner"}, {"name": "Indian"}],
+        }
+
+        res = self.client.post(ASYNC_RECIPES_URL, payload, format="json")
+
+        self.assertEqual(res.status_code, status.HTTP_201_CREATED)
+        recipe = Recipe.objects.get(id=res.json()["id"])
+        self.assertEqual(recipe.user, self.user)
+        self.assertEqual(recipe.price, Decimal("5.50"))
+        self.assertEqual(sorted(recipe.tags.values_list("name", flat=True)), ["Dinner", "Indian"])
+        self.assertEqual(Tag.objects.filter(user=self.user).count(), 2)
+        self.assertEqual(res.json(), self.client.get(async_detail_url(recipe.id)).json())
+
+    def test_create_recipe_invalidates_cached_list(self):
+        """Test creating a recipe through the async endpoint refreshes the sync list."""
+
+        self.client.get(RECIPES_URL)
+        payload = {"title": "Curry", "time_minutes": 30, "price": "5.50"}
+        with self.captureOnCommitCallbacks(execute=True):
+            self.client.post(ASYNC_RECIPES_URL, payload, format="json")
+
+        res = self.client.get(RECIPES_URL)
+
+        self.assertEqual(res["X-Cache"], "MISS")
+        self.assertEqual(len(res.json()["results"]), 1)
+
+    def test_create_recipe_invalid(self):
+        """Test validation errors are returned like the sync endpoint."""
+
+        res = self.client.post(ASYNC_RECIPES_URL, {"title": "Curry"}, format="json")
+
+        self.assertEqual(res.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertIn("time_minutes", res.json())
+        self.assertFalse(Recipe.objects.exists())
+
+    def test_create_recipe_malformed_json(self):
+        """Test a malformed JSON body returns 400."""
+
+        res = self.client.post(ASYNC_RECIPES_URL, "{", content_type="application/json")
+
+        self.assertEqual(res.status_code, status.HTTP_400_BAD_REQUEST)
+
+    def test_method_not_allowed(self):
+        """Test methods other than the implemented ones return 405."""
+
+        res = self.client.delete(ASYNC_RECIPES_URL)
+
+        self.assertEqual(res.status_code, status.HTTP_405_METHOD_NOT_ALLOWED)
+
+    def test_list_tags_matches_sync_list(self):
+        """Test the async tag list renders and pages like the sync list."""
+
+        for name in ("Vegan", "Dessert", "Breakfast"):
+            Tag.objects.create(user=self.user, name=name)
+
+        res = self.client.get(ASYNC_TAGS_URL, {"page_size": 2})
+        sync_res = self.client.get(TAGS_URL, {"page_size": 2})
+
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        self.assertEqual(res.json()["results"], sync_res.json()["results"])
+        self.assertEqual(
+            self.client.get(res.json()["next"]).json()["results"],
+            self.client.get(sync_res.json()["next"]).json()["results"],
+        )
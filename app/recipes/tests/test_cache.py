@@ -0,0 +1,196 @@
+from decimal import Decimal
+
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.core.cache import caches
+from django.test import SimpleTestCase, TestCase, override_settings
+from django.urls import reverse
+from rest_framework import status
+from rest_framework.test import APIClient
+
+from core.checks import check_response_version_cache
+from recipes.cache import bump_data_version, get_data_version, get_response_cache, get_version_cache
+from recipes.models import Recipe, Tag
+
+
+UserModel = get_user_model()
+RECIPES_URL = reverse("recipes:recipe-list")
+TAGS_URL = reverse("recipes:tag-list")
+CACHE_STATS_URL = reverse("recipes:cache-stats")
+
+
+def recipe_detail_url(recipe_id):
+    """Create and return a recipe detail URL."""
+
+    return reverse("recipes:recipe-detail", args=[recipe_id])
+
+
+def tag_detail_url(tag_id):
+    """Create and return a tag detail URL."""
+
+    return reverse("recipes:tag-detail", args=[tag_id])
+
+
+def create_recipe(user, **params):
+    """Create and return a new recipe."""
+
+    defaults = {"title": "Test recipe title", "time_minutes": 10, "price": Decimal("10.10")}
+    defaults.update(params)
+
+    return Recipe.objects.create(user=user, **defaults)
+
+
+class ResponseCacheTest(TestCase):
+    """Test the per-user versioned response cache."""
+
+    def setUp(self):
+        get_response_cache().clear()
+        get_version_cache().clear()
+        self.user = UserModel.objects.create_user(email="test@ex.com", password="testpassword")
+        self.client = APIClient()
+        self.client.force_authenticate(self.user)
+
+    def test_list_cached(self):
+        """Test repeated list requests are served from the cache."""
+
+        create_recipe(user=self.user)
+
+        res = self.client.get(RECIPES_URL)
+        self.assertEqual(res["X-Cache"], "MISS")
+
+        with self.assertNumQueries(0):
+            cached_res = self.client.get(RECIPES_URL)
+
+        self.assertEqual(cached_res["X-Cache"], "HIT")
+        self.assertEqual(cached_res.data, res.data)
+
+    def test_retrieve_cached(self):
+        """Test repeated detail requests are served from the cache."""
+
+        recipe = create_recipe(user=self.user)
+
+        self.client.get(recipe_detail_url(recipe.id))
+        with self.assertNumQueries(0):
+            res = self.client.get(recipe_detail_url(recipe.id))
+
+        self.assertEqual(res["X-Cache"], "HIT")
+        self.assertEqual(res.data["id"], recipe.id)
+
+    def test_cache_limited_to_user(self):
+        """Test cached responses are not shared between users."""
+
+        other_user = UserModel.objects.create_user(email="other@ex.com", password="testpassword")
+        create_recipe(user=self.user)
+        self.client.get(RECIPES_URL)
+
+        self.client.force_authenticate(other_user)
+        res = self.client.get(RECIPES_URL)
+
+        self.assertEqual(res["X-Cache"], "MISS")
+        self.assertEqual(res.data["results"], [])
+
+    def test_create_recipe_invalidates(self):
+        """Test creating a recipe invalidates the cached list."""
+
+        self.client.get(RECIPES_URL)
+
+        payload = {"title": "Test recipe title", "time_minutes": 5, "price": Decimal("1.10")}
+        with self.captureOnCommitCallbacks(execute=True):
+            self.client.post(RECIPES_URL, payload)
+        res = self.client.get(RECIPES_URL)
+
+        self.assertEqual(res["X-Cache"], "MISS")
+        self.assertEqual(len(res.data["results"]), 1)
+
+    def test_update_recipe_invalidates(self):
+        """Test updating a recipe invalidates its cached detail."""
+
+        recipe = create_recipe(user=self.user)
+        url = recipe_detail_url(recipe.id)
+        self.client.get(url)
+
+        with self.captureOnCommitCallbacks(execute=True):
+            self.client.patch(url, {"title": "New recipe title"})
+        res = self.client.get(url)
+
+        self.assertEqual(res.data["title"], "New recipe title")
+
+    def test_delete_recipe_invalidates(self):
+        """Test deleting a recipe invalidates the cached list."""
+
+        recipe = create_recipe(user=self.user)
+        self.client.get(RECIPES_URL)
+
+        with self.captureOnCommitCallbacks(execute=True):
+            self.client.delete(recipe_detail_url(recipe.id))
+        res = self.client.get(RECIPES_URL)
+
+        self.assertEqual(res.data["results"], [])
+
+    def test_update_tag_invalidates(self):
+        """Test renaming a tag invalidates cached recipes and tags."""
+
+        tag = Tag.objects.create(user=self.user, name="Dinner")
+        create_recipe(user=self.user).tags.add(tag)
+        self.client.get(RECIPES_URL)
+        self.client.get(TAGS_URL)
+
+        with self.captureOnCommitCallbacks(execute=True):
+            self.client.patch(tag_detail_url(tag.id), {"name": "Lunch"})
+        recipes_res = self.client.get(RECIPES_URL)
+        tags_res = self.client.get(TAGS_URL)
+
+        self.assertEqual(recipes_res.data["results"][0]["tags"][0]["name"], "Lunch")
+        self.assertEqual(tags_res.data["results"][0]["name"], "Lunch")
+
+    def test_version_bump_visible_to_other_workers(self):
+        """Test a write invalidates the cached responses of other workers too."""
+
+        other_worker_cache = caches.create_connection(settings.API_RESPONSE_VERSION_CACHE)
+        version = get_data_version(self.user.id)
+
+        with self.captureOnCommitCallbacks(execute=True):
+            bump_data_version(self.user.id)
+
+        self.assertNotEqual(other_worker_cache.get(f"recipes:data-version:{self.user.id}"), version)
+
+    def test_cache_stats(self):
+        """Test hit and miss counters are exposed to admins."""
+
+        admin = UserModel.objects.create_superuser(email="admin@ex.com", password="adminpass")
+        self.client.get(RECIPES_URL)
+        self.client.get(RECIPES_URL)
+        self.client.get(TAGS_URL)
+
+        self.client.force_authenticate(admin)
+        res = self.client.get(CACHE_STATS_URL)
+
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        self.assertEqual(res.data, {"hits": 1, "misses": 2, "hit_rate": 1 / 3})
+
+    def test_cache_stats_admin_only(self):
+        """Test cache counters are not exposed to regular users."""
+
+        res = self.client.get(CACHE_STATS_URL)
+
+        self.assertEqual(res.status_code, status.HTTP_403_FORBIDDEN)
+
+
+class ResponseVersionCacheCheckTest(SimpleTestCase):
+    """Test the check of the response version cache."""
+
+    @override_settings(
+        API_RESPONSE_VERSION_CACHE="versions",
+        CACHES={"versions": {"BACKEND": "django.core.cache.backends.locmem.LocMemCache"}},
+    )
+    def test_process_local_cache(self):
+        """Test a cache local to the worker is rejected."""
+
+        errors = check_response_version_cache(None)
+
+        self.assertEqual([error.id for error in errors], ["core.E002"])
+
+    def test_default_cache(self):
+        """Test the default cache is shared by the workers."""
+
+        self.assertEqual(check_response_version_cache(None), [])
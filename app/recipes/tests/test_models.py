@@ -1,6 +1,7 @@
 from decimal import Decimal
 
 from django.contrib.auth import get_user_model
+from django.db import IntegrityError
 from django.test import TestCase
 
 from recipes.models import Recipe, Tag
@@ -46,3 +47,14 @@ class TagTest(TestCase):
         tag = Tag.objects.create(user=user, name="Tag1")
 
         self.assertEqual(str(tag), tag.name)
+
+    def test_tag_name_unique_per_user(self):
+        """Test a user cannot have two tags with the same name."""
+
+        user = create_user()
+        other_user = create_user(email="other@ex.com")
+        Tag.objects.create(user=user, name="Tag1")
+        Tag.objects.create(user=other_user, name="Tag1")
+
+        with self.assertRaises(IntegrityError):
+            Tag.objects.create(user=user, name="Tag1")
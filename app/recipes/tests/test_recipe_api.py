@@ -1,17 +1,25 @@
 from decimal import Decimal
+from types import SimpleNamespace
+from unittest import skipUnless
 
 from django.contrib.auth import get_user_model
+from django.db import connection, transaction
+from django.db.models import Prefetch
 from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
 from django.urls import reverse
 from rest_framework import status
+from rest_framework.renderers import JSONRenderer
 from rest_framework.test import APIClient
 
+from recipes.cache import get_response_cache
 from recipes.models import Recipe, Tag
-from recipes.serializers import RecipeDetailSerializer, RecipeSerializer
+from recipes.serializers import RecipeBatchSerializer, RecipeDetailSerializer, RecipeSerializer
 
 
 UserModel = get_user_model()
 RECIPES_URL = reverse("recipes:recipe-list")
+BATCH_URL = reverse("recipes:recipe-batch")
 
 
 def detail_url(recipe_id):
@@ -35,6 +43,17 @@ def create_recipe(user, **params):
     return Recipe.objects.create(user=user, **defaults)
 
 
+def link_writes(queries):
+    """Return the captured statements writing to the recipe tags table."""
+
+    table = Recipe.tags.through._meta.db_table
+    return [
+        query["sql"]
+        for query in queries.captured_queries
+        if query["sql"].startswith(("INSERT", "UPDATE", "DELETE")) and f'"{table}"' in query["sql"]
+    ]
+
+
 def create_user(**params):
     """Create and return a new user."""
 
@@ -59,6 +78,7 @@ class PrivateRecipeAPITest(TestCase):
     """Test authenticated requests to recipe API."""
 
     def setUp(self):
+        get_response_cache().clear()
         self.client = APIClient()
         self.user = create_user(email="test.ex.com", password="testpassword")
         self.client.force_authenticate(self.user)
@@ -74,7 +94,7 @@ class PrivateRecipeAPITest(TestCase):
         recipes = Recipe.objects.all().order_by("-id")
         serializer = RecipeSerializer(recipes, many=True)
         self.assertEqual(res.status_code, status.HTTP_200_OK)
-        self.assertEqual(res.data, serializer.data)
+        self.assertEqual(res.data["results"], serializer.data)
 
     def test_recipe_list_limited_to_user(self):
         """Test list of recipes is limited to authenticated user."""
@@ -88,7 +108,41 @@ class PrivateRecipeAPITest(TestCase):
         recipes = Recipe.objects.filter(user=self.user)
         serializer = RecipeSerializer(recipes, many=True)
         self.assertEqual(res.status_code, status.HTTP_200_OK)
-        self.assertEqual(res.data, serializer.data)
+        self.assertEqual(res.data["results"], serializer.data)
+
+    def test_retrieve_recipes_matches_serializer(self):
+        """Test the recipe list renders the same JSON as the recipe serializer."""
+
+        tags = [Tag.objects.create(user=self.user, name=f"Tag {i}") for i in range(3)]
+        for price in ("0.50", "10.10", "999.99"):
+            recipe = create_recipe(user=self.user, price=Decimal(price), link="")
+            recipe.tags.add(*tags[: int(Decimal(price)) % 3 + 1])
+        create_recipe(user=self.user, title="Çılbır ☕")
+
+        res = self.client.get(RECIPES_URL)
+
+        recipes = Recipe.objects.prefetch_related(
+            Prefetch("tags", queryset=Tag.objects.order_by("id"))
+        ).order_by("-id")
+        serializer = RecipeSerializer(recipes, many=True)
+        self.assertEqual(
+            JSONRenderer().render(res.data["results"]), JSONRenderer().render(serializer.data)
+        )
+
+    def test_recipe_list_paginated(self):
+        """Test recipes are paginated with an opaque cursor."""
+
+        recipes = [create_recipe(user=self.user) for _ in range(5)]
+
+        res = self.client.get(RECIPES_URL, {"page_size": 2})
+        ids = [recipe["id"] for recipe in res.data["results"]]
+        while res.data["next"]:
+            res = self.client.get(res.data["next"])
+            ids.extend(recipe["id"] for recipe in res.data["results"])
+
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        self.assertIsNone(res.data["next"])
+        self.assertEqual(ids, [recipe.id for recipe in reversed(recipes)])
 
     def test_get_recipe_detail(self):
         """Test getting recipe detail."""
@@ -138,6 +192,41 @@ class PrivateRecipeAPITest(TestCase):
         self.assertEqual(recipe.link, original_link)
         self.assertEqual(recipe.user, self.user)
 
+    def test_partial_update_saves_changed_columns(self):
+        """Test a partial update writes only the changed column."""
+
+        recipe = create_recipe(user=self.user, title="Old title")
+        recipe_table = Recipe._meta.db_table
+
+        with CaptureQueriesContext(connection) as ctx:
+            res = self.client.patch(detail_url(recipe.id), {"title": "New title"})
+
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        updates = [q["sql"] for q in ctx.captured_queries if q["sql"].startswith("UPDATE")]
+        self.assertEqual(
+            updates,
+            [
+                f'UPDATE "{recipe_table}" SET "title" = \'New title\' '
+                f'WHERE "{recipe_table}"."id" = {recipe.id}'
+            ],
+        )
+
+    def test_update_unchanged_skips_save(self):
+        """Test an update sending the current values writes nothing."""
+
+        recipe = create_recipe(user=self.user, title="Title", price=Decimal("5.50"))
+        recipe.tags.add(Tag.objects.create(user=self.user, name="Vegan"))
+        payload = {"title": "Title", "price": "5.5", "tags": [{"name": "Vegan"}]}
+
+        with CaptureQueriesContext(connection) as ctx:
+            res = self.client.patch(detail_url(recipe.id), payload, format="json")
+
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        writes = ("INSERT", "UPDATE", "DELETE")
+        self.assertEqual(
+            [q["sql"] for q in ctx.captured_queries if q["sql"].startswith(writes)], []
+        )
+
     def test_full_update(self):
         """Test full update of a recipe successful."""
 
@@ -282,3 +371,449 @@ class PrivateRecipeAPITest(TestCase):
 
         self.assertEqual(res.status_code, status.HTTP_200_OK)
         self.assertEqual(recipe.tags.count(), 0)
+
+    def test_update_same_tags_no_link_writes(self):
+        """Test sending the same tags again writes nothing to the recipe tags table."""
+
+        recipe = create_recipe(user=self.user)
+        recipe.tags.add(Tag.objects.create(user=self.user, name="Vegan"))
+        recipe.tags.add(Tag.objects.create(user=self.user, name="Dinner"))
+        payload = {"tags": [{"name": "Dinner"}, {"name": "Vegan"}]}
+
+        with CaptureQueriesContext(connection) as ctx:
+            res = self.client.patch(detail_url(recipe.id), payload, format="json")
+
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        self.assertEqual(link_writes(ctx), [])
+        self.assertEqual([tag["name"] for tag in res.data["tags"]], ["Vegan", "Dinner"])
+
+    def test_update_tags_writes_changes_only(self):
+        """Test retagging deletes the removed links and inserts the added ones only."""
+
+        recipe = create_recipe(user=self.user)
+        kept = Tag.objects.create(user=self.user, name="Kept")
+        removed = Tag.objects.create(user=self.user, name="Removed")
+        recipe.tags.add(kept, removed)
+        kept_link = Recipe.tags.through.objects.get(tag=kept)
+        payload = {"tags": [{"name": "Kept"}, {"name": "Added"}]}
+
+        with CaptureQueriesContext(connection) as ctx:
+            res = self.client.patch(detail_url(recipe.id), payload, format="json")
+
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        writes = link_writes(ctx)
+        self.assertEqual([sql.split()[0] for sql in writes], ["DELETE", "INSERT"])
+        self.assertTrue(Recipe.tags.through.objects.filter(id=kept_link.id, tag=kept).exists())
+        self.assertEqual(sorted(recipe.tags.values_list("name", flat=True)), ["Added", "Kept"])
+        self.assertEqual([tag["name"] for tag in res.data["tags"]], ["Kept", "Added"])
+
+    def test_list_recipes_constant_queries(self):
+        """Test listing recipes takes the same number of queries regardless of size."""
+
+        for i in range(3):
+            recipe = create_recipe(user=self.user)
+            recipe.tags.add(Tag.objects.create(user=self.user, name=f"Tag {i}"))
+
+        with self.assertNumQueries(2):
+            res = self.client.get(RECIPES_URL)
+        self.assertEqual(len(res.data["results"]), 3)
+
+        for i in range(3, 20):
+            recipe = create_recipe(user=self.user)
+            recipe.tags.add(Tag.objects.create(user=self.user, name=f"Tag {i}"))
+        get_response_cache().clear()
+
+        with self.assertNumQueries(2):
+            res = self.client.get(RECIPES_URL)
+        self.assertEqual(len(res.data["results"]), 20)
+
+    def test_get_recipe_detail_constant_queries(self):
+        """Test retrieving a recipe loads its tags in a single query."""
+
+        recipe = create_recipe(user=self.user)
+        for i in range(10):
+            recipe.tags.add(Tag.objects.create(user=self.user, name=f"Tag {i}"))
+
+        with self.assertNumQueries(2):
+            res = self.client.get(detail_url(recipe.id))
+        self.assertEqual(len(res.data["tags"]), 10)
+
+    def test_create_recipe_tags_constant_queries(self):
+        """Test nested tag writes cost the same regardless of number of tags."""
+
+        def create_with_tags(count):
+            payload = {
+                "title": "Test recipe title",
+                "time_minutes": 20,
+                "price": Decimal("4.50"),
+                "tags": [{"name": f"Tag {count} {i}"} for i in range(count)],
+            }
+            with CaptureQueriesContext(connection) as ctx:
+                res = self.client.post(RECIPES_URL, payload, format="json")
+            self.assertEqual(res.status_code, status.HTTP_201_CREATED)
+            return len(ctx.captured_queries)
+
+        self.assertEqual(create_with_tags(1), create_with_tags(100))
+        self.assertEqual(Tag.objects.filter(user=self.user).count(), 101)
+
+    def test_create_recipe_with_duplicate_tags(self):
+        """Test duplicate tag names in a payload are assigned once."""
+
+        Tag.objects.create(user=self.user, name="Existing")
+        payload = {
+            "title": "Test recipe title",
+            "time_minutes": 20,
+            "price": Decimal("4.50"),
+            "tags": [{"name": "Existing"}, {"name": "New"}, {"name": "New"}],
+        }
+
+        res = self.client.post(RECIPES_URL, payload, format="json")
+        recipe = Recipe.objects.get(id=res.data["id"])
+
+        self.assertEqual(res.status_code, status.HTTP_201_CREATED)
+        self.assertEqual(recipe.tags.count(), 2)
+        self.assertEqual(Tag.objects.filter(user=self.user).count(), 2)
+
+
+class RecipeBatchAPITest(TestCase):
+    """Test creating and updating recipes in batches."""
+
+    def setUp(self):
+        self.client = APIClient()
+        self.user = create_user(email="test@ex.com", password="testpassword")
+        self.client.force_authenticate(self.user)
+
+    def test_batch_create(self):
+        """Test creating many recipes with tags in one request."""
+
+        Tag.objects.create(user=self.user, name="Existing")
+        payload = [
+            {
+                "title": f"Recipe {i}",
+                "time_minutes": i + 1,
+                "price": "5.50",
+                "tags": [{"name": "Existing"}, {"name": f"Tag {i % 2}"}],
+            }
+            for i in range(4)
+        ]
+
+        res = self.client.post(BATCH_URL, payload, format="json")
+
+        self.assertEqual(res.status_code, status.HTTP_201_CREATED)
+        self.assertEqual(
+            [recipe["title"] for recipe in res.data], [f"Recipe {i}" for i in range(4)]
+        )
+        self.assertEqual(Recipe.objects.filter(user=self.user).count(), 4)
+        self.assertEqual(Tag.objects.filter(user=self.user).count(), 3)
+        for recipe in Recipe.objects.filter(user=self.user):
+            self.assertEqual(recipe.tags.count(), 2)
+
+    def test_batch_update(self):
+        """Test updating recipes by id and replacing their tags."""
+
+        recipe = create_recipe(user=self.user)
+        recipe.tags.add(Tag.objects.create(user=self.user, name="Old"))
+        untouched = create_recipe(user=self.user, title="Untouched")
+        untouched.tags.add(Tag.objects.get(name="Old"))
+        payload = [
+            {
+                "id": recipe.id,
+                "title": "New title",
+                "time_minutes": 3,
+                "price": "1.00",
+                "tags": [{"name": "New"}],
+            },
+            {"title": "Created", "time_minutes": 4, "price": "2.00"},
+        ]
+
+        res = self.client.post(BATCH_URL, payload, format="json")
+        recipe.refresh_from_db()
+
+        self.assertEqual(res.status_code, status.HTTP_201_CREATED)
+        self.assertEqual(recipe.title, "New title")
+        self.assertEqual(list(recipe.tags.values_list("name", flat=True)), ["New"])
+        self.assertEqual(list(untouched.tags.values_list("name", flat=True)), ["Old"])
+        self.assertTrue(Recipe.objects.filter(user=self.user, title="Created").exists())
+
+    def test_batch_update_keeps_concurrent_writes(self):
+        """Test fields left out of an item keep values written after the batch was validated."""
+
+        recipe = create_recipe(user=self.user)
+        payload = [{"id": recipe.id, "title": "New title", "time_minutes": 3, "price": "1.00"}]
+        serializer = RecipeBatchSerializer(
+            data=payload, many=True, context={"request": SimpleNamespace(user=self.user)}
+        )
+        self.assertTrue(serializer.is_valid(), serializer.errors)
+
+        Recipe.objects.filter(id=recipe.id).update(description="Written concurrently")
+        with transaction.atomic():
+            serializer.save()
+        recipe.refresh_from_db()
+
+        self.assertEqual(recipe.title, "New title")
+        self.assertEqual(recipe.description, "Written concurrently")
+
+    def test_batch_same_tags_no_link_writes(self):
+        """Test a batch resending the tags of a recipe writes no recipe tag links."""
+
+        recipe = create_recipe(user=self.user)
+        recipe.tags.add(Tag.objects.create(user=self.user, name="Vegan"))
+        payload = [
+            {
+                "id": recipe.id,
+                "title": "New title",
+                "time_minutes": 3,
+                "price": "1.00",
+                "tags": [{"name": "Vegan"}],
+            },
+        ]
+
+        with CaptureQueriesContext(connection) as ctx:
+            res = self.client.post(BATCH_URL, payload, format="json")
+
+        self.assertEqual(res.status_code, status.HTTP_201_CREATED)
+        self.assertEqual(link_writes(ctx), [])
+        self.assertEqual(list(recipe.tags.values_list("name", flat=True)), ["Vegan"])
+
+    def test_batch_constant_queries(self):
+        """Test a batch costs the same number of queries regardless of its size."""
+
+        def post_batch(count):
+            payload = [
+                {
+                    "title": f"Recipe {i}",
+                    "time_minutes": 10,
+                    "price": "5.50",
+                    "tags": [{"name": f"Tag {i}"}],
+                }
+                for i in range(count)
+            ]
+            with CaptureQueriesContext(connection) as ctx:
+                res = self.client.post(BATCH_URL, payload, format="json")
+            self.assertEqual(res.status_code, status.HTTP_201_CREATED)
+            return len(ctx.captured_queries)
+
+        self.assertEqual(post_batch(2), post_batch(50))
+
+    def test_batch_errors_per_item(self):
+        """Test invalid items are reported by position and nothing is saved."""
+
+        other_recipe = create_recipe(user=create_user(email="other@ex.com", password="pass123"))
+        payload = [
+            {"title": "Valid", "time_minutes": 10, "price": "5.50"},
+            {"title": "Missing time", "price": "5.50"},
+            {"id": other_recipe.id, "title": "Other", "time_minutes": 10, "price": "5.50"},
+        ]
+
+        res = self.client.post(BATCH_URL, payload, format="json")
+
+        self.assertEqual(res.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertEqual(res.data[0], {})
+        self.assertIn("time_minutes", res.data[1])
+        self.assertIn("id", res.data[2])
+        self.assertFalse(Recipe.objects.filter(user=self.user).exists())
+
+    def test_batch_too_large(self):
+        """Test a batch over the configured size is rejected."""
+
+        payload = [{"title": "Recipe", "time_minutes": 10, "price": "5.50"}] * 3
+
+        with self.settings(API_BATCH_MAX_SIZE=2):
+            res = self.client.post(BATCH_URL, payload, format="json")
+
+        self.assertEqual(res.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertFalse(Recipe.objects.exists())
+
+
+@skipUnless(connection.vendor == "postgresql", "Full-text search requires PostgreSQL.")
+class RecipeSearchAPITest(TestCase):
+    """Test full-text search over recipes."""
+
+    def setUp(self):
+        get_response_cache().clear()
+        self.client = APIClient()
+        self.user = create_user(email="test@ex.com", password="testpassword")
+        self.client.force_authenticate(self.user)
+
+    def test_search_ranked(self):
+        """Test recipes matching in the title rank above matches in the description."""
+
+        in_description = create_recipe(
+            user=self.user, title="Stew", description="Hearty stew with chickpeas"
+        )
+        in_title = create_recipe(user=self.user, title="Chickpea curry", description="Spicy")
+        create_recipe(user=self.user, title="Pancakes", description="Sweet breakfast")
+
+        res = self.client.get(RECIPES_URL, {"search": "chickpea"})
+
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        ids = [recipe["id"] for recipe in res.data["results"]]
+        self.assertEqual(ids, [in_title.id, in_description.id])
+
+    def test_search_limited_to_user(self):
+        """Test search only returns recipes of the authenticated user."""
+
+        other_user = create_user(email="other@ex.com", password="testpassword")
+        create_recipe(user=other_user, title="Chickpea curry")
+        recipe = create_recipe(user=self.user, title="Chickpea salad")
+
+        res = self.client.get(RECIPES_URL, {"search": "chickpea"})
+
+        self.assertEqual([r["id"] for r in res.data["results"]], [recipe.id])
+
+    def test_search_follows_updates(self):
+        """Test the search vector follows changes of the title."""
+
+        recipe = create_recipe(user=self.user, title="Pancakes")
+        recipe.title = "Waffles"
+        recipe.save()
+
+        res = self.client.get(RECIPES_URL, {"search": "waffles"})
+
+        self.assertEqual([r["id"] for r in res.data["results"]], [recipe.id])
+
+    def test_search_paginated(self):
+        """Test search results are paginated in rank order without duplicates."""
+
+        recipes = [create_recipe(user=self.user, title=f"Curry {i}") for i in range(5)]
+
+        res = self.client.get(RECIPES_URL, {"search": "curry", "page_size": 2})
+        ids = [recipe["id"] for recipe in res.data["results"]]
+        while res.data["next"]:
+            res = self.client.get(res.data["next"])
+            ids.extend(recipe["id"] for recipe in res.data["results"])
+
+        self.assertEqual(sorted(ids), sorted(recipe.id for recipe in recipes))
+        self.assertEqual(len(ids), len(set(ids)))
+
+
+class RecipeTagFilterAPITest(TestCase):
+    """Test filtering recipes by tags and counting tag facets."""
+
+    def setUp(self):
+        get_response_cache().clear()
+        self.client = APIClient()
+        self.user = create_user(email="test@ex.com", password="testpassword")
+        self.client.force_authenticate(self.user)
+
+        self.vegan = Tag.objects.create(user=self.user, name="Vegan")
+        self.dinner = Tag.objects.create(user=self.user, name="Dinner")
+        self.curry = create_recipe(user=self.user, title="Curry")
+        self.curry.tags.add(self.vegan, self.dinner)
+        self.salad = create_recipe(user=self.user, title="Salad")
+        self.salad.tags.add(self.vegan)
+        self.steak = create_recipe(user=self.user, title="Steak")
+        self.steak.tags.add(self.dinner)
+        self.toast = create_recipe(user=self.user, title="Toast")
+
+    def get_ids(self, params):
+        """Return ids of the recipes listed with query params."""
+
+        res = self.client.get(RECIPES_URL, params)
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        return [recipe["id"] for recipe in res.data["results"]]
+
+    def test_filter_any_tags(self):
+        """Test filtering recipes having any of the tags."""
+
+        ids = self.get_ids({"tags": f"{self.vegan.id},{self.dinner.id}"})
+
+        self.assertEqual(ids, [self.steak.id, self.salad.id, self.curry.id])
+
+    def test_filter_all_tags(self):
+        """Test filtering recipes having all of the tags."""
+
+        ids = self.get_ids({"tags": f"{self.vegan.id},{self.dinner.id}", "tags_mode": "all"})
+
+        self.assertEqual(ids, [self.curry.id])
+
+    def test_filter_invalid_tags(self):
+        """Test invalid tag ids and modes return an error."""
+
+        res = self.client.get(RECIPES_URL, {"tags": "vegan"})
+        self.assertEqual(res.status_code, status.HTTP_400_BAD_REQUEST)
+
+        res = self.client.get(RECIPES_URL, {"tags": self.vegan.id, "tags_mode": "some"})
+        self.assertEqual(res.status_code, status.HTTP_400_BAD_REQUEST)
+
+    def test_tag_facets(self):
+        """Test facets count the tags of all filtered recipes in one query."""
+
+        params = {"tags": self.vegan.id, "facets": "tags", "page_size": 1}
+        with self.assertNumQueries(3):
+            res = self.client.get(RECIPES_URL, params)
+
+        self.assertEqual(len(res.data["results"]), 1)
+        self.assertEqual(
+            res.data["facets"]["tags"],
+            [
+                {"id": self.vegan.id, "name": "Vegan", "count": 2},
+                {"id": self.dinner.id, "name": "Dinner", "count": 1},
+            ],
+        )
+
+    def test_tag_facets_not_requested(self):
+        """Test facets are only computed when requested."""
+
+        res = self.client.get(RECIPES_URL)
+
+        self.assertNotIn("facets", res.data)
+
+
+class RecipeSparseFieldsAPITest(TestCase):
+    """Test limiting recipe responses to requested fields."""
+
+    def setUp(self):
+        get_response_cache().clear()
+        self.client = APIClient()
+        self.user = create_user(email="test@ex.com", password="testpassword")
+        self.client.force_authenticate(self.user)
+        self.tag = Tag.objects.create(user=self.user, name="Vegan")
+        self.recipe = create_recipe(user=self.user)
+        self.recipe.tags.add(self.tag)
+
+    def test_list_fields(self):
+        """Test only requested fields are serialized and loaded from the database."""
+
+        with CaptureQueriesContext(connection) as ctx:
+            res = self.client.get(RECIPES_URL, {"fields": "id,title"})
+
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        self.assertEqual(res.data["results"], [{"id": self.recipe.id, "title": self.recipe.title}])
+        self.assertEqual(len(ctx.captured_queries), 1)
+        self.assertNotIn("price", ctx.captured_queries[0]["sql"])
+
+    def test_detail_fields(self):
+        """Test detail responses are limited to requested fields."""
+
+        res = self.client.get(detail_url(self.recipe.id), {"fields": "description"})
+
+        self.assertEqual(res.data, {"description": self.recipe.description})
+
+    def test_tags_as_ids(self):
+        """Test tags are rendered as ids when requested."""
+
+        res = self.client.get(RECIPES_URL, {"fields": "id,tags", "tags_format": "ids"})
+
+        self.assertEqual(res.data["results"], [{"id": self.recipe.id, "tags": [self.tag.id]}])
+
+    def test_detail_tags_as_ids_ordered(self):
+        """Test tag ids of a recipe detail are ordered by id like in the list."""
+
+        self.recipe.tags.add(Tag.objects.create(user=self.user, name="Dinner"))
+
+        with CaptureQueriesContext(connection) as ctx:
+            res = self.client.get(detail_url(self.recipe.id), {"tags_format": "ids"})
+
+        tag_ids = sorted(self.recipe.tags.values_list("id", flat=True))
+        self.assertEqual(res.data["tags"], tag_ids)
+        self.assertIn("ORDER BY", ctx.captured_queries[-1]["sql"])
+
+    def test_unknown_fields_error(self):
+        """Test requesting unknown fields or tag formats returns an error."""
+
+        res = self.client.get(RECIPES_URL, {"fields": "id,user"})
+        self.assertEqual(res.status_code, status.HTTP_400_BAD_REQUEST)
+
+        res = self.client.get(RECIPES_URL, {"tags_format": "names"})
+        self.assertEqual(res.status_code, status.HTTP_400_BAD_REQUEST)
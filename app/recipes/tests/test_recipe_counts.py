@@ -0,0 +1,202 @@
+from decimal import Decimal
+
+from django.contrib.auth import get_user_model
+from django.db.models import Count
+from django.test import TestCase
+from django.urls import reverse
+from rest_framework import status
+from rest_framework.authtoken.models import Token
+from rest_framework.test import APIClient
+
+from recipes.cache import get_response_cache
+from recipes.models import Recipe, Tag, add_recipe_tags, delete_recipe_tags, recount_recipe_counts
+from recipes.serializers import TagSerializer
+from users.authentication import get_token_cache
+
+
+UserModel = get_user_model()
+RECIPES_URL = reverse("recipes:recipe-list")
+BATCH_URL = reverse("recipes:recipe-batch")
+ASYNC_RECIPES_URL = reverse("recipes:async-recipe-list")
+
+
+def create_recipe(user, **params):
+    """Create and return a sample recipe."""
+
+    defaults = {"title": "Sample recipe", "time_minutes": 22, "price": Decimal("5.25")}
+    defaults.update(params)
+    return Recipe.objects.create(user=user, **defaults)
+
+
+class TagRecipeCountTest(TestCase):
+    """Test the recipe counts of tags are kept up to date."""
+
+    def setUp(self):
+        get_response_cache().clear()
+        self.user = UserModel.objects.create_user(email="test@ex.com", password="testpass123")
+        self.client = APIClient()
+        self.client.force_authenticate(self.user)
+        self.vegan = Tag.objects.create(user=self.user, name="Vegan")
+        self.dinner = Tag.objects.create(user=self.user, name="Dinner")
+
+    def assertCountsCorrect(self):
+        """Assert the recipe count of every tag matches its recipe tag links."""
+
+        tags = Tag.objects.annotate(actual=Count("recipe")).order_by("id")
+        self.assertTrue(tags.exists())
+        for tag in tags:
+            self.assertEqual(tag.recipe_count, tag.actual, tag.name)
+
+    def counts(self):
+        """Return the recipe counts of the tags by name."""
+
+        return dict(Tag.objects.values_list("name", "recipe_count"))
+
+    def test_related_manager(self):
+        """Test adding, removing and clearing tags through the related managers."""
+
+        recipe = create_recipe(self.user)
+        other = create_recipe(self.user)
+
+        recipe.tags.add(self.vegan, self.dinner)
+        recipe.tags.add(self.vegan)
+        self.vegan.recipe_set.add(other)
+        self.assertEqual(self.counts(), {"Vegan": 2, "Dinner": 1})
+
+        recipe.tags.remove(self.vegan)
+        self.assertCountsCorrect()
+
+        self.vegan.recipe_set.clear()
+        recipe.tags.set([self.vegan])
+        self.assertEqual(self.counts(), {"Vegan": 1, "Dinner": 0})
+
+        recipe.tags.clear()
+        self.assertEqual(self.counts(), {"Vegan": 0, "Dinner": 0})
+
+    def test_create_and_update_recipe(self):
+        """Test creating and retagging recipes through the API."""
+
+        payload = {
+            "title": "Curry",
+            "time_minutes": 30,
+            "price": Decimal("5.50"),
+            "tags": [{"name": "Vegan"}, {"name": "Spicy"}, {"name": "Vegan"}],
+        }
+        res = self.client.post(RECIPES_URL, payload, format="json")
+        self.assertEqual(res.status_code, status.HTTP_201_CREATED)
+        self.assertEqual(self.counts(), {"Vegan": 1, "Dinner": 0, "Spicy": 1})
+
+        url = reverse("recipes:recipe-detail", args=[res.data["id"]])
+        res = self.client.patch(url, {"tags": [{"name": "Dinner"}]}, format="json")
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        self.assertEqual(self.counts(), {"Vegan": 0, "Dinner": 1, "Spicy": 0})
+
+    def test_async_create_recipe(self):
+        """Test creating a recipe through the async view."""
+
+        token = Token.objects.create(user=self.user)
+        client = APIClient()
+        client.credentials(HTTP_AUTHORIZATION=f"Token {token.key}")
+        get_token_cache().clear()
+
+        tags = [{"name": "Vegan"}, {"name": "Spicy"}]
+        payload = {"title": "Curry", "time_minutes": 30, "price": "5.50", "tags": tags}
+        res = client.post(ASYNC_RECIPES_URL, payload, format="json")
+
+        self.assertEqual(res.status_code, status.HTTP_201_CREATED)
+        self.assertEqual(self.counts(), {"Vegan": 1, "Dinner": 0, "Spicy": 1})
+
+    def test_batch(self):
+        """Test creating and retagging recipes in a batch."""
+
+        recipe = create_recipe(self.user)
+        recipe.tags.add(self.vegan, self.dinner)
+        untouched = create_recipe(self.user)
+        untouched.tags.add(self.vegan)
+
+        payload = [
+            {"title": "Soup", "time_minutes": 10, "price": "2.00", "tags": [{"name": "Vegan"}]},
+            {"title": "Stew", "time_minutes": 10, "price": "2.00", "tags": [{"name": "Vegan"}]},
+            {"id": recipe.id, "title": "Pie", "time_minutes": 5, "price": "1.00", "tags": []},
+            {"id": untouched.id, "title": "Tart", "time_minutes": 5, "price": "1.00"},
+        ]
+        res = self.client.post(BATCH_URL, payload, format="json")
+
+        self.assertEqual(res.status_code, status.HTTP_201_CREATED)
+        self.assertEqual(self.counts(), {"Vegan": 3, "Dinner": 0})
+
+    def test_delete_recipes(self):
+        """Test deleting recipes through the API, the model and querysets."""
+
+        recipes = [create_recipe(self.user) for _ in range(4)]
+        for recipe in recipes:
+            recipe.tags.add(self.vegan)
+        recipes[0].tags.add(self.dinner)
+
+        res = self.client.delete(reverse("recipes:recipe-detail", args=[recipes[0].id]))
+        self.assertEqual(res.status_code, status.HTTP_204_NO_CONTENT)
+        self.assertEqual(self.counts(), {"Vegan": 3, "Dinner": 0})
+
+        recipes[1].delete()
+        self.assertEqual(self.counts(), {"Vegan": 2, "Dinner": 0})
+
+        Recipe.objects.filter(id__in=[recipes[2].id, recipes[3].id]).delete()
+        self.assertEqual(self.counts(), {"Vegan": 0, "Dinner": 0})
+
+    def test_delete_user(self):
+        """Test deleting a user leaves the counts of other users correct."""
+
+        other = UserModel.objects.create_user(email="other@ex.com", password="testpass123")
+        other_tag = Tag.objects.create(user=other, name="Vegan")
+        create_recipe(other).tags.add(other_tag)
+        create_recipe(self.user).tags.add(self.vegan)
+
+        other.delete()
+
+        self.assertEqual(self.counts(), {"Vegan": 1, "Dinner": 0})
+
+    def test_add_counts_inserted_links_only(self):
+        """Test links that already exist, e.g. added concurrently, are not counted again."""
+
+        recipe = create_recipe(self.user)
+        Recipe.tags.through.objects.create(recipe=recipe, tag=self.vegan)
+
+        inserted = add_recipe_tags([(recipe.id, self.vegan.id), (recipe.id, self.dinner.id)])
+
+        self.assertEqual(inserted, [self.dinner.id])
+        self.assertEqual(self.counts(), {"Vegan": 0, "Dinner": 1})
+
+    def test_delete_counts_deleted_links_only(self):
+        """Test links already deleted, e.g. concurrently, are not uncounted again."""
+
+        recipe = create_recipe(self.user)
+        recipe.tags.add(self.vegan, self.dinner)
+        links = Recipe.tags.through.objects.filter(recipe=recipe)
+
+        deleted = delete_recipe_tags(links.filter(tag=self.vegan))
+        self.assertEqual(delete_recipe_tags(links.filter(tag=self.vegan)), [])
+
+        self.assertEqual(deleted, [self.vegan.id])
+        self.assertEqual(self.counts(), {"Vegan": 0, "Dinner": 1})
+
+    def test_rename_tag_keeps_count(self):
+        """Test renaming a tag does not overwrite a count changed after it was loaded."""
+
+        serializer = TagSerializer(Tag.objects.get(id=self.vegan.id), data={"name": "Plant"})
+        self.assertTrue(serializer.is_valid())
+        create_recipe(self.user).tags.add(self.vegan)
+
+        serializer.save()
+
+        self.assertEqual(self.counts(), {"Plant": 1, "Dinner": 0})
+
+    def test_recount(self):
+        """Test recounting fixes wrong counts only."""
+
+        create_recipe(self.user).tags.add(self.vegan)
+        Tag.objects.filter(id=self.dinner.id).update(recipe_count=5)
+
+        repaired = recount_recipe_counts(Tag.objects.all())
+
+        self.assertEqual(repaired, 1)
+        self.assertEqual(self.counts(), {"Vegan": 1, "Dinner": 0})
@@ -4,6 +4,7 @@ from django.urls import reverse
 from rest_framework import status
 from rest_framework.test import APIClient
 
+from recipes.cache import get_response_cache
 from recipes.models import Tag
 from recipes.serializers import TagSerializer
 
@@ -42,6 +43,7 @@ class PrivateTagTest(TestCase):
     """Test authenticated API requests."""
 
     def setUp(self):
+        get_response_cache().clear()
         self.user = create_user()
         self.client = APIClient()
         self.client.force_authenticate(self.user)
@@ -58,7 +60,7 @@ class PrivateTagTest(TestCase):
         serializer = TagSerializer(tags, many=True)
 
         self.assertEqual(res.status_code, status.HTTP_200_OK)
-        self.assertEqual(res.data, serializer.data)
+        self.assertEqual(res.data["results"], serializer.data)
 
     def test_tags_limited_to_user(self):
         """Test list of tags limited to authenticated user."""
@@ -70,9 +72,38 @@ class PrivateTagTest(TestCase):
         res = self.client.get(TAGS_URL)
 
         self.assertEqual(res.status_code, status.HTTP_200_OK)
-        self.assertEqual(len(res.data), 1)
-        self.assertEqual(res.data[0]["name"], tag.name)
-        self.assertEqual(res.data[0]["id"], tag.id)
+        self.assertEqual(len(res.data["results"]), 1)
+        self.assertEqual(res.data["results"][0]["name"], tag.name)
+        self.assertEqual(res.data["results"][0]["id"], tag.id)
+
+    def test_tags_paginated(self):
+        """Test tags are paginated with an opaque cursor."""
+
+        for name in ("Breakfast", "Dessert", "Lunch", "Vegan"):
+            Tag.objects.create(user=self.user, name=name)
+
+        res = self.client.get(TAGS_URL, {"page_size": 3})
+        next_res = self.client.get(res.data["next"])
+
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        self.assertEqual(
+            [tag["name"] for tag in res.data["results"]], ["Vegan", "Lunch", "Dessert"]
+        )
+        self.assertEqual([tag["name"] for tag in next_res.data["results"]], ["Breakfast"])
+        self.assertIsNone(next_res.data["next"])
+
+    def test_tags_ordered_by_recipe_count(self):
+        """Test tags are listed by recipe count with ``?ordering=-recipe_count``."""
+
+        for name, count in (("Breakfast", 1), ("Dessert", 3), ("Lunch", 1), ("Vegan", 0)):
+            Tag.objects.create(user=self.user, name=name, recipe_count=count)
+
+        res = self.client.get(TAGS_URL, {"ordering": "-recipe_count", "page_size": 2})
+        next_res = self.client.get(res.data["next"])
+
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        self.assertEqual([tag["name"] for tag in res.data["results"]], ["Dessert", "Lunch"])
+        self.assertEqual([tag["name"] for tag in next_res.data["results"]], ["Breakfast", "Vegan"])
 
     def test_update_tag(self):
         """Test updating a tag is successful."""
@@ -98,3 +129,16 @@ class PrivateTagTest(TestCase):
 
         self.assertEqual(res.status_code, status.HTTP_204_NO_CONTENT)
         self.assertFalse(tags.exists())
+
+    def test_update_tag_duplicate_name_error(self):
+        """Test renaming a tag to the name of an existing tag returns an error."""
+
+        Tag.objects.create(user=self.user, name="Dessert")
+        tag = Tag.objects.create(user=self.user, name="After Dinner")
+
+        url = detail_url(tag.id)
+        res = self.client.patch(url, {"name": "Dessert"})
+        tag.refresh_from_db()
+
+        self.assertEqual(res.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertEqual(tag.name, "After Dinner")
@@ -1,7 +1,7 @@
 from django.urls import include, path
 from rest_framework.routers import DefaultRouter
 
-from recipes import views
+from recipes import async_views, views
 
 
 router = DefaultRouter()
@@ -11,5 +11,13 @@ router.register("tags", views.TagViewSet)
 app_name = "recipes"
 
 urlpatterns = [
+    path("cache-stats/", views.ResponseCacheStatsAPIView.as_view(), name="cache-stats"),
+    path("async/recipes/", async_views.AsyncRecipeListView.as_view(), name="async-recipe-list"),
+    path(
+        "async/recipes/<int:pk>/",
+        async_views.AsyncRecipeDetailView.as_view(),
+        name="async-recipe-detail",
+    ),
+    path("async/tags/", async_views.AsyncTagListView.as_view(), name="async-tag-list"),
     path("", include(router.urls)),
 ]
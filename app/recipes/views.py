@@ -1,38 +1,185 @@
-from rest_framework import mixins, viewsets
-from rest_framework.authentication import TokenAuthentication
-from rest_framework.permissions import IsAuthenticated
+from django.conf import settings
+from django.contrib.postgres.search import SearchQuery, SearchRank
+from django.db import transaction
+from django.db.models import F, FloatField, Prefetch
+from django.db.models.functions import Cast
+from django.utils.translation import gettext_lazy as _
+from rest_framework import mixins, status, viewsets
+from rest_framework.decorators import action
+from rest_framework.exceptions import ValidationError
+from rest_framework.filters import OrderingFilter
+from rest_framework.permissions import IsAdminUser, IsAuthenticated
+from rest_framework.response import Response
+from rest_framework.views import APIView
 
-from recipes.models import Recipe, Tag
-from recipes.serializers import RecipeDetailSerializer, RecipeSerializer, TagSerializer
+from core.db.routers import ReplicaReadMixin
+from recipes.cache import VersionedCacheMixin, get_cache_stats
+from recipes.filters import filter_by_tags, parse_tag_ids, tag_facets
+from recipes.models import SEARCH_CONFIG, Recipe, Tag
+from recipes.pagination import RecipeCursorPagination, TagCursorPagination
+from recipes.serializers import (
+    RecipeBatchSerializer,
+    RecipeDetailSerializer,
+    RecipeSerializer,
+    ResponseCacheStatsSerializer,
+    TagSerializer,
+    represent_recipe_rows,
+)
+from users.authentication import CachedTokenAuthentication
 
 
-class RecipeViewSet(viewsets.ModelViewSet):
+class RecipeViewSet(ReplicaReadMixin, VersionedCacheMixin, viewsets.ModelViewSet):
     """View for managing recipes."""
 
     serializer_class = RecipeDetailSerializer
     queryset = Recipe.objects.all()
-    authentication_classes = [TokenAuthentication]
+    authentication_classes = [CachedTokenAuthentication]
     permission_classes = [IsAuthenticated]
+    pagination_class = RecipeCursorPagination
 
     def get_queryset(self):
         """Retrieve recipes for authenticated users."""
 
-        return self.queryset.filter(user=self.request.user).order_by("-id")
+        queryset = self.queryset.filter(user=self.request.user).defer("search_vector")
+
+        fields = self.get_requested_fields()
+        if fields is not None:
+            columns = [name for name in fields if name not in ("id", "tags")]
+            queryset = queryset.only(*columns) if columns else queryset.only("id")
+        # Updates drop prefetched objects before rendering, and deletes render nothing
+        writes = self.action in ("update", "partial_update", "destroy")
+        if not writes and (fields is None or "tags" in fields):
+            if self.get_tags_format() == "ids":
+                queryset = queryset.prefetch_related(
+                    Prefetch("tags", queryset=Tag.objects.only("id").order_by("id"))
+                )
+            else:
+                queryset = queryset.prefetch_related(
+                    Prefetch("tags", queryset=Tag.objects.order_by("id"))
+                )
+
+        if self.action != "list":
+            return queryset.order_by("-id")
+
+        tag_ids = parse_tag_ids(self.request.query_params.get("tags", ""))
+        if tag_ids:
+            mode = self.request.query_params.get("tags_mode", "any")
+            queryset = filter_by_tags(queryset, tag_ids, mode)
+
+        search = self.request.query_params.get("search")
+        if search:
+            query = SearchQuery(search, config=SEARCH_CONFIG, search_type="websearch")
+            rank = Cast(SearchRank(F("search_vector"), query), FloatField())
+            return queryset.filter(search_vector=query).annotate(rank=rank).order_by("-rank", "-id")
+
+        return queryset.order_by("-id")
+
+    def get_requested_fields(self):
+        """Return the fields requested with ``?fields=`` on reads, None for all fields."""
+
+        value = self.request.query_params.get("fields")
+        if self.action not in ("list", "retrieve") or not value:
+            return None
+
+        fields = [name.strip() for name in value.split(",") if name.strip()]
+        unknown = set(fields) - set(self.get_serializer_class().Meta.fields)
+        if unknown:
+            msg = _("Unknown fields: {fields}.").format(fields=", ".join(sorted(unknown)))
+            raise ValidationError({"fields": [msg]})
+
+        return fields
+
+    def get_tags_format(self):
+        """Return the format of tags requested with ``?tags_format=`` on reads."""
+
+        value = self.request.query_params.get("tags_format")
+        if self.action not in ("list", "retrieve") or not value:
+            return None
+        if value != "ids":
+            raise ValidationError({"tags_format": [_("Format must be: ids.")]})
+
+        return value
+
+    def get_serializer(self, *args, **kwargs):
+        """Return the serializer limited to the requested fields and tag format."""
+
+        if self.action in ("list", "retrieve"):
+            kwargs.setdefault("fields", self.get_requested_fields())
+            kwargs.setdefault("tags_format", self.get_tags_format())
+        return super().get_serializer(*args, **kwargs)
 
     def get_serializer_class(self):
         """Return the serializer class for request."""
 
         if self.action == "list":
             return RecipeSerializer
+        if self.action == "batch":
+            return RecipeBatchSerializer
         return self.serializer_class
 
+    def list(self, request, *args, **kwargs):
+        """List recipes, from the response cache if possible."""
+
+        return self.cached_response(self.list_with_facets, request, *args, **kwargs)
+
+    def list_with_facets(self, request, *args, **kwargs):
+        """List recipes, adding tag counts of all filtered recipes if requested.
+
+        Recipes are read as value rows and represented without serializer instances.
+        """
+
+        queryset = self.filter_queryset(self.get_queryset())
+        serializer = self.get_serializer()
+
+        columns = [name for name in serializer.fields if name != "tags"]
+        if "id" not in columns:
+            columns.append("id")
+        if "rank" in queryset.query.annotations:
+            columns.append("rank")
+        rows = queryset.prefetch_related(None).values(*columns)
+
+        page = self.paginate_queryset(rows)
+        if page is not None:
+            response = self.get_paginated_response(represent_recipe_rows(serializer, page))
+        else:
+            response = Response(represent_recipe_rows(serializer, rows))
+
+        if request.query_params.get("facets") == "tags":
+            response.data["facets"] = {"tags": tag_facets(queryset)}
+
+        return response
+
+    def retrieve(self, request, *args, **kwargs):
+        """Retrieve a recipe, from the response cache if possible."""
+
+        return self.cached_response(super().retrieve, request, *args, **kwargs)
+
     def perform_create(self, serializer):
         """Create a new recipe."""
 
         serializer.save(user=self.request.user)
 
+    @action(detail=False, methods=["post"])
+    def batch(self, request):
+        """Create recipes, or update them when ``id`` is given, in a single transaction."""
+
+        serializer = self.get_serializer(
+            data=request.data, many=True, max_length=settings.API_BATCH_MAX_SIZE
+        )
+        serializer.is_valid(raise_exception=True)
+        with transaction.atomic():
+            recipes = serializer.save()
+
+        recipes_by_id = self.get_queryset().in_bulk([recipe.id for recipe in recipes])
+        recipes = [recipes_by_id[recipe.id] for recipe in recipes]
+        data = RecipeDetailSerializer(recipes, many=True).data
+
+        return Response(data, status=status.HTTP_201_CREATED)
+
 
 class TagViewSet(
+    ReplicaReadMixin,
+    VersionedCacheMixin,
     mixins.ListModelMixin,
     mixins.UpdateModelMixin,
     mixins.DestroyModelMixin,
@@ -42,9 +189,31 @@ class TagViewSet(
 
     serializer_class = TagSerializer
     queryset = Tag.objects.all()
-    authentication_classes = [TokenAuthentication]
+    authentication_classes = [CachedTokenAuthentication]
     permission_classes = [IsAuthenticated]
+    pagination_class = TagCursorPagination
+    filter_backends = [OrderingFilter]
+    ordering_fields = ["name", "recipe_count"]
+    ordering = ["-name"]
 
     def get_queryset(self):
         """Retrieve tags for authenticated users."""
         return self.queryset.filter(user=self.request.user).order_by("-name")
+
+    def list(self, request, *args, **kwargs):
+        """List tags, from the response cache if possible."""
+
+        return self.cached_response(super().list, request, *args, **kwargs)
+
+
+class ResponseCacheStatsAPIView(APIView):
+    """Show hit and miss counters of the recipe and tag response cache."""
+
+    authentication_classes = [CachedTokenAuthentication]
+    permission_classes = [IsAdminUser]
+    serializer_class = ResponseCacheStatsSerializer
+
+    def get(self, request):
+        """Return the response cache counters."""
+
+        return Response(self.serializer_class(get_cache_stats()).data)
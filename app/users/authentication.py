@@ -0,0 +1,84 @@
+import hashlib
+
+from django.conf import settings
+from django.core.cache import caches
+from django.utils.translation import gettext_lazy as _
+from rest_framework import exceptions
+from rest_framework.authentication import TokenAuthentication, get_authorization_header
+
+
+def get_token_cache():
+    """Return the cache used for token authentication."""
+
+    return caches[settings.AUTH_TOKEN_CACHE]
+
+
+def token_cache_key(key):
+    """Return the cache key for a token without exposing the token itself."""
+
+    return "auth-token:" + hashlib.sha256(key.encode()).hexdigest()
+
+
+class CachedTokenAuthentication(TokenAuthentication):
+    """Token authentication keeping the token to user resolution in a cache.
+
+    Entries expire after the cache timeout and are invalidated when the token is deleted
+    or its user is saved (see ``users.signals``).
+    """
+
+    def authenticate_credentials(self, key):
+        """Return the cached user and token, falling back to the database."""
+
+        cache = get_token_cache()
+        cache_key = token_cache_key(key)
+
+        credentials = cache.get(cache_key)
+        if credentials is None:
+            credentials = super().authenticate_credentials(key)
+            cache.set(cache_key, credentials)
+
+        return credentials
+
+    async def aauthenticate(self, request):
+        """Async version of ``authenticate`` for plain Django requests."""
+
+        auth = get_authorization_header(request).split()
+        if not auth or auth[0].lower() != self.keyword.lower().encode():
+            return None
+
+        if len(auth) == 1:
+            msg = _("Invalid token header. No credentials provided.")
+            raise exceptions.AuthenticationFailed(msg)
+        elif len(auth) > 2:
+            msg = _("Invalid token header. Token string should not contain spaces.")
+            raise exceptions.AuthenticationFailed(msg)
+
+        try:
+            key = auth[1].decode()
+        except UnicodeError:
+            msg = _("Invalid token header. Token string should not contain invalid characters.")
+            raise exceptions.AuthenticationFailed(msg)
+
+        return await self.aauthenticate_credentials(key)
+
+    async def aauthenticate_credentials(self, key):
+        """Async version of ``authenticate_credentials`` using the async cache and ORM."""
+
+        cache = get_token_cache()
+        cache_key = token_cache_key(key)
+
+        credentials = await cache.aget(cache_key)
+        if credentials is None:
+            model = self.get_model()
+            try:
+                token = await model.objects.select_related("user").aget(key=key)
+            except model.DoesNotExist:
+                raise exceptions.AuthenticationFailed(_("Invalid token."))
+
+            if not token.user.is_active:
+                raise exceptions.AuthenticationFailed(_("User inactive or deleted."))
+
+            credentials = (token.user, token)
+            await cache.aset(cache_key, credentials)
+
+        return credentials
@@ -0,0 +1,38 @@
+from django.contrib.auth import get_user_model
+from django.contrib.auth.backends import ModelBackend
+
+from users.hashing import verify_password
+
+
+UserModel = get_user_model()
+
+
+class PooledPasswordBackend(ModelBackend):
+    """Model backend verifying passwords in the password hasher pool.
+
+    Used by the token endpoint, which turns ``PasswordHasherBusy`` into a 429. It is not in
+    ``AUTHENTICATION_BACKENDS``, so admin and session logins are never rejected as busy.
+    """
+
+    def authenticate(self, request, username=None, password=None, **kwargs):
+        """Return the user matching the credentials, or None."""
+
+        if username is None:
+            username = kwargs.get(UserModel.USERNAME_FIELD)
+        if username is None or password is None:
+            return None
+
+        try:
+            user = UserModel._default_manager.get_by_natural_key(username)
+        except UserModel.DoesNotExist:
+            verify_password(password, None)
+            return None
+
+        valid, outdated = verify_password(password, user.password)
+        if not valid or not self.user_can_authenticate(user):
+            return None
+
+        if outdated:
+            user.set_password(password)
+            user.save(update_fields=["password"])
+        return user
@@ -0,0 +1,110 @@
+import multiprocessing
+import threading
+from concurrent.futures import ProcessPoolExecutor
+from contextlib import contextmanager
+
+import django
+from django.conf import settings
+from django.contrib.auth.hashers import check_password, make_password
+
+
+class PasswordHasherBusy(Exception):
+    """The password hasher pool has no room for another check."""
+
+
+def _setup_worker():
+    django.setup()
+
+
+def _verify(password, encoded):
+    """Return whether a password matches the encoded one and whether its hash is outdated."""
+
+    if encoded is None:
+        # Hash anyway so unknown users take as long as wrong passwords
+        make_password(password)
+        return False, False
+
+    outdated = []
+    valid = check_password(password, encoded, setter=lambda raw_password: outdated.append(True))
+    return valid, bool(outdated)
+
+
+class PasswordHasherPool:
+    """Process pool for password checks, rejecting checks beyond ``queue_size`` at once.
+
+    A ``queue_size`` of 0 accepts any number of checks. The pool and its limit belong to one
+    server process, whose request threads block on their check, so the limit only comes
+    into play with a threaded worker class.
+    """
+
+    def __init__(self, workers, queue_size):
+        self.workers = workers
+        self.queue_size = queue_size
+        self._slots = threading.BoundedSemaphore(queue_size) if queue_size else None
+        # Spawn workers so they do not inherit the database connections of the parent
+        self._executor = ProcessPoolExecutor(
+            workers, mp_context=multiprocessing.get_context("spawn"), initializer=_setup_worker
+        )
+
+    @contextmanager
+    def reserve(self):
+        """Hold a queue slot for the block, raising ``PasswordHasherBusy`` when none is free."""
+
+        if self._slots is None:
+            yield
+            return
+
+        if not self._slots.acquire(blocking=False):
+            raise PasswordHasherBusy()
+        try:
+            yield
+        finally:
+            self._slots.release()
+
+    def call(self, fn, *args):
+        """Run a call in a worker process and return its result."""
+
+        with self.reserve():
+            return self._executor.submit(fn, *args).result()
+
+    def shutdown(self):
+        """Stop the worker processes."""
+
+        self._executor.shutdown()
+
+
+_pool = None
+_pool_lock = threading.Lock()
+
+
+def get_password_hasher_pool():
+    """Return the password hasher pool of the settings, or None to check in-process."""
+
+    global _pool
+
+    workers = settings.PASSWORD_HASHER_WORKERS
+    queue_size = settings.PASSWORD_HASHER_QUEUE_SIZE
+    if not workers:
+        return None
+
+    with _pool_lock:
+        if _pool is None or (_pool.workers, _pool.queue_size) != (workers, queue_size):
+            if _pool is not None:
+                _pool.shutdown()
+            _pool = PasswordHasherPool(workers, queue_size)
+
+        return _pool
+
+
+def verify_password(password, encoded):
+    """Check a password against an encoded one, or None for an unknown user.
+
+    Returns whether the password is valid and whether its hash must be upgraded. Raises
+    ``PasswordHasherBusy`` when the pool already has as many checks as it may queue.
+    """
+
+    pool = get_password_hasher_pool()
+    if pool is None:
+        return _verify(password, encoded)
+
+    return pool.call(_verify, password, encoded)
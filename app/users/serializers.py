@@ -1,6 +1,10 @@
-from django.contrib.auth import authenticate, get_user_model
+from django.contrib.auth import get_user_model
 from django.utils.translation import gettext_lazy as _
-from rest_framework import serializers
+from rest_framework import exceptions, serializers
+
+from core.serializers import save_changed_fields
+from users.backends import PooledPasswordBackend
+from users.hashing import PasswordHasherBusy
 
 
 UserModel = get_user_model()
@@ -23,13 +27,11 @@ class UserSerializer(serializers.ModelSerializer):
         """Update and return a user."""
 
         password = validated_data.pop("password", None)
-        user = super().update(instance, validated_data)
-
         if password:
-            user.set_password(password)
+            instance.set_password(password)
 
-        user.save()
-        return user
+        save_changed_fields(instance, validated_data, ["password"] if password else [])
+        return instance
 
 
 class AuthTokenSerializer(serializers.Serializer):
@@ -45,11 +47,15 @@ class AuthTokenSerializer(serializers.Serializer):
         """Validate and authenticate the user."""
         email = attrs.get("email")
         password = attrs.get("password")
-        user = authenticate(
-            request=self.context.get("request"),
-            email=email,
-            password=password,
-        )
+        # Only token requests verify passwords in the pool, other logins use ModelBackend
+        try:
+            user = PooledPasswordBackend().authenticate(
+                request=self.context.get("request"),
+                email=email,
+                password=password,
+            )
+        except PasswordHasherBusy:
+            raise exceptions.Throttled(wait=1)
 
         if not user:
             msg = _("Unable to authenticate with provided credentials.")
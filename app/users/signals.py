@@ -0,0 +1,27 @@
+from django.contrib.auth import get_user_model
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+from rest_framework.authtoken.models import Token
+
+from users.authentication import get_token_cache, token_cache_key
+
+
+UserModel = get_user_model()
+
+
+@receiver(post_delete, sender=Token)
+def invalidate_deleted_token(sender, instance, **kwargs):
+    """Drop a deleted token from the authentication cache."""
+
+    get_token_cache().delete(token_cache_key(instance.key))
+
+
+@receiver(post_save, sender=UserModel)
+def invalidate_user_tokens(sender, instance, created, **kwargs):
+    """Drop the cached tokens of a changed user, e.g. when it is deactivated."""
+
+    if created:
+        return
+
+    keys = Token.objects.filter(user=instance).values_list("key", flat=True)
+    get_token_cache().delete_many([token_cache_key(key) for key in keys])
@@ -0,0 +1,101 @@
+import tempfile
+
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.core.cache import caches
+from django.test import TestCase, override_settings
+from django.urls import reverse
+from rest_framework import status
+from rest_framework.authtoken.models import Token
+from rest_framework.test import APIClient
+
+from users.authentication import token_cache_key
+
+
+UserModel = get_user_model()
+ME_URL = reverse("users:me")
+
+
+class CachedTokenAuthenticationTest(TestCase):
+    """Test token authentication backed by a cache."""
+
+    def setUp(self):
+        # A cache shared between processes, like the file or Redis cache of the workers
+        directory = tempfile.TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+        shared_cache = {
+            "BACKEND": "django.core.cache.backends.filebased.FileBasedCache",
+            "LOCATION": directory.name,
+        }
+        caches_override = override_settings(CACHES={**settings.CACHES, "auth": shared_cache})
+        caches_override.enable()
+        self.addCleanup(caches_override.disable)
+
+        self.user = UserModel.objects.create_user(email="test@ex.com", password="testpassword")
+        self.token = Token.objects.create(user=self.user)
+        self.client = APIClient()
+        self.client.credentials(HTTP_AUTHORIZATION=f"Token {self.token.key}")
+
+    def test_token_resolved_from_cache(self):
+        """Test repeated requests do not query the database for the token."""
+
+        with self.assertNumQueries(1):
+            res = self.client.get(ME_URL)
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+
+        with self.assertNumQueries(0):
+            res = self.client.get(ME_URL)
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        self.assertEqual(res.data["email"], self.user.email)
+
+    def test_invalid_token_not_cached(self):
+        """Test an invalid token is rejected on every request."""
+
+        self.client.credentials(HTTP_AUTHORIZATION="Token invalid")
+
+        for _ in range(2):
+            res = self.client.get(ME_URL)
+            self.assertEqual(res.status_code, status.HTTP_401_UNAUTHORIZED)
+
+    def test_deleted_token_invalidated(self):
+        """Test a deleted token is rejected even after being cached."""
+
+        self.client.get(ME_URL)
+        self.token.delete()
+
+        res = self.client.get(ME_URL)
+
+        self.assertEqual(res.status_code, status.HTTP_401_UNAUTHORIZED)
+
+    def test_revocation_visible_to_other_workers(self):
+        """Test a deleted token is dropped from the cache of other workers."""
+
+        other_worker_cache = caches.create_connection(settings.AUTH_TOKEN_CACHE)
+        key = token_cache_key(self.token.key)
+        self.client.get(ME_URL)
+        self.assertIsNotNone(other_worker_cache.get(key))
+
+        self.token.delete()
+
+        self.assertIsNone(other_worker_cache.get(key))
+
+    def test_deactivated_user_invalidated(self):
+        """Test the token of a deactivated user is rejected even after being cached."""
+
+        self.client.get(ME_URL)
+        self.user.is_active = False
+        self.user.save()
+
+        res = self.client.get(ME_URL)
+
+        self.assertEqual(res.status_code, status.HTTP_401_UNAUTHORIZED)
+
+    def test_deleted_user_invalidated(self):
+        """Test the token of a deleted user is rejected even after being cached."""
+
+        self.client.get(ME_URL)
+        self.user.delete()
+
+        res = self.client.get(ME_URL)
+
+        self.assertEqual(res.status_code, status.HTTP_401_UNAUTHORIZED)
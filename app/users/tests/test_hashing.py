@@ -0,0 +1,59 @@
+import time
+
+from django.contrib.auth.hashers import make_password
+from django.test import SimpleTestCase, override_settings
+
+from users.hashing import (
+    PasswordHasherBusy,
+    PasswordHasherPool,
+    get_password_hasher_pool,
+    verify_password,
+)
+
+
+class PasswordHasherPoolTest(SimpleTestCase):
+    """Test verifying passwords in the password hasher pool."""
+
+    def test_rejects_checks_beyond_queue_size(self):
+        """Test calls beyond the queue size raise until a slot is released."""
+
+        pool = PasswordHasherPool(workers=1, queue_size=1)
+        self.addCleanup(pool.shutdown)
+
+        with pool.reserve():
+            with self.assertRaises(PasswordHasherBusy):
+                pool.call(time.sleep, 0)
+
+        self.assertIsNone(pool.call(time.sleep, 0))
+        self.assertIsNone(pool.call(time.sleep, 0))
+
+    def test_queue_size_zero_is_unbounded(self):
+        """Test a queue size of 0 accepts calls however many are running."""
+
+        pool = PasswordHasherPool(workers=1, queue_size=0)
+        self.addCleanup(pool.shutdown)
+
+        with pool.reserve(), pool.reserve():
+            self.assertIsNone(pool.call(time.sleep, 0))
+
+    @override_settings(PASSWORD_HASHER_WORKERS=1, PASSWORD_HASHER_QUEUE_SIZE=2)
+    def test_verify_password_in_pool(self):
+        """Test passwords are verified by the pool, flagging outdated hashes."""
+
+        self.assertIsNotNone(get_password_hasher_pool())
+        encoded = make_password("testpass123")
+        outdated = make_password("testpass123", hasher="pbkdf2_sha1")
+
+        self.assertEqual(verify_password("testpass123", encoded), (True, False))
+        self.assertEqual(verify_password("wrongpass", encoded), (False, False))
+        self.assertEqual(verify_password("testpass123", outdated), (True, True))
+        self.assertEqual(verify_password("testpass123", None), (False, False))
+
+    @override_settings(PASSWORD_HASHER_WORKERS=0)
+    def test_verify_password_in_process(self):
+        """Test passwords are verified in the request worker without a pool."""
+
+        self.assertIsNone(get_password_hasher_pool())
+        self.assertEqual(
+            verify_password("testpass123", make_password("testpass123")), (True, False)
+        )
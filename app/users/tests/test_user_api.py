@@ -1,9 +1,14 @@
 from django.contrib.auth import get_user_model
-from django.test import TestCase
+from django.contrib.auth.hashers import make_password
+from django.db import connection
+from django.test import TestCase, override_settings
+from django.test.utils import CaptureQueriesContext
 from django.urls import reverse
 from rest_framework import status
 from rest_framework.test import APIClient
 
+from users.hashing import get_password_hasher_pool
+
 
 UserModel = get_user_model()
 CREATE_USER_URL = reverse("users:create")
@@ -101,6 +106,44 @@ class PublicUserAPITest(TestCase):
         self.assertNotIn("token", res.data)
         self.assertEqual(res.status_code, status.HTTP_400_BAD_REQUEST)
 
+    @override_settings(PASSWORD_HASHER_WORKERS=1, PASSWORD_HASHER_QUEUE_SIZE=1)
+    def test_create_token_hasher_busy(self):
+        """Test token requests are throttled when the password hasher pool is full."""
+
+        create_user(email="test@ex.com", password="testpassword")
+
+        payload = {"email": "test@ex.com", "password": "testpassword"}
+        with get_password_hasher_pool().reserve():
+            res = self.client.post(TOKEN_URL, payload)
+
+        self.assertEqual(res.status_code, status.HTTP_429_TOO_MANY_REQUESTS)
+        self.assertEqual(res["Retry-After"], "1")
+
+    @override_settings(PASSWORD_HASHER_WORKERS=1, PASSWORD_HASHER_QUEUE_SIZE=1)
+    def test_session_login_not_pooled(self):
+        """Test session logins, e.g. to the admin, are not rejected by a full hasher pool."""
+
+        create_user(email="test@ex.com", password="testpassword")
+
+        with get_password_hasher_pool().reserve():
+            logged_in = self.client.login(email="test@ex.com", password="testpassword")
+
+        self.assertTrue(logged_in)
+
+    def test_create_token_upgrades_outdated_hash(self):
+        """Test an outdated password hash is replaced when creating a token."""
+
+        user = create_user(email="test@ex.com")
+        user.password = make_password("testpassword", hasher="pbkdf2_sha1")
+        user.save()
+
+        payload = {"email": "test@ex.com", "password": "testpassword"}
+        res = self.client.post(TOKEN_URL, payload)
+
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        user.refresh_from_db()
+        self.assertTrue(user.password.startswith("pbkdf2_sha256$"))
+
     def test_create_token_blank_password(self):
         """Test posting a blank password returns an error."""
 
@@ -155,3 +198,30 @@ class PrivateUserAPITest(TestCase):
         self.assertEqual(res.status_code, status.HTTP_200_OK)
         self.assertEqual(self.user.name, payload["name"])
         self.assertTrue(self.user.check_password(payload["password"]))
+
+    def test_update_saves_changed_columns(self):
+        """Test updating the name writes only the name column."""
+
+        user_id = self.user.id
+
+        with CaptureQueriesContext(connection) as ctx:
+            res = self.client.patch(ME_URL, {"name": "New name"})
+
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        updates = [q["sql"] for q in ctx.captured_queries if q["sql"].startswith("UPDATE")]
+        self.assertEqual(
+            updates,
+            [f'UPDATE "users_user" SET "name" = \'New name\' WHERE "users_user"."id" = {user_id}'],
+        )
+
+    def test_update_unchanged_skips_save(self):
+        """Test an update sending the current values writes nothing."""
+
+        self.user.name = "Name"
+        self.user.save()
+
+        with CaptureQueriesContext(connection) as ctx:
+            res = self.client.patch(ME_URL, {"email": self.user.email, "name": "Name"})
+
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        self.assertFalse(any(q["sql"].startswith("UPDATE") for q in ctx.captured_queries))
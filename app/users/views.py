@@ -1,7 +1,9 @@
-from rest_framework import authentication, generics, permissions
+from rest_framework import generics, permissions
 from rest_framework.authtoken.views import ObtainAuthToken
 from rest_framework.settings import api_settings
 
+from core.db.routers import ReplicaReadMixin
+from users.authentication import CachedTokenAuthentication
 from users.serializers import AuthTokenSerializer, UserSerializer
 
 
@@ -18,11 +20,11 @@ class CreateTokenAPIView(ObtainAuthToken):
     renderer_classes = api_settings.DEFAULT_RENDERER_CLASSES  # to enable it in browsable API
 
 
-class ManageUserAPIView(generics.RetrieveUpdateAPIView):
+class ManageUserAPIView(ReplicaReadMixin, generics.RetrieveUpdateAPIView):
     """Manage the authenticated user."""
 
     serializer_class = UserSerializer
-    authentication_classes = [authentication.TokenAuthentication]
+    authentication_classes = [CachedTokenAuthentication]
     permission_classes = [permissions.IsAuthenticated]
 
     def get_object(self):